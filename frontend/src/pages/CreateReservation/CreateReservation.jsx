@@ -1,7 +1,7 @@
 import { useState, useEffect } from 'react'
 import { useNavigate } from 'react-router-dom'
 import { useTranslation } from 'react-i18next'
-import { parseISO } from 'date-fns'
+import { endOfDay, format, parseISO, startOfDay } from 'date-fns'
 import {
   Building2,
   FileText,
@@ -20,6 +20,8 @@ import MiniCalendar from '../../components/MiniCalendar/MiniCalendar'
 import styles from './CreateReservation.module.css'
 
 const daysFromNow = (days) => new Date(Date.now() + days * 24 * 60 * 60 * 1000)
+const SLOT_DURATION_MINUTES = 60
+const SLOT_STEP_MINUTES = 30
 
 const CreateReservation = () => {
   const { t } = useTranslation()
@@ -40,6 +42,8 @@ const CreateReservation = () => {
   const [busyError, setBusyError] = useState('')
   const [busyLoading, setBusyLoading] = useState(false)
   const [selectedCalendarDate, setSelectedCalendarDate] = useState(new Date())
+  const [freeSlots, setFreeSlots] = useState([])
+  const [freeSlotsLoading, setFreeSlotsLoading] = useState(false)
 
   useEffect(() => {
     loadSpaces()
@@ -53,6 +57,14 @@ const CreateReservation = () => {
     }
   }, [formData.space])
 
+  useEffect(() => {
+    if (formData.space) {
+      loadFreeSlots(formData.space, selectedCalendarDate)
+    } else {
+      setFreeSlots([])
+    }
+  }, [formData.space, selectedCalendarDate])
+
   const loadSpaces = async () => {
     try {
       const data = await spaceService.getAll()
@@ -74,6 +86,8 @@ const CreateReservation = () => {
         space_id: spaceId,
         start: new Date().toISOString(),
         end: daysFromNow(30).toISOString(),
+        // El calendario solo pinta un punto por reserva (con su título como tooltip): no hace falta el detalle completo
+        fields: 'id,title,start_at,status',
       }
       const reservations = await reservationService.getAll(params)
       setBusyReservations(reservations)
@@ -85,6 +99,42 @@ const CreateReservation = () => {
     }
   }
 
+  // Los horarios libres se calculan en el servidor (reservations/free-slots)
+  const loadFreeSlots = async (spaceId, date) => {
+    const now = new Date()
+    const dayEnd = endOfDay(date)
+    if (dayEnd <= now) {
+      setFreeSlots([])
+      return
+    }
+    try {
+      setFreeSlotsLoading(true)
+      const dayStart = startOfDay(date)
+      const data = await reservationService.getFreeSlots({
+        space_id: spaceId,
+        start: (dayStart > now ? dayStart : now).toISOString(),
+        end: dayEnd.toISOString(),
+        duration: SLOT_DURATION_MINUTES,
+        step: SLOT_STEP_MINUTES,
+      })
+      setFreeSlots(data.slots)
+    } catch (err) {
+      console.error('Error fetching free slots...', err)
+      setFreeSlots([])
+    } finally {
+      setFreeSlotsLoading(false)
+    }
+  }
+
+  const handleSlotSelect = (slot) => {
+    setFormData(prev => ({
+      ...prev,
+      start_at: format(parseISO(slot.start_at), "yyyy-MM-dd'T'HH:mm"),
+      end_at: format(parseISO(slot.end_at), "yyyy-MM-dd'T'HH:mm"),
+    }))
+    setErrors(prev => ({ ...prev, start_at: '', end_at: '' }))
+  }
+
   const handleChange = (e) => {
     const { name, value } = e.target
     setFormData(prev => ({ ...prev, [name]: value }))
@@ -391,6 +441,30 @@ const CreateReservation = () => {
               />
             )}
 
+            {formData.space && (
+              <div className={styles.freeSlots}>
+                <h4>{t('createReservation.freeSlotsTitle')}</h4>
+                {freeSlotsLoading ? (
+                  <Loader2 size={18} className={styles.spinnerIcon} />
+                ) : freeSlots.length ? (
+                  <div className={styles.freeSlotList}>
+                    {freeSlots.map(slot => (
+                      <button
+                        key={slot.start_at}
+                        type="button"
+                        className={styles.freeSlotButton}
+                        onClick={() => handleSlotSelect(slot)}
+                      >
+                        {format(parseISO(slot.start_at), 'HH:mm')} - {format(parseISO(slot.end_at), 'HH:mm')}
+                      </button>
+                    ))}
+                  </div>
+                ) : (
+                  <p className={styles.calendarHint}>{t('createReservation.noFreeSlots')}</p>
+                )}
+              </div>
+            )}
+
             {!formData.space && (
               <p className={styles.selectSpaceHint}>{t('createReservation.selectSpaceToSee')}</p>
             )}
@@ -40,6 +40,7 @@ const Dashboard = () => {
   const [error, setError] = useState('')
   const [reportLoading, setReportLoading] = useState(false)
   const [reportError, setReportError] = useState('')
+  const [reportProgress, setReportProgress] = useState(0)
 
   useEffect(() => {
     loadData()
@@ -156,7 +157,8 @@ const Dashboard = () => {
     try {
       setReportError('')
       setReportLoading(true)
-      const data = await reservationService.downloadReport()
+      setReportProgress(0)
+      const data = await reservationService.downloadReport({}, setReportProgress)
       const blob = new Blob([data], { type: 'application/pdf' })
       const url = window.URL.createObjectURL(blob)
       const link = document.createElement('a')
@@ -188,7 +190,9 @@ const Dashboard = () => {
                 disabled={reportLoading}
               >
                 <FileDown size={16} />
-                {reportLoading ? t('dashboard.generatingReport') : t('dashboard.downloadReport')}
+                {reportLoading
+                  ? t('dashboard.generatingReport', { progress: reportProgress })
+                  : t('dashboard.downloadReport')}
               </button>
               {reportError && <span className={styles.reportError}>{reportError}</span>}
             </div>
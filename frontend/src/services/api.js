@@ -63,4 +63,11 @@ apiClient.interceptors.response.use(
   }
 )
 
+// Listado completo en una sola petición (?paginate=false) para las pantallas que aún no
+// paginan; recorrer el cursor página a página solo sumaba idas y vueltas.
+export async function getList(url, params = {}) {
+  const response = await apiClient.get(url, { params: { ...params, paginate: 'false' } })
+  return response.data
+}
+
 export default apiClient
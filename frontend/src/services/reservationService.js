@@ -1,13 +1,18 @@
-import apiClient from './api'
+import apiClient, { getList } from './api'
+
+const REPORT_POLL_INTERVAL_MS = 1500
 
 const reservationService = {
   async getAll(params = {}) {
-    const response = await apiClient.get('/reservations/', { params })
-    return response.data
+    return getList('/reservations/', params)
   },
 
   async getMine(params = {}) {
-    const response = await apiClient.get('/reservations/mine/', { params })
+    return getList('/reservations/mine/', params)
+  },
+
+  async getFreeSlots(params = {}) {
+    const response = await apiClient.get('/reservations/free-slots/', { params })
     return response.data
   },
 
@@ -41,9 +46,28 @@ const reservationService = {
     return response.data
   },
 
-  async downloadReport(params = {}) {
-    const response = await apiClient.get('/reservations/report/', {
-      params,
+  async createReportJob(params = {}) {
+    const response = await apiClient.post('/reservations/report-jobs/', params)
+    return response.data
+  },
+
+  async getReportJob(id) {
+    const response = await apiClient.get(`/reservations/report-jobs/${id}/`)
+    return response.data
+  },
+
+  async downloadReport(params = {}, onProgress) {
+    let job = await reservationService.createReportJob(params)
+    while (job.status === 'QUEUED' || job.status === 'RUNNING') {
+      onProgress?.(job.progress)
+      await new Promise((resolve) => setTimeout(resolve, REPORT_POLL_INTERVAL_MS))
+      job = await reservationService.getReportJob(job.id)
+    }
+    if (job.status !== 'DONE') {
+      throw new Error(job.error || `Report job ${job.id} ended as ${job.status}`)
+    }
+    onProgress?.(100)
+    const response = await apiClient.get(`/reservations/report-jobs/${job.id}/file/`, {
       responseType: 'blob',
     })
     return response.data
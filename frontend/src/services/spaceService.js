@@ -1,9 +1,8 @@
-import apiClient from './api'
+import apiClient, { getList } from './api'
 
 const spaceService = {
   async getAll() {
-    const response = await apiClient.get('/spaces/')
-    return response.data
+    return getList('/spaces/')
   },
 
   async getById(id) {
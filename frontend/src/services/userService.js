@@ -1,9 +1,8 @@
-import apiClient from './api'
+import apiClient, { getList } from './api'
 
 const userService = {
   async getAll() {
-    const response = await apiClient.get('/users/')
-    return response.data
+    return getList('/users/')
   },
 
   async getById(id) {
@@ -7,6 +7,7 @@ from rest_framework.views import APIView
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
+from accounts.pagination import KeysetPagination
 from accounts.permissions import IsAdminRole
 from accounts.serializers import UserSerializer
 
@@ -103,7 +104,11 @@ class MeView(APIView):
 
 
 @extend_schema_view(
-    list=extend_schema(tags=["Usuarios (Admin)"], summary="Listar usuarios"),
+    list=extend_schema(
+        tags=["Usuarios (Admin)"],
+        summary="Listar usuarios",
+        description="Respuesta paginada por cursor ({next, results}); con ?paginate=false devuelve la lista completa.",
+    ),
     retrieve=extend_schema(tags=["Usuarios (Admin)"], summary="Detalle de usuario"),
     create=extend_schema(tags=["Usuarios (Admin)"], summary="Crear usuario"),
     update=extend_schema(tags=["Usuarios (Admin)"], summary="Actualizar usuario"),
@@ -118,6 +123,8 @@ class UserViewSet(viewsets.ModelViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticated, IsAdminRole]
+    pagination_class = KeysetPagination
+    keyset_ordering = ("id",)
 
     def perform_destroy(self, instance):
         instance.is_active = False
@@ -26,6 +26,8 @@ env = environ.Env(
     TIME_ZONE=(str, 'America/Bogota'),
     CORS_ALLOWED_ORIGINS=(list, ['http://localhost:3000', 'http://localhost:8080', 'http://localhost:3001']),
     JWT_SECRET=(str, 'change-jwt-secret'),
+    API_PAGE_SIZE=(int, 100),
+    API_MAX_PAGE_SIZE=(int, 1000),
     DATABASE_URL=(str, ''),
     MYSQL_URL=(str, ''),
 )
@@ -147,5 +149,7 @@ CORS_ALLOWED_ORIGINS = env('CORS_ALLOWED_ORIGINS')
 CORS_ALLOW_ALL_ORIGINS = env.bool('CORS_ALLOW_ALL_ORIGINS', default=True)
 CORS_ALLOW_CREDENTIALS = True
 CSRF_TRUSTED_ORIGINS = env.list('CSRF_TRUSTED_ORIGINS', default=['https://*.railway.app', 'https://*.up.railway.app'])
+API_PAGE_SIZE = env('API_PAGE_SIZE')
+API_MAX_PAGE_SIZE = env('API_MAX_PAGE_SIZE')
 
 
@@ -0,0 +1,144 @@
+"""Exportación columnar de reservas (Arrow IPC y Parquet) para los cuadernos de análisis.
+
+Las columnas son las mismas del CSV (``exports.EXPORT_COLUMNS``) con tipos reales: ids enteros,
+fechas ``timestamp[us, UTC]`` y ``status`` como categoría (diccionario con los estados del
+modelo). Cada lote keyset de ``values_list`` se convierte en un ``RecordBatch`` de Arrow, así que
+el tiempo y la memoria crecen de forma lineal con el número de filas y nunca se arma una tabla
+completa.
+
+- Arrow IPC (formato stream): cada lote se envía en cuanto está listo. El archivo guardado se
+  lee con ``pyarrow.ipc.open_stream(pyarrow.memory_map(ruta))`` sin copiar los datos.
+- Parquet: el índice va al final del archivo, así que se escribe en un temporal agrupando lotes
+  en grupos de filas de ``PARQUET_ROW_GROUP_SIZE`` y luego se envía por partes.
+"""
+from itertools import islice
+from tempfile import TemporaryFile
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from django.conf import settings
+from django.http import FileResponse, StreamingHttpResponse
+
+from reservations.exports import EXPORT_COLUMNS, NUMERIC_COLUMNS, export_filename, export_rows
+from reservations.models import Reservation
+from reservations.readers import DATETIME_FIELDS
+
+ARROW_STREAM_CONTENT_TYPE = "application/vnd.apache.arrow.stream"
+PARQUET_CONTENT_TYPE = "application/vnd.apache.parquet"
+PARQUET_ROW_GROUP_SIZE = 64 * 1024
+NULLABLE_COLUMNS = frozenset({"approved_by_id", "decision_at"})
+STATUS_VALUES = tuple(Reservation.Status.values)
+
+
+def export_schema():
+    fields = []
+    for name in EXPORT_COLUMNS:
+        if name in DATETIME_FIELDS:
+            field_type = pa.timestamp("us", tz="UTC")
+        elif name == "status":
+            field_type = pa.dictionary(pa.int8(), pa.string())
+        elif name in NUMERIC_COLUMNS:
+            field_type = pa.int64()
+        else:
+            field_type = pa.string()
+        fields.append(pa.field(name, field_type, nullable=name in NULLABLE_COLUMNS))
+    return pa.schema(fields)
+
+
+def record_batches(queryset, batch_size=None):
+    """``RecordBatch`` de Arrow por cada lote de filas de ``queryset`` (orden de inicio)."""
+    batch_size = batch_size or settings.RESERVATION_STREAM_CHUNK_SIZE
+    schema = export_schema()
+    # Un único diccionario para todos los lotes: el stream lo envía una sola vez.
+    status_dictionary = pa.array(STATUS_VALUES, pa.string())
+    status_codes = {value: code for code, value in enumerate(STATUS_VALUES)}
+    rows = export_rows(queryset)
+    while True:
+        chunk = list(islice(rows, batch_size))
+        if not chunk:
+            return
+        arrays = []
+        for field, values in zip(schema, zip(*chunk)):
+            if field.name == "status":
+                codes = pa.array([status_codes[value] for value in values], pa.int8())
+                arrays.append(pa.DictionaryArray.from_arrays(codes, status_dictionary))
+            else:
+                arrays.append(pa.array(values, type=field.type))
+        yield pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+class _ChunkSink:
+    """Destino de solo escritura para el escritor IPC: acumula los bytes hasta que se retiran."""
+
+    closed = False
+
+    def __init__(self):
+        self.parts = []
+        self.position = 0
+
+    def write(self, data):
+        self.parts.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def take(self):
+        data = b"".join(self.parts)
+        self.parts = []
+        return data
+
+
+def _arrow_chunks(queryset):
+    sink = _ChunkSink()
+    with pa.ipc.new_stream(pa.PythonFile(sink, mode="w"), export_schema()) as writer:
+        for batch in record_batches(queryset):
+            writer.write_batch(batch)
+            yield sink.take()
+    yield sink.take()
+
+
+def arrow_response(queryset):
+    """``StreamingHttpResponse`` con las reservas de ``queryset`` en formato Arrow IPC stream."""
+    response = StreamingHttpResponse(_arrow_chunks(queryset), content_type=ARROW_STREAM_CONTENT_TYPE)
+    response["Content-Disposition"] = f'attachment; filename="{export_filename("arrows")}"'
+    # Evita que nginx acumule la respuesta completa antes de reenviarla.
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+def write_parquet(queryset, output):
+    """Escribe las reservas de ``queryset`` como Parquet en ``output``, un grupo de filas a la vez."""
+    with pq.ParquetWriter(pa.PythonFile(output, mode="w"), export_schema()) as writer:
+        pending = []
+        pending_rows = 0
+        for batch in record_batches(queryset):
+            pending.append(batch)
+            pending_rows += batch.num_rows
+            if pending_rows >= PARQUET_ROW_GROUP_SIZE:
+                writer.write_table(pa.Table.from_batches(pending))
+                pending = []
+                pending_rows = 0
+        if pending:
+            writer.write_table(pa.Table.from_batches(pending))
+
+
+def parquet_response(queryset):
+    """``FileResponse`` con las reservas de ``queryset`` en Parquet (generado en un archivo temporal)."""
+    output = TemporaryFile(suffix=".parquet")
+    try:
+        write_parquet(queryset, output)
+    except BaseException:
+        output.close()
+        raise
+    output.seek(0)
+    return FileResponse(
+        output, as_attachment=True, filename=export_filename("parquet"), content_type=PARQUET_CONTENT_TYPE
+    )
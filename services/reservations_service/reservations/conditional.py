@@ -0,0 +1,57 @@
+"""GET condicional (ETag / If-None-Match) para consultas de reservas.
+
+La versión de los datos sale de ``SpaceCalendar``: cada escritura de ``reservations.services``
+incrementa la versión del espacio afectado, así que basta una lectura indexada para saber si un
+resultado cambió. Las consultas sin espacio usan además el contador global ``DataVersion``, que
+nunca retrocede. Si el ETag coincide se responde ``304`` sin consultar ni serializar reservas.
+
+El ETag se calcula con los parámetros tal como llegan, no con las fechas resueltas: un rango
+implícito ("desde ahora") no debe producir un ETag distinto en cada solicitud.
+"""
+import hashlib
+
+from django.db.models import Sum
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+
+from reservations.models import DataVersion, SpaceCalendar
+
+
+def data_version(space_id=None):
+    """Versión de un espacio, o de todos.
+
+    La versión global combina el contador ``DataVersion`` (monótono, se incrementa al confirmar)
+    con la suma de versiones por espacio (se incrementa dentro de la transacción), de modo que
+    ninguna de las dos ventanas deja pasar un cambio con el mismo ETag.
+    """
+    if space_id is not None:
+        version = SpaceCalendar.objects.filter(space_id=space_id).values_list("version", flat=True).first()
+        return f"s{space_id}:{version or 0}"
+    counter = DataVersion.objects.filter(pk=1).values_list("version", flat=True).first()
+    total = SpaceCalendar.objects.aggregate(total=Sum("version"))["total"]
+    return f"all:{counter or 0}:{total or 0}"
+
+
+def data_versions(space_ids):
+    """Versiones de varios espacios con una sola consulta."""
+    versions = dict(SpaceCalendar.objects.filter(space_id__in=space_ids).values_list("space_id", "version"))
+    return ",".join(f"{space_id}:{versions.get(space_id, 0)}" for space_id in sorted(space_ids))
+
+
+def make_etag(request, *parts):
+    """ETag para la ruta y los parámetros de la solicitud, el usuario y las partes dadas."""
+    user = request.user
+    query = sorted(request.query_params.lists())
+    key = repr((request.path, query, getattr(user, "id", None), getattr(user, "role", None), parts))
+    return '"%s"' % hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+def conditional_response(request, etag, build):
+    """Devuelve ``304`` si el cliente ya tiene ``etag``; si no, llama a ``build()`` y le añade el ETag."""
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = build()
+    response["ETag"] = etag
+    # El navegador debe revalidar siempre; el contenido depende del token.
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ["Authorization"])
+    return response
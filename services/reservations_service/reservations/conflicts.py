@@ -0,0 +1,40 @@
+"""Detección de solapamientos por barrido para lotes de reservas de un mismo espacio."""
+
+
+def sweep_conflicts(candidates, existing):
+    """Cruza en una sola pasada los candidatos con las reservas existentes de un espacio.
+
+    ``candidates`` es una secuencia de ``(key, start_at, end_at)``; ``existing`` es una
+    secuencia de ``(reservation_id, start_at, end_at)`` ordenada por ``start_at``. Los
+    candidatos se aceptan en orden de inicio (a igual inicio gana el que llegó primero),
+    así que entre ellos nunca quedan dos solapados.
+
+    Devuelve un dict ``key -> None`` si el candidato quedó libre, ``("reservation", id)``
+    si choca con una reserva existente o ``("candidate", key)`` si choca con otro candidato.
+    """
+    ordered = sorted(enumerate(candidates), key=lambda item: (item[1][1], item[0]))
+    result = {}
+    pointer = 0
+    existing_max_end = None
+    existing_owner = None
+    accepted_end = None
+    accepted_key = None
+    for _, (key, start_at, end_at) in ordered:
+        # Reservas existentes que empiezan antes o junto con el candidato.
+        while pointer < len(existing) and existing[pointer][1] <= start_at:
+            reservation_id, _, existing_end = existing[pointer]
+            if existing_max_end is None or existing_end > existing_max_end:
+                existing_max_end = existing_end
+                existing_owner = reservation_id
+            pointer += 1
+        if existing_max_end is not None and existing_max_end > start_at:
+            result[key] = ("reservation", existing_owner)
+        elif pointer < len(existing) and existing[pointer][1] < end_at:
+            result[key] = ("reservation", existing[pointer][0])
+        elif accepted_end is not None and accepted_end > start_at:
+            result[key] = ("candidate", accepted_key)
+        else:
+            result[key] = None
+            accepted_end = end_at
+            accepted_key = key
+    return result
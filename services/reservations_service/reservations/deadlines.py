@@ -0,0 +1,124 @@
+"""Plazo de cada petición (cabecera ``X-Request-Timeout-Ms``).
+
+El gateway fija el presupuesto de la petición (su ``proxy_read_timeout`` menos un margen) y
+``DeadlineMiddleware`` lo convierte en un plazo absoluto al recibirla. Las llamadas entre
+servicios (``interservice``) envían lo que queda del plazo, así que se acorta en cada salto, y
+nunca esperan más que eso. Antes del trabajo caro (reportes, comprobaciones de solapamiento) se
+llama a ``check``: si el cliente ya no va a recibir la respuesta se abandona con un 504 en lugar
+de seguir ocupando un hilo de gunicorn.
+
+Sin cabecera el plazo es ``REQUEST_DEADLINE_SECONDS``, que también es el máximo que se acepta;
+0 desactiva los plazos. Fuera de una petición (comandos, cola de reportes) no hay plazo.
+
+El mismo módulo existe en ``spaces_service`` y ``reservations_service``.
+"""
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import JsonResponse
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+HEADER = "X-Request-Timeout-Ms"
+# Se descuenta al reenviar el plazo: red y armado de la respuesta en el servicio que llama.
+FORWARD_MARGIN_SECONDS = 0.05
+
+_deadline = ContextVar("request_deadline", default=None)
+
+
+class DeadlineExceeded(APIException):
+    status_code = status.HTTP_504_GATEWAY_TIMEOUT
+    default_detail = "La solicitud superó su tiempo límite y se abandonó; intenta de nuevo o acota la consulta."
+    default_code = "deadline_exceeded"
+
+
+def enabled():
+    return settings.REQUEST_DEADLINE_SECONDS > 0
+
+
+def _budget(request):
+    """Segundos de presupuesto para ``request`` según la cabecera, acotados por la configuración."""
+    limit = settings.REQUEST_DEADLINE_SECONDS
+    raw = request.headers.get(HEADER)
+    try:
+        budget = int(raw) / 1000 if raw is not None else limit
+    except ValueError:
+        budget = limit
+    return min(budget, limit)
+
+
+def remaining():
+    """Segundos que quedan del plazo de la petición actual, o ``None`` si no tiene."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def check(what=None, reserve=0.0):
+    """Lanza ``DeadlineExceeded`` si del plazo de la petición actual no quedan más de ``reserve`` segundos."""
+    left = remaining()
+    if left is not None and left <= reserve:
+        if what:
+            raise DeadlineExceeded(f"La solicitud superó su tiempo límite antes de {what}; se abandonó.")
+        raise DeadlineExceeded()
+
+
+def forward_headers():
+    """Cabecera con el plazo restante para una llamada a otro servicio (vacía si no hay plazo)."""
+    left = remaining()
+    if left is None:
+        return {}
+    return {HEADER: str(max(int((left - FORWARD_MARGIN_SECONDS) * 1000), 0))}
+
+
+def bounded_timeout(timeout):
+    """``timeout`` recortado a lo que queda del plazo."""
+    left = remaining()
+    if left is None:
+        return timeout
+    return max(min(timeout, left - FORWARD_MARGIN_SECONDS), 0.001)
+
+
+def _expired_response():
+    return JsonResponse({"detail": DeadlineExceeded.default_detail}, status=DeadlineExceeded.status_code)
+
+
+class DeadlineMiddleware:
+    """Fija el plazo de la petición; funciona igual bajo WSGI y ASGI (sin pasar por un hilo)."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not enabled():
+            return self.get_response(request)
+        budget = _budget(request)
+        if budget <= 0:
+            return _expired_response()
+        token = _deadline.set(time.monotonic() + budget)
+        try:
+            return self.get_response(request)
+        finally:
+            _deadline.reset(token)
+
+    async def __acall__(self, request):
+        if not enabled():
+            return await self.get_response(request)
+        budget = _budget(request)
+        if budget <= 0:
+            return _expired_response()
+        token = _deadline.set(time.monotonic() + budget)
+        try:
+            return await self.get_response(request)
+        finally:
+            _deadline.reset(token)
@@ -0,0 +1,140 @@
+"""Exportación de reservas en bruto (CSV y XLSX) para los equipos de operación.
+
+Las filas salen de ``readers.admin_rows`` (``values_list`` con nombre, sin instanciar modelos) y
+se leen por lotes keyset con ``streaming.iterate_keyset``, igual que los listados en streaming:
+la memoria no depende del número de filas.
+
+El CSV se envía a medida que se escribe. El XLSX es un ZIP cuyo índice va al final, así que no
+puede enviarse antes de terminarlo: XlsxWriter lo escribe en modo ``constant_memory`` (cada fila
+va a disco al pasar a la siguiente) sobre un archivo temporal que luego se envía por partes.
+"""
+import csv
+from tempfile import TemporaryFile
+
+from django.conf import settings
+from django.http import FileResponse, StreamingHttpResponse
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from reservations.readers import ADMIN_COLUMNS, DATETIME_FIELDS, admin_rows, datetime_formatter
+from reservations.streaming import iterate_keyset
+
+EXPORT_COLUMNS = ADMIN_COLUMNS
+EXPORT_ORDERING = ("start_at", "id")
+NUMERIC_COLUMNS = frozenset({"id", "space_id", "created_by_id", "approved_by_id"})
+# Última fila de una hoja de Excel (la primera es el encabezado).
+XLSX_MAX_ROWS = 1048576 - 1
+# Prefijos que Excel interpreta como fórmula al abrir un CSV.
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def export_rows(queryset):
+    """Filas de ``queryset`` en orden de inicio, leídas por lotes keyset."""
+    return iterate_keyset(
+        admin_rows(queryset, EXPORT_COLUMNS), EXPORT_ORDERING, settings.RESERVATION_STREAM_CHUNK_SIZE
+    )
+
+
+def export_filename(extension):
+    return f"reservas_{timezone.localtime().strftime('%Y%m%d_%H%M')}.{extension}"
+
+
+class _Echo:
+    """Destino de ``csv.writer`` que devuelve la línea en lugar de guardarla."""
+
+    def write(self, value):
+        return value
+
+
+def _csv_text(value):
+    if value is None:
+        return ""
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def _csv_chunks(rows, flush_every):
+    writer = csv.writer(_Echo())
+    format_datetime = datetime_formatter()
+    datetime_positions = [index for index, name in enumerate(EXPORT_COLUMNS) if name in DATETIME_FIELDS]
+    # BOM para que Excel reconozca UTF-8 (tildes y eñes) al abrir el archivo.
+    buffer = ["\ufeff" + writer.writerow(EXPORT_COLUMNS)]
+    for row in rows:
+        values = [_csv_text(value) for value in row]
+        for index in datetime_positions:
+            values[index] = format_datetime(row[index]) or ""
+        buffer.append(writer.writerow(values))
+        if len(buffer) >= flush_every:
+            yield "".join(buffer)
+            buffer = []
+    if buffer:
+        yield "".join(buffer)
+
+
+def csv_response(queryset, flush_every=500):
+    """``StreamingHttpResponse`` con las reservas de ``queryset`` en CSV."""
+    response = StreamingHttpResponse(
+        _csv_chunks(export_rows(queryset), flush_every), content_type="text/csv; charset=utf-8"
+    )
+    response["Content-Disposition"] = f'attachment; filename="{export_filename("csv")}"'
+    # Evita que nginx acumule la respuesta completa antes de reenviarla.
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+def write_xlsx(queryset, output):
+    """Escribe las reservas de ``queryset`` como XLSX en ``output`` con memoria constante."""
+    import xlsxwriter
+
+    workbook = xlsxwriter.Workbook(output, {
+        "constant_memory": True,
+        # Los textos escritos por usuarios nunca se interpretan como fórmulas ni enlaces.
+        "strings_to_formulas": False,
+        "strings_to_urls": False,
+        "remove_timezone": True,
+    })
+    sheet = workbook.add_worksheet("Reservas")
+    header = workbook.add_format({"bold": True})
+    datetime_cell = workbook.add_format({"num_format": "yyyy-mm-dd hh:mm"})
+    tz = timezone.get_current_timezone()
+
+    sheet.write_row(0, 0, EXPORT_COLUMNS, header)
+    sheet.freeze_panes(1, 0)
+    # Cada columna tiene un solo tipo: se escribe con el método concreto y sin el despacho de ``write``.
+    writers = []
+    for index, name in enumerate(EXPORT_COLUMNS):
+        if name in DATETIME_FIELDS:
+            sheet.set_column(index, index, 17, datetime_cell)
+            writers.append((index, sheet.write_datetime, lambda value: value.astimezone(tz), datetime_cell))
+        elif name in NUMERIC_COLUMNS:
+            writers.append((index, sheet.write_number, None, None))
+        else:
+            writers.append((index, sheet.write_string, None, None))
+    for row_number, row in enumerate(export_rows(queryset), start=1):
+        for index, write, convert, cell_format in writers:
+            value = row[index]
+            # Las celdas vacías se omiten: en modo ``constant_memory`` no ocupan nada.
+            if value is None or value == "":
+                continue
+            write(row_number, index, convert(value) if convert else value, cell_format)
+    workbook.close()
+
+
+def xlsx_response(queryset):
+    """``FileResponse`` con las reservas de ``queryset`` en XLSX (generado en un archivo temporal)."""
+    if queryset.count() > XLSX_MAX_ROWS:
+        raise ValidationError(f"El XLSX admite hasta {XLSX_MAX_ROWS} filas; acota el rango o exporta en CSV")
+    output = TemporaryFile(suffix=".xlsx")
+    try:
+        write_xlsx(queryset, output)
+    except BaseException:
+        output.close()
+        raise
+    output.seek(0)
+    return FileResponse(
+        output,
+        as_attachment=True,
+        filename=export_filename("xlsx"),
+        content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    )
@@ -0,0 +1,218 @@
+"""Índice en memoria de intervalos activos (PENDING/APPROVED) por espacio.
+
+Cada espacio se carga de forma perezosa como un arreglo ordenado por ``start_at``
+junto con el máximo acumulado de ``end_at``; con eso las consultas de solapamiento
+y de bloques ocupados se resuelven con una búsqueda binaria. La frescura entre
+procesos se garantiza comparando la versión guardada en ``SpaceCalendar``: si otro
+worker escribió sobre el espacio, la entrada local se descarta y se recarga.
+"""
+import threading
+from bisect import bisect_left, bisect_right
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from reservations.models import ACTIVE_STATUSES, Reservation, SpaceCalendar
+
+
+class SpaceIntervals:
+    """Intervalos activos de un espacio ordenados por inicio."""
+
+    __slots__ = ("version", "horizon", "starts", "ends", "ids", "max_ends")
+
+    def __init__(self, version, horizon, rows=()):
+        self.version = version
+        self.horizon = horizon
+        self.starts = []
+        self.ends = []
+        self.ids = []
+        for reservation_id, start_at, end_at in rows:
+            self.starts.append(start_at)
+            self.ends.append(end_at)
+            self.ids.append(reservation_id)
+        self.max_ends = []
+        self._rebuild_max_ends(0)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _rebuild_max_ends(self, position):
+        del self.max_ends[position:]
+        current = self.max_ends[-1] if self.max_ends else None
+        for end_at in self.ends[position:]:
+            current = end_at if current is None or end_at > current else current
+            self.max_ends.append(current)
+
+    def _position_of(self, reservation_id, start_at):
+        low = bisect_left(self.starts, start_at)
+        high = bisect_right(self.starts, start_at)
+        for position in range(low, high):
+            if self.ids[position] == reservation_id:
+                return position
+        # El inicio guardado puede diferir del recibido (p. ej. tras editar fechas).
+        try:
+            return self.ids.index(reservation_id)
+        except ValueError:
+            return None
+
+    def covers(self, start_at):
+        return start_at >= self.horizon
+
+    def add(self, reservation_id, start_at, end_at):
+        if end_at <= self.horizon or reservation_id in self.ids:
+            return
+        position = bisect_right(self.starts, start_at)
+        self.starts.insert(position, start_at)
+        self.ends.insert(position, end_at)
+        self.ids.insert(position, reservation_id)
+        self._rebuild_max_ends(position)
+
+    def remove(self, reservation_id, start_at):
+        position = self._position_of(reservation_id, start_at)
+        if position is None:
+            return
+        del self.starts[position]
+        del self.ends[position]
+        del self.ids[position]
+        self._rebuild_max_ends(position)
+
+    def overlapping(self, start_at, end_at, exclude_id=None):
+        """Posiciones (en orden ascendente) de los intervalos que cruzan ``[start_at, end_at)``."""
+        found = []
+        position = bisect_left(self.starts, end_at) - 1
+        while position >= 0 and self.max_ends[position] > start_at:
+            if self.ends[position] > start_at and self.ids[position] != exclude_id:
+                found.append(position)
+            position -= 1
+        found.reverse()
+        return found
+
+    def has_overlap(self, start_at, end_at, exclude_id=None):
+        position = bisect_left(self.starts, end_at) - 1
+        while position >= 0 and self.max_ends[position] > start_at:
+            if self.ends[position] > start_at and self.ids[position] != exclude_id:
+                return True
+            position -= 1
+        return False
+
+
+class IntervalIndex:
+    """Registro por proceso de ``SpaceIntervals``; la base de datos queda como respaldo."""
+
+    def __init__(self):
+        self._spaces = {}
+        self._lock = threading.RLock()
+
+    @property
+    def enabled(self):
+        return getattr(settings, "RESERVATION_INDEX_ENABLED", True)
+
+    @staticmethod
+    def current_version(space_id):
+        version = SpaceCalendar.objects.filter(space_id=space_id).values_list("version", flat=True).first()
+        return version or 0
+
+    @staticmethod
+    def _horizon():
+        lookback = getattr(settings, "RESERVATION_INDEX_LOOKBACK_DAYS", 30)
+        return timezone.now() - timedelta(days=lookback)
+
+    def load(self, space_id, version=None):
+        space_id = int(space_id)
+        if version is None:
+            version = self.current_version(space_id)
+        horizon = self._horizon()
+        rows = (
+            Reservation.objects.filter(space_id=space_id, status__in=ACTIVE_STATUSES, end_at__gt=horizon)
+            .order_by("start_at", "id")
+            .values_list("id", "start_at", "end_at")
+        )
+        entry = SpaceIntervals(version, horizon, rows)
+        with self._lock:
+            self._spaces[space_id] = entry
+        return entry
+
+    def _entry(self, space_id, start_at):
+        """Entrada vigente para el espacio, o ``None`` si la consulta debe ir a la base de datos."""
+        if not self.enabled:
+            return None
+        space_id = int(space_id)
+        version = self.current_version(space_id)
+        with self._lock:
+            entry = self._spaces.get(space_id)
+        if entry is None or entry.version != version:
+            entry = self.load(space_id, version)
+        if not entry.covers(start_at):
+            return None
+        return entry
+
+    def has_overlap(self, space_id, start_at, end_at, exclude_id=None):
+        """``True``/``False`` si el índice puede responder; ``None`` para usar la consulta ORM."""
+        entry = self._entry(space_id, start_at)
+        if entry is None:
+            return None
+        with self._lock:
+            return entry.has_overlap(start_at, end_at, exclude_id)
+
+    def busy(self, space_id, start_at, end_at):
+        """Bloques ``(start_at, end_at)`` ordenados, o ``None`` para usar la consulta ORM."""
+        entry = self._entry(space_id, start_at)
+        if entry is None:
+            return None
+        with self._lock:
+            return [(entry.starts[p], entry.ends[p]) for p in entry.overlapping(start_at, end_at)]
+
+    def apply(self, space_id, version, removed=None, added=None):
+        """Aplica un cambio confirmado; si la versión no es consecutiva, descarta la entrada."""
+        space_id = int(space_id)
+        with self._lock:
+            entry = self._spaces.get(space_id)
+            if entry is None:
+                return
+            if entry.version != version - 1:
+                self._spaces.pop(space_id, None)
+                return
+            if removed:
+                entry.remove(*removed)
+            if added:
+                entry.add(*added)
+            entry.version = version
+
+    def invalidate(self, space_id=None):
+        with self._lock:
+            if space_id is None:
+                self._spaces.clear()
+            else:
+                self._spaces.pop(int(space_id), None)
+
+    def verify(self, space_id):
+        """Compara la entrada vigente del índice con la base de datos (ids faltantes, sobrantes y distintos)."""
+        space_id = int(space_id)
+        version = self.current_version(space_id)
+        with self._lock:
+            entry = self._spaces.get(space_id)
+        if entry is None or entry.version != version:
+            entry = self.load(space_id, version)
+        rows = Reservation.objects.filter(
+            space_id=space_id, status__in=ACTIVE_STATUSES, end_at__gt=entry.horizon
+        ).values_list("id", "start_at", "end_at")
+        expected = {row[0]: (row[1], row[2]) for row in rows}
+        with self._lock:
+            indexed = {
+                reservation_id: (start_at, end_at)
+                for reservation_id, start_at, end_at in zip(entry.ids, entry.starts, entry.ends)
+            }
+            ordered = all(entry.starts[i] <= entry.starts[i + 1] for i in range(len(entry) - 1))
+        return {
+            "space_id": space_id,
+            "version": entry.version,
+            "size": len(indexed),
+            "ordered": ordered,
+            "missing": sorted(set(expected) - set(indexed)),
+            "unexpected": sorted(set(indexed) - set(expected)),
+            "mismatched": sorted(k for k in set(expected) & set(indexed) if expected[k] != indexed[k]),
+        }
+
+
+interval_index = IntervalIndex()
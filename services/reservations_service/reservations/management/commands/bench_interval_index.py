@@ -0,0 +1,89 @@
+import random
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from reservations.interval_index import interval_index
+from reservations.models import Reservation
+from reservations.services import _orm_busy_blocks, _orm_has_overlap
+
+
+class Command(BaseCommand):
+    help = "Compara el índice de intervalos en memoria con la consulta ORM (datos sintéticos, se revierten al final)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--reservations", type=int, default=5000, help="Reservas sintéticas a insertar")
+        parser.add_argument("--queries", type=int, default=2000, help="Consultas a cronometrar por ruta")
+        parser.add_argument("--space", type=int, default=999999, help="ID de espacio sintético")
+        parser.add_argument("--seed", type=int, default=7)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        space_id = options["space"]
+        base = timezone.now().replace(minute=0, second=0, microsecond=0) + timedelta(days=1)
+
+        with transaction.atomic():
+            rows = []
+            cursor = base
+            for i in range(options["reservations"]):
+                cursor += timedelta(minutes=30 * rng.randint(0, 4))
+                end_at = cursor + timedelta(minutes=30 * rng.randint(1, 8))
+                rows.append(Reservation(
+                    space_id=space_id,
+                    space_name="Benchmark",
+                    created_by_id=0,
+                    created_by_email="bench@example.com",
+                    title=f"Bench {i}",
+                    start_at=cursor,
+                    end_at=end_at,
+                    status=Reservation.Status.APPROVED,
+                ))
+                cursor = end_at
+            Reservation.objects.bulk_create(rows, batch_size=1000)
+            span = cursor - base
+
+            windows = []
+            for _ in range(options["queries"]):
+                start_at = base + span * rng.random()
+                windows.append((start_at, start_at + timedelta(minutes=30 * rng.randint(1, 8))))
+
+            load_started = time.perf_counter()
+            interval_index.load(space_id)
+            load_elapsed = time.perf_counter() - load_started
+
+            results = {}
+            for label, overlap_fn, busy_fn in (
+                ("orm", _orm_has_overlap, lambda *a: list(_orm_busy_blocks(*a))),
+                ("index", interval_index.has_overlap, interval_index.busy),
+            ):
+                started = time.perf_counter()
+                for start_at, end_at in windows:
+                    overlap_fn(space_id, start_at, end_at)
+                overlap_elapsed = time.perf_counter() - started
+                started = time.perf_counter()
+                for start_at, end_at in windows:
+                    busy_fn(space_id, start_at, end_at)
+                busy_elapsed = time.perf_counter() - started
+                results[label] = (overlap_elapsed, busy_elapsed)
+
+            mismatches = sum(
+                interval_index.busy(space_id, s, e) != list(_orm_busy_blocks(space_id, s, e)) for s, e in windows[:200]
+            )
+            interval_index.invalidate(space_id)
+            transaction.set_rollback(True)
+
+        queries = len(windows)
+        self.stdout.write(f"Reservas: {len(rows)}  consultas: {queries}  carga del índice: {load_elapsed * 1000:.1f} ms")
+        for label, (overlap_elapsed, busy_elapsed) in results.items():
+            self.stdout.write(
+                f"{label:>6}: solapamiento {overlap_elapsed / queries * 1e6:8.1f} µs/consulta | "
+                f"ocupados {busy_elapsed / queries * 1e6:8.1f} µs/consulta"
+            )
+        orm_total = sum(results["orm"])
+        index_total = sum(results["index"])
+        self.stdout.write(self.style.SUCCESS(f"Aceleración: x{orm_total / index_total:.1f}"))
+        if mismatches:
+            self.stdout.write(self.style.ERROR(f"{mismatches} resultados distintos entre índice y ORM"))
@@ -0,0 +1,80 @@
+import random
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from reservations.models import Reservation
+from reservations.readers import admin_rows, serialize_admin_rows
+from reservations.serializers import ReservationAdminSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara ReservationAdminSerializer con la lectura rápida de listados y verifica que el JSON sea "
+        "idéntico byte a byte (datos sintéticos, se revierten al final)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 100000], help="Tamaños a medir")
+        parser.add_argument("--space", type=int, default=999999, help="ID de espacio sintético")
+        parser.add_argument("--seed", type=int, default=7)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        space_id = options["space"]
+        renderer = JSONRenderer()
+        base = timezone.now().replace(minute=0, second=0, microsecond=0) + timedelta(days=1)
+        statuses = list(Reservation.Status.values)
+
+        with transaction.atomic():
+            inserted = 0
+            for size in sorted(options["rows"]):
+                rows = []
+                for i in range(inserted, size):
+                    start_at = base + timedelta(minutes=30 * i)
+                    status = rng.choice(statuses)
+                    decided = status in (Reservation.Status.APPROVED, Reservation.Status.REJECTED)
+                    rows.append(Reservation(
+                        space_id=space_id,
+                        space_name="Benchmark",
+                        space_location="Bloque B",
+                        space_description="Espacio sintético " * rng.randint(1, 10),
+                        created_by_id=rng.randint(1, 50),
+                        created_by_email="bench@example.com",
+                        created_by_first_name="Ana",
+                        created_by_last_name="Pérez",
+                        title=f"Bench {i}",
+                        description="Descripción " * rng.randint(0, 20),
+                        start_at=start_at,
+                        end_at=start_at + timedelta(minutes=30 * rng.randint(1, 4)),
+                        status=status,
+                        approved_by_id=1 if decided else None,
+                        approved_by_email="admin@example.com" if decided else "",
+                        decision_at=start_at - timedelta(days=1) if decided else None,
+                        decision_note="ok" if decided else "",
+                    ))
+                Reservation.objects.bulk_create(rows, batch_size=1000)
+                inserted = size
+                queryset = Reservation.objects.filter(space_id=space_id).order_by("-start_at", "-id")
+
+                started = time.perf_counter()
+                slow = renderer.render(ReservationAdminSerializer(queryset, many=True).data)
+                slow_elapsed = time.perf_counter() - started
+
+                started = time.perf_counter()
+                fast = renderer.render(list(serialize_admin_rows(admin_rows(queryset))))
+                fast_elapsed = time.perf_counter() - started
+
+                line = (
+                    f"{size:>7} filas: serializer {slow_elapsed * 1000:9.1f} ms | "
+                    f"lectura rápida {fast_elapsed * 1000:9.1f} ms | x{slow_elapsed / fast_elapsed:.1f}"
+                )
+                if slow == fast:
+                    self.stdout.write(self.style.SUCCESS(line))
+                else:
+                    self.stdout.write(self.style.ERROR(f"{line} | SALIDA DISTINTA"))
+            transaction.set_rollback(True)
@@ -0,0 +1,62 @@
+import random
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Max
+
+from reservations.interval_index import interval_index
+from reservations.models import Reservation
+from reservations.services import _orm_busy_blocks, _orm_has_overlap
+
+
+class Command(BaseCommand):
+    help = "Verifica el índice de intervalos en memoria contra la base de datos"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--space", type=int, action="append", dest="spaces", help="ID de espacio (repetible)")
+        parser.add_argument("--probes", type=int, default=200, help="Consultas aleatorias a comparar por espacio")
+        parser.add_argument("--seed", type=int, default=None)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        space_ids = options["spaces"] or list(
+            Reservation.objects.order_by().values_list("space_id", flat=True).distinct()
+        )
+        failures = 0
+        for space_id in space_ids:
+            report = interval_index.verify(space_id)
+            problems = [key for key in ("missing", "unexpected", "mismatched") if report[key]]
+            if not report["ordered"]:
+                problems.append("ordered")
+
+            entry = interval_index.load(space_id)
+            last_end = Reservation.objects.filter(space_id=space_id).aggregate(last=Max("end_at"))["last"]
+            probe_errors = 0
+            if last_end and last_end > entry.horizon:
+                span = (last_end - entry.horizon).total_seconds()
+                for _ in range(options["probes"]):
+                    start_at = entry.horizon + (last_end - entry.horizon) * rng.random()
+                    end_at = start_at + (last_end - entry.horizon) * min(rng.random(), 3600 * 4 / span)
+                    if end_at <= start_at:
+                        continue
+                    expected_busy = list(_orm_busy_blocks(space_id, start_at, end_at))
+                    if interval_index.busy(space_id, start_at, end_at) != expected_busy:
+                        probe_errors += 1
+                    elif interval_index.has_overlap(space_id, start_at, end_at) != _orm_has_overlap(
+                        space_id, start_at, end_at
+                    ):
+                        probe_errors += 1
+            if probe_errors:
+                problems.append(f"{probe_errors} consultas distintas")
+
+            line = f"Espacio {space_id}: {report['size']} intervalos (v{report['version']})"
+            if problems:
+                failures += 1
+                self.stdout.write(self.style.ERROR(f"{line} -> inconsistencias: {', '.join(problems)}"))
+                for key in ("missing", "unexpected", "mismatched"):
+                    if report[key]:
+                        self.stdout.write(f"  {key}: {report[key][:20]}")
+            else:
+                self.stdout.write(self.style.SUCCESS(f"{line} OK"))
+
+        if failures:
+            raise CommandError(f"{failures} espacio(s) con inconsistencias")
@@ -0,0 +1,80 @@
+import time
+from datetime import datetime, time as dt_time, timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from reservations import report_cache
+from reservations.report_jobs import report_queryset
+from reservations.reporting import build_reservations_report
+
+PERIODS = ("week", "month", "all")
+
+
+def period_filters(period, today=None):
+    """Filtros del reporte de la semana o el mes en curso (hora local), o sin filtros para ``all``."""
+    today = today or timezone.localdate()
+    if period == "week":
+        first = today - timedelta(days=today.weekday())
+        following = first + timedelta(days=7)
+    elif period == "month":
+        first = today.replace(day=1)
+        following = (first.replace(day=28) + timedelta(days=4)).replace(day=1)
+    else:
+        return report_cache.normalize_filters()
+    start = timezone.make_aware(datetime.combine(first, dt_time.min))
+    end = timezone.make_aware(datetime.combine(following, dt_time.min)) - timedelta(microseconds=1)
+    return report_cache.normalize_filters(start=start, end=end)
+
+
+class Command(BaseCommand):
+    help = (
+        "Genera y deja en caché los reportes más pedidos: semana y mes en curso y el reporte completo que "
+        "descarga el panel. Pensado para ejecutarse tras cada despliegue y de forma periódica (cron o --every)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--periods", nargs="+", choices=PERIODS, default=list(PERIODS))
+        parser.add_argument("--force", action="store_true", help="Regenera aunque haya una copia vigente")
+        parser.add_argument(
+            "--every", type=int, default=None, help="Repite cada tantos segundos en lugar de terminar"
+        )
+
+    def handle(self, *args, **options):
+        if not report_cache.enabled():
+            self.stdout.write(self.style.WARNING("La caché de reportes está desactivada (REPORT_CACHE_TTL_HOURS=0)"))
+            return
+        while True:
+            self._pregenerate(options["periods"], options["force"])
+            if not options["every"]:
+                return
+            time.sleep(options["every"])
+
+    def _pregenerate(self, periods, force):
+        purged = report_cache.purge_expired()
+        if purged:
+            self.stdout.write(f"{purged} reporte(s) vencidos descartados")
+        for period in periods:
+            filters = period_filters(period)
+            if not force and report_cache.lookup(filters) is not None:
+                self.stdout.write(f"{period}: ya está en caché")
+                continue
+            version = report_cache.current_version(filters)
+            started = time.perf_counter()
+            content = build_reservations_report(
+                report_queryset(**filters),
+                start=filters["start"],
+                end=filters["end"],
+                space=filters["space_id"],
+                statuses=filters["statuses"],
+            )
+            elapsed = time.perf_counter() - started
+            if report_cache.store(filters, version, content) is None:
+                self.stdout.write(self.style.WARNING(
+                    f"{period}: generado en {elapsed:.1f} s pero no se guardó (los datos cambiaron o supera "
+                    "REPORT_CACHE_MAX_BYTES)"
+                ))
+                continue
+            self.stdout.write(self.style.SUCCESS(
+                f"{period}: generado en {elapsed:.1f} s ({len(content) / 1024:.0f} KiB)"
+            ))
@@ -0,0 +1,45 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError, connections
+
+from reservations.report_jobs import purge_expired, recover_stale, run_pending
+
+
+class Command(BaseCommand):
+    help = (
+        "Recupera trabajos de reporte colgados, purga los archivos vencidos y procesa la cola en este "
+        "proceso (respeta REPORT_JOBS_MAX_RUNNING); pensado para cron, para vaciar la cola tras un reinicio "
+        "o para ejecutarse con --every"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--purge-only", action="store_true", help="Solo recupera y purga, sin generar reportes")
+        parser.add_argument("--limit", type=int, default=None, help="Máximo de trabajos a procesar")
+        parser.add_argument(
+            "--every", type=int, default=None, help="Repite cada tantos segundos en lugar de terminar"
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            try:
+                self._process(options["purge_only"], options["limit"])
+            except DatabaseError as exc:
+                if not options["every"]:
+                    raise
+                self.stderr.write(f"No se pudo procesar la cola de reportes: {exc}")
+            finally:
+                # Entre rondas no se retiene la conexión (la base pudo reiniciarse mientras se espera).
+                connections.close_all()
+            if not options["every"]:
+                return
+            time.sleep(options["every"])
+
+    def _process(self, purge_only, limit):
+        requeued, failed = recover_stale()
+        purged = purge_expired()
+        self.stdout.write(f"{requeued} trabajo(s) devueltos a la cola, {failed} fallido(s), {purged} archivo(s) purgados")
+        if purge_only:
+            return
+        processed = run_pending(limit=limit)
+        self.stdout.write(self.style.SUCCESS(f"{processed} reporte(s) generados"))
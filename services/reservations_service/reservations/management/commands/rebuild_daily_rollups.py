@@ -0,0 +1,61 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from reservations.locks import space_lock
+from reservations.models import Reservation, ReservationDailyRollup
+from reservations.rollups import expected_rollups, stored_rollups
+
+
+def _non_zero(totals):
+    return {key: value for key, value in totals.items() if value[0] or value[1]}
+
+
+class Command(BaseCommand):
+    help = "Reconstruye (o verifica con --verify) la tabla de totales diarios por espacio, en bloques de espacios"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--space", type=int, action="append", dest="spaces", help="ID de espacio (repetible)")
+        parser.add_argument("--chunk", type=int, default=20, help="Espacios por transacción")
+        parser.add_argument("--verify", action="store_true", help="Solo compara, no modifica nada")
+
+    def handle(self, *args, **options):
+        space_ids = options["spaces"] or sorted(
+            set(Reservation.objects.order_by().values_list("space_id", flat=True).distinct())
+            | set(ReservationDailyRollup.objects.order_by().values_list("space_id", flat=True).distinct())
+        )
+        chunk = max(1, options["chunk"])
+        mismatched_spaces = set()
+        written = 0
+        for offset in range(0, len(space_ids), chunk):
+            chunk_ids = space_ids[offset:offset + chunk]
+            # Con los espacios bloqueados ninguna escritura puede colarse entre el cálculo y el reemplazo.
+            with space_lock(*chunk_ids):
+                expected = _non_zero(expected_rollups(chunk_ids))
+                if options["verify"]:
+                    stored = _non_zero(stored_rollups(chunk_ids))
+                    for key in set(expected) | set(stored):
+                        if expected.get(key) != stored.get(key):
+                            mismatched_spaces.add(key[0])
+                            self.stdout.write(
+                                f"  espacio {key[0]} {key[1]} {key[2]}: "
+                                f"esperado {expected.get(key)} guardado {stored.get(key)}"
+                            )
+                    continue
+                ReservationDailyRollup.objects.filter(space_id__in=chunk_ids).delete()
+                ReservationDailyRollup.objects.bulk_create(
+                    [
+                        ReservationDailyRollup(
+                            space_id=space_id, date=date, status=status, count=count, occupied_minutes=minutes
+                        )
+                        for (space_id, date, status), (count, minutes) in sorted(expected.items())
+                    ],
+                    batch_size=1000,
+                )
+                written += len(expected)
+            self.stdout.write(f"Espacios {offset + len(chunk_ids)}/{len(space_ids)}")
+
+        if options["verify"]:
+            if mismatched_spaces:
+                raise CommandError(f"{len(mismatched_spaces)} espacio(s) con totales distintos")
+            self.stdout.write(self.style.SUCCESS(f"{len(space_ids)} espacio(s) verificados, sin diferencias"))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"{written} fila(s) de totales reconstruidas"))
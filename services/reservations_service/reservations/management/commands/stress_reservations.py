@@ -0,0 +1,99 @@
+import random
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from reservations.authentication import StatelessUser
+from reservations.models import ACTIVE_STATUSES, Reservation
+from reservations.services import create_reservation, delete_space_reservations
+
+
+class Command(BaseCommand):
+    help = (
+        "Lanza creaciones concurrentes sobre espacios sintéticos y verifica que no haya dobles reservas. "
+        "Usa la base de datos configurada (ejecutar contra MySQL para un resultado representativo)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=400, help="Creaciones totales a disparar")
+        parser.add_argument("--workers", type=int, default=32, help="Hilos concurrentes")
+        parser.add_argument("--spaces", type=int, default=4, help="Espacios sintéticos entre los que se reparten")
+        parser.add_argument("--slots", type=int, default=40, help="Franjas de 1 h disponibles por espacio")
+        parser.add_argument("--first-space", type=int, default=900000, help="ID del primer espacio sintético")
+        parser.add_argument("--keep", action="store_true", help="No borrar las reservas creadas al terminar")
+        parser.add_argument("--seed", type=int, default=11)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        space_ids = [options["first_space"] + i for i in range(options["spaces"])]
+        if Reservation.objects.filter(space_id__in=space_ids).exists():
+            raise CommandError("Los espacios sintéticos ya tienen reservas; usa --first-space con otro valor")
+
+        base = timezone.now().replace(minute=0, second=0, microsecond=0) + timedelta(days=2)
+        jobs = []
+        for i in range(options["requests"]):
+            space_id = rng.choice(space_ids)
+            # Inicios cada 30 min con duración de 1 h: franjas vecinas se solapan a propósito.
+            start_at = base + timedelta(minutes=30 * rng.randrange(options["slots"] * 2))
+            jobs.append((i, space_id, start_at, start_at + timedelta(hours=1)))
+
+        user = StatelessUser(user_id=0, email="stress@example.com", role="TEACHER")
+        latencies = []
+        latencies_lock = threading.Lock()
+
+        def run(job):
+            i, space_id, start_at, end_at = job
+            data = {"space_id": space_id, "title": f"Stress {i}", "start_at": start_at, "end_at": end_at}
+            space_data = {"id": space_id, "name": f"Stress {space_id}", "location": "", "description": ""}
+            started = time.perf_counter()
+            try:
+                create_reservation(user, data, space_data=space_data)
+                outcome = "created"
+            except ValidationError:
+                outcome = "conflict"
+            except Exception as exc:  # noqa: BLE001 - se reporta como error de infraestructura
+                outcome = f"error: {exc.__class__.__name__}"
+            finally:
+                connection.close()
+            with latencies_lock:
+                latencies.append(time.perf_counter() - started)
+            return outcome
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options["workers"]) as pool:
+            outcomes = Counter(pool.map(run, jobs))
+        elapsed = time.perf_counter() - started
+
+        double_bookings = 0
+        for space_id in space_ids:
+            rows = Reservation.objects.filter(space_id=space_id, status__in=ACTIVE_STATUSES).order_by("start_at")
+            previous_end = None
+            for start_at, end_at in rows.values_list("start_at", "end_at"):
+                if previous_end is not None and start_at < previous_end:
+                    double_bookings += 1
+                previous_end = end_at if previous_end is None else max(previous_end, end_at)
+
+        latencies.sort()
+        p50 = latencies[len(latencies) // 2] * 1000 if latencies else 0
+        p95 = latencies[int(len(latencies) * 0.95) - 1] * 1000 if latencies else 0
+        self.stdout.write(
+            f"Solicitudes: {len(jobs)}  hilos: {options['workers']}  espacios: {len(space_ids)}  "
+            f"tiempo: {elapsed:.2f} s  rendimiento: {len(jobs) / elapsed:.1f} req/s"
+        )
+        self.stdout.write(f"Latencia p50: {p50:.1f} ms  p95: {p95:.1f} ms")
+        for outcome, count in sorted(outcomes.items()):
+            self.stdout.write(f"  {outcome}: {count}")
+
+        if not options["keep"]:
+            delete_space_reservations(space_ids)
+
+        if double_bookings:
+            raise CommandError(f"{double_bookings} doble(s) reserva(s) detectada(s)")
+        self.stdout.write(self.style.SUCCESS("Sin dobles reservas"))
@@ -0,0 +1,39 @@
+import time
+
+import requests
+from django.core.management.base import BaseCommand, CommandError
+
+from reservations import space_replica
+
+
+class Command(BaseCommand):
+    help = (
+        "Trae el catálogo completo de spaces-service y actualiza la réplica local de espacios; corrige lo "
+        "que los avisos perdidos hayan dejado desactualizado. Pensado para cron o para ejecutarse con --every"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--every", type=int, default=None, help="Repite cada tantos segundos en lugar de terminar"
+        )
+
+    def handle(self, *args, **options):
+        if not space_replica.enabled():
+            self.stdout.write(self.style.WARNING(
+                "La réplica de espacios está desactivada (SPACE_REPLICA_MAX_AGE_SECONDS=0)"
+            ))
+            return
+        while True:
+            try:
+                created, updated, deleted = space_replica.sync()
+            except requests.RequestException as exc:
+                if not options["every"]:
+                    raise CommandError(f"No se pudo leer el catálogo de spaces-service: {exc}") from exc
+                self.stderr.write(f"No se pudo leer el catálogo de spaces-service: {exc}")
+            else:
+                self.stdout.write(self.style.SUCCESS(
+                    f"Réplica sincronizada: {created} nuevo(s), {updated} actualizado(s), {deleted} borrado(s)"
+                ))
+            if not options["every"]:
+                return
+            time.sleep(options["every"])
@@ -0,0 +1,51 @@
+# Generated manually for microservice schema
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reservations', '0002_spacecalendar'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReservationSeries',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('space_id', models.IntegerField()),
+                ('space_name', models.CharField(max_length=255)),
+                ('space_location', models.CharField(blank=True, max_length=255)),
+                ('space_description', models.TextField(blank=True)),
+                ('created_by_id', models.IntegerField()),
+                ('created_by_email', models.EmailField(max_length=254)),
+                ('created_by_first_name', models.CharField(blank=True, max_length=150)),
+                ('created_by_last_name', models.CharField(blank=True, max_length=150)),
+                ('title', models.CharField(max_length=255)),
+                ('description', models.TextField(blank=True)),
+                ('start_at', models.DateTimeField(help_text='Inicio de la primera ocurrencia')),
+                ('end_at', models.DateTimeField(help_text='Fin de la primera ocurrencia')),
+                ('frequency', models.CharField(choices=[('DAILY', 'Daily'), ('WEEKLY', 'Weekly')], default='WEEKLY', max_length=10)),
+                ('interval', models.PositiveSmallIntegerField(default=1)),
+                ('weekdays', models.CharField(blank=True, help_text='Días RRULE separados por coma (MO,TU,...)', max_length=32)),
+                ('until', models.DateField(blank=True, null=True)),
+                ('count', models.PositiveIntegerField(blank=True, null=True)),
+                ('exceptions', models.JSONField(blank=True, default=list, help_text='Fechas (YYYY-MM-DD) excluidas')),
+            ],
+            options={
+                'ordering': ['-start_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='reservationseries',
+            index=models.Index(fields=['created_by_id', 'start_at'], name='IX_series_created_start'),
+        ),
+        migrations.AddField(
+            model_name='reservation',
+            name='series',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='occurrences', to='reservations.reservationseries'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated manually for microservice schema
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reservations', '0003_reservationseries'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReservationDailyRollup',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('space_id', models.IntegerField()),
+                ('date', models.DateField()),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('APPROVED', 'Approved'), ('REJECTED', 'Rejected'), ('CANCELLED', 'Cancelled')], max_length=20)),
+                ('count', models.IntegerField(default=0)),
+                ('occupied_minutes', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['date', 'space_id'], name='IX_rollup_date_space')],
+                'constraints': [
+                    models.UniqueConstraint(fields=('space_id', 'date', 'status'), name='UQ_rollup_space_date_status'),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated manually for microservice schema
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reservations', '0004_reservationdailyrollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReportJob',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('requested_by_id', models.IntegerField()),
+                ('requested_by_email', models.EmailField(blank=True, max_length=254)),
+                ('params', models.JSONField(default=dict)),
+                ('status', models.CharField(choices=[('QUEUED', 'Queued'), ('RUNNING', 'Running'), ('DONE', 'Done'), ('FAILED', 'Failed'), ('EXPIRED', 'Expired')], default='QUEUED', max_length=20)),
+                ('progress', models.PositiveSmallIntegerField(default=0)),
+                ('slot', models.PositiveSmallIntegerField(blank=True, null=True, unique=True)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('heartbeat_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('expires_at', models.DateTimeField(blank=True, null=True)),
+                ('error', models.TextField(blank=True)),
+                ('file_name', models.CharField(blank=True, max_length=255)),
+                ('file_size', models.PositiveIntegerField(default=0)),
+                ('content', models.BinaryField(blank=True, editable=False, null=True)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [
+                    models.Index(fields=['status', 'created_at'], name='IX_report_jobs_status_created'),
+                    models.Index(fields=['requested_by_id', 'created_at'], name='IX_report_jobs_requester'),
+                ],
+            },
+        ),
+    ]
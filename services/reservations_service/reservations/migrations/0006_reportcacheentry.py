@@ -0,0 +1,32 @@
+# Generated manually for microservice schema
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reservations', '0005_reportjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReportCacheEntry',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('key', models.CharField(max_length=64, unique=True)),
+                ('params', models.JSONField(default=dict)),
+                ('start_at', models.DateTimeField(blank=True, null=True)),
+                ('end_at', models.DateTimeField(blank=True, null=True)),
+                ('space_id', models.IntegerField(blank=True, null=True)),
+                ('data_version', models.CharField(max_length=64)),
+                ('file_size', models.PositiveIntegerField(default=0)),
+                ('content', models.BinaryField(editable=False)),
+                ('expires_at', models.DateTimeField()),
+            ],
+            options={
+                'indexes': [models.Index(fields=['expires_at'], name='IX_report_cache_expires')],
+            },
+        ),
+    ]
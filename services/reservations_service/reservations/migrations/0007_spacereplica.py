@@ -0,0 +1,25 @@
+# Generated manually for microservice schema
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reservations', '0006_reportcacheentry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SpaceReplica',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('space_id', models.IntegerField(unique=True)),
+                ('name', models.CharField(max_length=255)),
+                ('description', models.TextField(blank=True)),
+                ('location', models.CharField(max_length=255, blank=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('source_updated_at', models.DateTimeField(blank=True, null=True)),
+                ('synced_at', models.DateTimeField()),
+            ],
+        ),
+    ]
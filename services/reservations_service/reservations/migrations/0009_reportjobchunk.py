@@ -0,0 +1,32 @@
+# Generated manually for microservice schema
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reservations', '0008_dataversion'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='reportjob',
+            name='content',
+        ),
+        migrations.CreateModel(
+            name='ReportJobChunk',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('index', models.PositiveIntegerField()),
+                ('data', models.BinaryField(editable=False)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='chunks', to='reservations.reportjob')),
+            ],
+            options={
+                'ordering': ['job', 'index'],
+                'constraints': [
+                    models.UniqueConstraint(fields=('job', 'index'), name='UQ_report_job_chunk'),
+                ],
+            },
+        ),
+    ]
@@ -33,6 +33,9 @@ class Reservation(TimeStampedModel):
     approved_by_last_name = models.CharField(max_length=150, blank=True)
     decision_at = models.DateTimeField(null=True, blank=True)
     decision_note = models.TextField(blank=True)
+    series = models.ForeignKey(
+        "ReservationSeries", null=True, blank=True, on_delete=models.SET_NULL, related_name="occurrences"
+    )
 
     class Meta:
         ordering = ["-start_at"]
@@ -56,3 +59,179 @@ class Reservation(TimeStampedModel):
             from django.core.exceptions import ValidationError
 
             raise ValidationError("Datetime values must be timezone-aware")
+
+
+ACTIVE_STATUSES = [Reservation.Status.PENDING, Reservation.Status.APPROVED]
+
+
+class SpaceCalendar(models.Model):
+    """Versión de la agenda de un espacio; cada escritura sobre sus reservas la incrementa."""
+
+    space_id = models.IntegerField(unique=True)
+    version = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Espacio {self.space_id} (v{self.version})"
+
+
+class DataVersion(models.Model):
+    """Contador global de escrituras sobre reservas; nunca se borra ni retrocede (fila única ``pk=1``)."""
+
+    version = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Datos v{self.version}"
+
+
+class SpaceReplica(models.Model):
+    """Copia local de un espacio de spaces-service (ver ``reservations.space_replica``)."""
+
+    space_id = models.IntegerField(unique=True)
+    name = models.CharField(max_length=255)
+    description = models.TextField(blank=True)
+    location = models.CharField(max_length=255, blank=True)
+    is_active = models.BooleanField(default=True)
+    # ``updated_at`` del espacio en spaces-service; un aviso más viejo que la copia se ignora.
+    source_updated_at = models.DateTimeField(null=True, blank=True)
+    synced_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"Espacio {self.space_id} ({self.name})"
+
+
+class ReservationSeries(TimeStampedModel):
+    """Regla de recurrencia (estilo RRULE) cuyas ocurrencias son reservas normales."""
+
+    class Frequency(models.TextChoices):
+        DAILY = "DAILY", "Daily"
+        WEEKLY = "WEEKLY", "Weekly"
+
+    space_id = models.IntegerField()
+    space_name = models.CharField(max_length=255)
+    space_location = models.CharField(max_length=255, blank=True)
+    space_description = models.TextField(blank=True)
+
+    created_by_id = models.IntegerField()
+    created_by_email = models.EmailField()
+    created_by_first_name = models.CharField(max_length=150, blank=True)
+    created_by_last_name = models.CharField(max_length=150, blank=True)
+
+    title = models.CharField(max_length=255)
+    description = models.TextField(blank=True)
+    start_at = models.DateTimeField(help_text="Inicio de la primera ocurrencia")
+    end_at = models.DateTimeField(help_text="Fin de la primera ocurrencia")
+    frequency = models.CharField(max_length=10, choices=Frequency.choices, default=Frequency.WEEKLY)
+    interval = models.PositiveSmallIntegerField(default=1)
+    weekdays = models.CharField(max_length=32, blank=True, help_text="Días RRULE separados por coma (MO,TU,...)")
+    until = models.DateField(null=True, blank=True)
+    count = models.PositiveIntegerField(null=True, blank=True)
+    exceptions = models.JSONField(default=list, blank=True, help_text="Fechas (YYYY-MM-DD) excluidas")
+
+    class Meta:
+        ordering = ["-start_at"]
+        indexes = [
+            models.Index(fields=["created_by_id", "start_at"], name="IX_series_created_start"),
+        ]
+
+    def __str__(self):
+        return f"{self.title} ({self.frequency})"
+
+
+class ReservationDailyRollup(models.Model):
+    """Totales por espacio, fecha local de inicio y estado; los mantiene ``reservations.services``."""
+
+    space_id = models.IntegerField()
+    date = models.DateField()
+    status = models.CharField(max_length=20, choices=Reservation.Status.choices)
+    count = models.IntegerField(default=0)
+    occupied_minutes = models.BigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["space_id", "date", "status"], name="UQ_rollup_space_date_status"),
+        ]
+        indexes = [
+            models.Index(fields=["date", "space_id"], name="IX_rollup_date_space"),
+        ]
+
+    def __str__(self):
+        return f"Espacio {self.space_id} {self.date} {self.status}: {self.count}"
+
+
+class ReportJob(TimeStampedModel):
+    """Reporte PDF generado en segundo plano; el archivo queda en ``ReportJobChunk`` hasta ``expires_at``."""
+
+    class Status(models.TextChoices):
+        QUEUED = "QUEUED", "Queued"
+        RUNNING = "RUNNING", "Running"
+        DONE = "DONE", "Done"
+        FAILED = "FAILED", "Failed"
+        EXPIRED = "EXPIRED", "Expired"
+
+    requested_by_id = models.IntegerField()
+    requested_by_email = models.EmailField(blank=True)
+    params = models.JSONField(default=dict)
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.QUEUED)
+    progress = models.PositiveSmallIntegerField(default=0)
+    # Ranura de ejecución 1..REPORT_JOBS_MAX_RUNNING; al ser única limita la concurrencia global.
+    slot = models.PositiveSmallIntegerField(null=True, blank=True, unique=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    started_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    expires_at = models.DateTimeField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    file_name = models.CharField(max_length=255, blank=True)
+    file_size = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["status", "created_at"], name="IX_report_jobs_status_created"),
+            models.Index(fields=["requested_by_id", "created_at"], name="IX_report_jobs_requester"),
+        ]
+
+    def __str__(self):
+        return f"Reporte {self.pk} ({self.status})"
+
+
+class ReportJobChunk(models.Model):
+    """Trozo del archivo de un ``ReportJob``; el PDF se guarda y se sirve trozo a trozo."""
+
+    job = models.ForeignKey(ReportJob, on_delete=models.CASCADE, related_name="chunks")
+    index = models.PositiveIntegerField()
+    data = models.BinaryField(editable=False)
+
+    class Meta:
+        ordering = ["job", "index"]
+        constraints = [
+            models.UniqueConstraint(fields=["job", "index"], name="UQ_report_job_chunk"),
+        ]
+
+    def __str__(self):
+        return f"Reporte {self.job_id} trozo {self.index}"
+
+
+class ReportCacheEntry(TimeStampedModel):
+    """PDF de reporte ya generado para un conjunto de filtros normalizado (ver ``reservations.report_cache``)."""
+
+    key = models.CharField(max_length=64, unique=True)
+    params = models.JSONField(default=dict)
+    # Rango y espacio del reporte (nulos = sin límite); las escrituras invalidan las entradas que los tocan.
+    start_at = models.DateTimeField(null=True, blank=True)
+    end_at = models.DateTimeField(null=True, blank=True)
+    space_id = models.IntegerField(null=True, blank=True)
+    data_version = models.CharField(max_length=64)
+    file_size = models.PositiveIntegerField(default=0)
+    content = models.BinaryField(editable=False)
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["expires_at"], name="IX_report_cache_expires"),
+        ]
+
+    def __str__(self):
+        return f"Reporte en caché {self.key[:12]} ({self.data_version})"
@@ -0,0 +1,83 @@
+"""Ocupación por espacio y por intervalo de tiempo (mapa de calor).
+
+Los bordes de los intervalos se calculan una sola vez; cada reserva se ubica con dos búsquedas
+binarias y aporta a un arreglo de diferencias (los intervalos que cubre por completo) más dos
+ajustes parciales en los extremos. Un recorrido de suma acumulada produce la fila final, así que
+el costo es O(reservas · log intervalos + intervalos) por espacio, sin recorrer intervalo por
+intervalo cada reserva.
+"""
+from bisect import bisect_right
+from datetime import datetime, time, timedelta
+
+from django.utils import timezone
+
+BUCKETS = {
+    "15m": timedelta(minutes=15),
+    "1h": timedelta(hours=1),
+    "1d": timedelta(days=1),
+}
+
+
+def bucket_edges(start_at, end_at, bucket):
+    """Bordes alineados a la hora local: el primero ``<= start_at`` y el último ``>= end_at``.
+
+    Los intervalos diarios empiezan en la medianoche local de cada fecha.
+    """
+    tz = timezone.get_default_timezone()
+    local_start = timezone.localtime(start_at, tz)
+    if bucket == "1d":
+        day = local_start.date()
+        edges = [timezone.make_aware(datetime.combine(day, time.min), tz)]
+        while edges[-1] < end_at:
+            day += timedelta(days=1)
+            edges.append(timezone.make_aware(datetime.combine(day, time.min), tz))
+        return edges
+    size = BUCKETS[bucket]
+    midnight = local_start.replace(hour=0, minute=0, second=0, microsecond=0)
+    edge = start_at - (local_start - midnight) % size
+    edges = [edge]
+    while edges[-1] < end_at:
+        edges.append(edges[-1] + size)
+    return edges
+
+
+def occupancy_row(intervals, edges):
+    """Segundos ocupados por intervalo para una secuencia de ``(start_at, end_at)``."""
+    buckets = len(edges) - 1
+    diff = [0] * (buckets + 1)
+    partial = [0.0] * buckets
+    first_edge, last_edge = edges[0], edges[-1]
+    for start_at, end_at in intervals:
+        start_at = max(start_at, first_edge)
+        end_at = min(end_at, last_edge)
+        if start_at >= end_at:
+            continue
+        first = bisect_right(edges, start_at) - 1
+        last = bisect_right(edges, end_at) - 1
+        if first == last:
+            partial[first] += (end_at - start_at).total_seconds()
+            continue
+        # Extremos parciales y, entre ellos, intervalos completos vía diferencias.
+        partial[first] += (edges[first + 1] - start_at).total_seconds()
+        if last < buckets:
+            partial[last] += (end_at - edges[last]).total_seconds()
+        diff[first + 1] += 1
+        diff[last] -= 1
+    row = []
+    covering = 0
+    for position in range(buckets):
+        covering += diff[position]
+        full = (edges[position + 1] - edges[position]).total_seconds() if covering else 0
+        row.append(covering * full + partial[position])
+    return row
+
+
+def occupancy_matrix(rows, edges, space_ids):
+    """Matriz ``espacio × intervalo`` en minutos ocupados a partir de filas ``(space_id, start_at, end_at)``."""
+    grouped = {space_id: [] for space_id in space_ids}
+    for space_id, start_at, end_at in rows:
+        grouped.setdefault(space_id, []).append((start_at, end_at))
+    return {
+        space_id: [round(seconds / 60) for seconds in occupancy_row(intervals, edges)]
+        for space_id, intervals in grouped.items()
+    }
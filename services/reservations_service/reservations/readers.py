@@ -0,0 +1,246 @@
+"""Lectura rápida de reservas para los listados.
+
+Produce exactamente la misma salida que ``ReservationAdminSerializer`` pero a partir de
+``values_list`` (solo las columnas necesarias, sin instanciar modelos) y sin la maquinaria
+de campos de DRF: cada fila se desempaqueta en un orden de columnas fijo y las fechas pasan
+por un único formateador equivalente a ``serializers.DateTimeField``.
+"""
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+# Orden de columnas de ``admin_rows``; ``serialize_admin_row`` depende de él.
+ADMIN_COLUMNS = (
+    "id",
+    "space_id",
+    "space_name",
+    "space_location",
+    "space_description",
+    "created_by_id",
+    "created_by_email",
+    "created_by_first_name",
+    "created_by_last_name",
+    "title",
+    "description",
+    "start_at",
+    "end_at",
+    "status",
+    "approved_by_id",
+    "approved_by_email",
+    "approved_by_first_name",
+    "approved_by_last_name",
+    "decision_at",
+    "decision_note",
+    "created_at",
+    "updated_at",
+)
+
+
+# Campos de salida en el orden del serializer; los anidados indican (subcampo, columna).
+FIELDS = (
+    "id",
+    "space",
+    "created_by",
+    "title",
+    "description",
+    "start_at",
+    "end_at",
+    "status",
+    "approved_by",
+    "decision_at",
+    "decision_note",
+    "created_at",
+    "updated_at",
+)
+NESTED_FIELDS = {
+    "space": (
+        ("id", "space_id"),
+        ("name", "space_name"),
+        ("location", "space_location"),
+        ("description", "space_description"),
+    ),
+    "created_by": (
+        ("id", "created_by_id"),
+        ("email", "created_by_email"),
+        ("first_name", "created_by_first_name"),
+        ("last_name", "created_by_last_name"),
+    ),
+    "approved_by": (
+        ("id", "approved_by_id"),
+        ("email", "approved_by_email"),
+        ("first_name", "approved_by_first_name"),
+        ("last_name", "approved_by_last_name"),
+    ),
+}
+DATETIME_FIELDS = frozenset({"start_at", "end_at", "decision_at", "created_at", "updated_at"})
+# Columnas que siempre se leen: el cursor keyset ordena por (start_at, id).
+KEY_COLUMNS = ("id", "start_at")
+
+
+def admin_rows(queryset, columns=ADMIN_COLUMNS):
+    """Filas con las columnas dadas (tuplas con nombre, aptas para el cursor keyset)."""
+    return queryset.values_list(*columns, named=True)
+
+
+def datetime_formatter():
+    """Formateador ISO 8601 en la zona horaria activa, igual que ``serializers.DateTimeField``."""
+    tz = timezone.get_current_timezone()
+
+    def format_datetime(value):
+        if not value:
+            return None
+        value = value.astimezone(tz).isoformat()
+        if value.endswith("+00:00"):
+            value = value[:-6] + "Z"
+        return value
+
+    return format_datetime
+
+
+def serialize_admin_row(row, format_datetime):
+    (
+        reservation_id,
+        space_id,
+        space_name,
+        space_location,
+        space_description,
+        created_by_id,
+        created_by_email,
+        created_by_first_name,
+        created_by_last_name,
+        title,
+        description,
+        start_at,
+        end_at,
+        status,
+        approved_by_id,
+        approved_by_email,
+        approved_by_first_name,
+        approved_by_last_name,
+        decision_at,
+        decision_note,
+        created_at,
+        updated_at,
+    ) = row
+    return {
+        "id": reservation_id,
+        "space": {
+            "id": space_id,
+            "name": space_name,
+            "location": space_location,
+            "description": space_description,
+        },
+        "created_by": {
+            "id": created_by_id,
+            "email": created_by_email,
+            "first_name": created_by_first_name,
+            "last_name": created_by_last_name,
+        },
+        "title": title,
+        "description": description,
+        "start_at": format_datetime(start_at),
+        "end_at": format_datetime(end_at),
+        "status": status,
+        "approved_by": {
+            "id": approved_by_id,
+            "email": approved_by_email,
+            "first_name": approved_by_first_name,
+            "last_name": approved_by_last_name,
+        } if approved_by_id else None,
+        "decision_at": format_datetime(decision_at),
+        "decision_note": decision_note,
+        "created_at": format_datetime(created_at),
+        "updated_at": format_datetime(updated_at),
+    }
+
+
+def serialize_admin_rows(rows):
+    """Iterador de dicts con la forma de ``ReservationAdminSerializer`` para filas de ``admin_rows``."""
+    format_datetime = datetime_formatter()
+    return (serialize_admin_row(row, format_datetime) for row in rows)
+
+
+def parse_fields(value):
+    """Interpreta ``?fields=id,space.name,start_at``; devuelve ``None`` si no se pidió proyección.
+
+    El resultado es un dict ``campo -> None`` (campo completo) o ``campo -> set(subcampos)``.
+    """
+    if not value:
+        return None
+    selection = {}
+    for item in value.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        name, _, subfield = item.partition(".")
+        if name not in FIELDS:
+            raise ValidationError(f"Campo desconocido en fields: {item}")
+        if not subfield:
+            selection[name] = None
+            continue
+        if subfield not in dict(NESTED_FIELDS.get(name, ())):
+            raise ValidationError(f"Campo desconocido en fields: {item}")
+        if name not in selection or selection[name] is not None:
+            selection.setdefault(name, set()).add(subfield)
+    if not selection:
+        raise ValidationError("El parámetro fields no contiene campos")
+    return selection
+
+
+class Projection:
+    """Columnas a leer y constructor de filas para un subconjunto de campos de salida."""
+
+    def __init__(self, selection=None):
+        self.selection = selection
+        if selection is None:
+            self.columns = ADMIN_COLUMNS
+            return
+        plan = []
+        columns = list(KEY_COLUMNS)
+        for name in FIELDS:
+            if name not in selection:
+                continue
+            nested = NESTED_FIELDS.get(name)
+            if nested is None:
+                plan.append((name, name, name in DATETIME_FIELDS))
+                columns.append(name)
+                continue
+            wanted = selection[name]
+            subfields = tuple((key, column) for key, column in nested if wanted is None or key in wanted)
+            plan.append((name, subfields, name == "approved_by"))
+            columns.extend(column for _, column in subfields)
+            if name == "approved_by":
+                # approved_by es null cuando no hay aprobador, aunque no se pida su id.
+                columns.append("approved_by_id")
+        self.columns = tuple(dict.fromkeys(columns))
+        index = {column: position for position, column in enumerate(self.columns)}
+        self._plan = [
+            (name, index[source], flag) if isinstance(source, str)
+            else (name, tuple((key, index[column]) for key, column in source), index["approved_by_id"] if flag else None)
+            for name, source, flag in plan
+        ]
+
+    def rows(self, queryset):
+        return admin_rows(queryset, self.columns)
+
+    def serialize(self, rows):
+        """Iterador de dicts (forma de ``ReservationAdminSerializer`` restringida a la selección)."""
+        format_datetime = datetime_formatter()
+        if self.selection is None:
+            return (serialize_admin_row(row, format_datetime) for row in rows)
+        return (self._serialize_row(row, format_datetime) for row in rows)
+
+    def serialize_instance(self, instance):
+        row = tuple(getattr(instance, column) for column in self.columns)
+        return next(iter(self.serialize([row])))
+
+    def _serialize_row(self, row, format_datetime):
+        output = {}
+        for name, source, extra in self._plan:
+            if isinstance(source, int):
+                value = row[source]
+                output[name] = format_datetime(value) if extra else value
+            elif extra is not None and not row[extra]:
+                output[name] = None
+            else:
+                output[name] = {key: row[position] for key, position in source}
+        return output
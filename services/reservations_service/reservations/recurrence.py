@@ -0,0 +1,51 @@
+"""Expansión de reglas de recurrencia (subconjunto de RRULE) en ocurrencias concretas."""
+from datetime import datetime, time
+
+from dateutil import rrule
+from django.utils import timezone
+
+WEEKDAYS = {
+    "MO": rrule.MO,
+    "TU": rrule.TU,
+    "WE": rrule.WE,
+    "TH": rrule.TH,
+    "FR": rrule.FR,
+    "SA": rrule.SA,
+    "SU": rrule.SU,
+}
+
+FREQUENCIES = {
+    "DAILY": rrule.DAILY,
+    "WEEKLY": rrule.WEEKLY,
+}
+
+
+def expand_occurrences(start_at, end_at, frequency, interval=1, weekdays=None, until=None, count=None,
+                       exceptions=None, limit=None):
+    """Devuelve la lista ordenada de ``(start_at, end_at)`` de la serie.
+
+    La regla se evalúa en hora local (la hora de pared se conserva entre semanas) y cada
+    ocurrencia dura lo mismo que la primera. ``exceptions`` contiene fechas locales a omitir.
+    Si hay más de ``limit`` ocurrencias se lanza ``ValueError``.
+    """
+    tz = timezone.get_default_timezone()
+    duration = end_at - start_at
+    dtstart = timezone.localtime(start_at, tz).replace(tzinfo=None)
+    rule = rrule.rrule(
+        FREQUENCIES[frequency],
+        dtstart=dtstart,
+        interval=interval or 1,
+        byweekday=[WEEKDAYS[day] for day in weekdays] if weekdays else None,
+        until=datetime.combine(until, time.max) if until else None,
+        count=count,
+    )
+    skipped = set(exceptions or [])
+    occurrences = []
+    for local_start in rule:
+        if local_start.date() in skipped:
+            continue
+        occurrence_start = timezone.make_aware(local_start, tz)
+        occurrences.append((occurrence_start, occurrence_start + duration))
+        if limit is not None and len(occurrences) > limit:
+            raise ValueError(f"La serie supera el máximo de {limit} ocurrencias")
+    return occurrences
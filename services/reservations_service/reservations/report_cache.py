@@ -0,0 +1,145 @@
+"""Caché de reportes PDF ya generados (``ReportCacheEntry``).
+
+La clave es el conjunto de filtros normalizado (inicio, fin, espacio y estados): pedir el mismo
+reporte con los estados en otro orden o el espacio como texto reutiliza el mismo PDF. Cada entrada
+guarda la versión de datos (``conditional.data_version``) con la que se generó y vence a las
+``REPORT_CACHE_TTL_HOURS`` horas (0 desactiva la caché).
+
+Las escrituras de ``reservations.services`` llaman a ``invalidate`` dentro de su transacción con
+las reservas antes y después del cambio, así que solo se descartan los reportes cuyo rango y
+espacio las incluyen: reservar la semana próxima no invalida el reporte del mes pasado. Un reporte
+que se estaba generando mientras otra escritura cambiaba los datos no se conserva, porque su
+versión ya no coincide al guardarlo.
+"""
+import hashlib
+import json
+from datetime import timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import IntegrityError
+from django.db.models import Q
+from django.utils import timezone
+
+from reservations.conditional import data_version
+from reservations.models import ReportCacheEntry
+
+
+def normalize_filters(start=None, end=None, space_id=None, statuses=None):
+    """Filtros del reporte en forma canónica; lanza ``ValueError`` si ``space_id`` no es numérico."""
+    return {
+        "start": start,
+        "end": end,
+        "space_id": int(space_id) if space_id not in (None, "") else None,
+        "statuses": sorted(set(statuses)) if statuses else None,
+    }
+
+
+def _params(filters):
+    def instant(value):
+        return value.astimezone(dt_timezone.utc).isoformat() if value else None
+
+    return {
+        "start": instant(filters["start"]),
+        "end": instant(filters["end"]),
+        "space_id": filters["space_id"],
+        "statuses": filters["statuses"],
+    }
+
+
+def cache_key(filters):
+    payload = json.dumps(_params(filters), sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def enabled():
+    return settings.REPORT_CACHE_TTL_HOURS > 0
+
+
+def current_version(filters):
+    """Versión de los datos del reporte; se toma antes de generarlo y se pasa a ``store``."""
+    return data_version(filters["space_id"])
+
+
+def lookup(filters):
+    """Entrada vigente para ``filters`` (ya normalizados) o ``None``."""
+    if not enabled():
+        return None
+    return ReportCacheEntry.objects.filter(key=cache_key(filters), expires_at__gt=timezone.now()).first()
+
+
+def store(filters, version, content):
+    """Guarda ``content`` si los datos siguen en ``version``; devuelve la entrada o ``None``."""
+    if not enabled() or len(content) > settings.REPORT_CACHE_MAX_BYTES:
+        return None
+    if current_version(filters) != version:
+        return None
+    now = timezone.now()
+    try:
+        entry, _ = ReportCacheEntry.objects.update_or_create(
+            key=cache_key(filters),
+            defaults={
+                "params": _params(filters),
+                "start_at": filters["start"],
+                "end_at": filters["end"],
+                "space_id": filters["space_id"],
+                "data_version": version,
+                "file_size": len(content),
+                "content": content,
+                "expires_at": now + timedelta(hours=settings.REPORT_CACHE_TTL_HOURS),
+            },
+        )
+    except IntegrityError:
+        # Otro proceso guardó el mismo reporte a la vez; basta con una copia.
+        return None
+    if current_version(filters) != version:
+        # Una escritura confirmada entre la comprobación y el guardado pudo no ver esta entrada.
+        ReportCacheEntry.objects.filter(pk=entry.pk, data_version=version).delete()
+        return None
+    return entry
+
+
+def store_file(filters, version, output):
+    """Como ``store`` para un archivo abierto (p. ej. un ``SpooledTemporaryFile``); lo deja rebobinado."""
+    size = output.seek(0, 2)
+    entry = None
+    if enabled() and size <= settings.REPORT_CACHE_MAX_BYTES:
+        output.seek(0)
+        entry = store(filters, version, output.read())
+    output.seek(0)
+    return entry
+
+
+def invalidate(rows):
+    """Descarta las entradas cuyo rango y espacio incluyen alguna de las reservas ``rows``.
+
+    ``rows`` son fotos ``(space_id, start_at, end_at, ...)`` como las de ``rollups.snapshot``; se
+    agrupan por espacio para que una serie de cientos de reservas sea una sola condición.
+    """
+    spans = {}
+    for row in rows:
+        if not row:
+            continue
+        space_id, start_at, end_at = row[:3]
+        low, high = spans.get(space_id, (start_at, end_at))
+        spans[space_id] = (min(low, start_at), max(high, end_at))
+    if not spans:
+        return 0
+    condition = Q()
+    for space_id, (start_at, end_at) in spans.items():
+        condition |= (
+            (Q(space_id__isnull=True) | Q(space_id=space_id))
+            & (Q(start_at__isnull=True) | Q(start_at__lte=end_at))
+            & (Q(end_at__isnull=True) | Q(end_at__gte=start_at))
+        )
+    # Primero una lectura sin bloqueos: así las escrituras solo bloquean las filas que borran.
+    stale = list(ReportCacheEntry.objects.filter(condition).values_list("id", flat=True))
+    if not stale:
+        return 0
+    deleted, _ = ReportCacheEntry.objects.filter(pk__in=stale).delete()
+    return deleted
+
+
+def purge_expired(now=None):
+    """Borra las entradas vencidas; devuelve cuántas."""
+    deleted, _ = ReportCacheEntry.objects.filter(expires_at__lte=now or timezone.now()).delete()
+    return deleted
@@ -0,0 +1,345 @@
+"""Reportes PDF en segundo plano, sin broker externo.
+
+Crear un trabajo solo inserta un ``ReportJob`` en cola; al confirmar la transacción se despierta
+un hilo del pool local (``REPORT_JOBS_WORKERS`` por proceso), así que el PDF nunca se genera en
+el hilo de la petición. La concurrencia global la impone la base de datos: un trabajo pasa a
+RUNNING solo si ocupa una de las ``REPORT_JOBS_MAX_RUNNING`` ranuras (``slot`` es único), sin
+importar cuántos procesos de gunicorn o réplicas haya. Cada hilo, al terminar un trabajo, vuelve
+a reclamar el siguiente de la cola, lo haya creado su proceso u otro.
+
+Los trabajos cuyo latido (``heartbeat_at``) se detiene por más de ``REPORT_JOBS_STALE_SECONDS``
+(proceso reiniciado, por ejemplo) vuelven a la cola hasta ``REPORT_JOBS_MAX_ATTEMPTS`` intentos.
+Como un trabajo recuperado solo se atiende si algún proceso despierta el pool, ``supervisord.conf``
+ejecuta ``process_report_jobs --every`` para recuperar, purgar y vaciar la cola periódicamente.
+Los archivos terminados se conservan ``REPORT_JOBS_TTL_HOURS`` y luego se descartan. El PDF se
+genera en un archivo temporal (``spooled_reservations_report``) y se guarda en trozos de
+``CHUNK_BYTES`` (``ReportJobChunk``); la descarga los lee de uno en uno, así que ningún paso tiene
+el archivo entero en memoria.
+
+Si el reporte pedido está en ``reservations.report_cache`` el trabajo se crea ya terminado con
+ese PDF; si no, el PDF que genere el trabajo queda en la caché para los siguientes.
+"""
+import io
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, connections, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from reservations import report_cache
+from reservations.models import ReportJob, ReportJobChunk, Reservation
+from reservations.reporting import spooled_reservations_report
+
+logger = logging.getLogger(__name__)
+
+# Se escribe el avance como mucho cada tantos segundos o puntos porcentuales.
+PROGRESS_INTERVAL_SECONDS = 2
+PROGRESS_STEP = 5
+# Tamaño de cada trozo del archivo guardado (muy por debajo del max_allowed_packet de MySQL).
+CHUNK_BYTES = 1024 * 1024
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def report_queryset(start=None, end=None, space_id=None, statuses=None):
+    """Reservas del reporte (mismos filtros que ``GET /reservations/report/``) ordenadas por espacio."""
+    queryset = Reservation.objects.all()
+    if start:
+        queryset = queryset.filter(end_at__gte=start)
+    if end:
+        queryset = queryset.filter(start_at__lte=end)
+    if space_id:
+        queryset = queryset.filter(space_id=space_id)
+    if statuses:
+        queryset = queryset.filter(status__in=statuses)
+    return queryset.order_by("space_name", "start_at")
+
+
+def job_params(start=None, end=None, space_id=None, statuses=None):
+    """Filtros del reporte en forma serializable a JSON para ``ReportJob.params``."""
+    return {
+        "start": start.isoformat() if start else None,
+        "end": end.isoformat() if end else None,
+        "space_id": space_id,
+        "statuses": list(statuses) if statuses else None,
+    }
+
+
+def job_filters(params):
+    return {
+        "start": parse_datetime(params["start"]) if params.get("start") else None,
+        "end": parse_datetime(params["end"]) if params.get("end") else None,
+        "space_id": params.get("space_id"),
+        "statuses": params.get("statuses"),
+    }
+
+
+def create_job(user, filters):
+    """Encola un reporte con los filtros dados y despierta el pool al confirmar la transacción.
+
+    Si el reporte ya está en caché el trabajo nace en DONE con ese archivo y no se encola.
+    """
+    filters = report_cache.normalize_filters(**filters)
+    cached = report_cache.lookup(filters)
+    job = ReportJob.objects.create(
+        requested_by_id=user.id,
+        requested_by_email=getattr(user, "email", "") or "",
+        params=job_params(**filters),
+    )
+    if cached is None:
+        transaction.on_commit(dispatch)
+        return job
+    now = timezone.now()
+    job.status = ReportJob.Status.DONE
+    job.progress = 100
+    job.started_at = job.finished_at = now
+    job.file_size = store_artifact(job.pk, io.BytesIO(cached.content))
+    job.file_name = _file_name(job.pk, now)
+    job.expires_at = now + timedelta(hours=settings.REPORT_JOBS_TTL_HOURS)
+    job.save()
+    return job
+
+
+def store_artifact(job_id, output):
+    """Guarda el archivo abierto ``output`` como trozos del trabajo; devuelve su tamaño en bytes."""
+    ReportJobChunk.objects.filter(job_id=job_id).delete()
+    output.seek(0)
+    size = 0
+    index = 0
+    while True:
+        data = output.read(CHUNK_BYTES)
+        if not data:
+            return size
+        ReportJobChunk.objects.create(job_id=job_id, index=index, data=data)
+        size += len(data)
+        index += 1
+
+
+class ArtifactReader(io.RawIOBase):
+    """Archivo de solo lectura sobre los trozos de un trabajo; carga un trozo a la vez."""
+
+    def __init__(self, job_id):
+        super().__init__()
+        self.job_id = job_id
+        self.index = 0
+        self.pending = memoryview(b"")
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        if not self.pending:
+            data = (
+                ReportJobChunk.objects.filter(job_id=self.job_id, index=self.index)
+                .values_list("data", flat=True)
+                .first()
+            )
+            if data is None:
+                return 0
+            self.pending = memoryview(bytes(data))
+            self.index += 1
+        size = min(len(buffer), len(self.pending))
+        buffer[:size] = self.pending[:size]
+        self.pending = self.pending[size:]
+        return size
+
+
+def open_artifact(job):
+    """Archivo del trabajo terminado ``job`` listo para ``FileResponse``."""
+    return io.BufferedReader(ArtifactReader(job.pk), buffer_size=CHUNK_BYTES)
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=max(1, settings.REPORT_JOBS_WORKERS), thread_name_prefix="report-jobs"
+            )
+        return _executor
+
+
+def dispatch():
+    """Pide a un hilo del pool que procese la cola; no bloquea."""
+    _get_executor().submit(run_pending)
+
+
+def run_pending(limit=None):
+    """Procesa trabajos en cola mientras haya ranuras libres; devuelve cuántos ejecutó."""
+    processed = 0
+    try:
+        recover_stale()
+        purge_expired()
+        report_cache.purge_expired()
+        while limit is None or processed < limit:
+            job = claim_next()
+            if job is None:
+                break
+            run_job(job)
+            processed += 1
+    except Exception:
+        logger.exception("Error procesando la cola de reportes")
+    finally:
+        # Las conexiones son por hilo: el pool no debe dejarlas abiertas entre rondas.
+        connections.close_all()
+    return processed
+
+
+def _free_slots():
+    taken = set(ReportJob.objects.filter(slot__isnull=False).values_list("slot", flat=True))
+    return [slot for slot in range(1, max(1, settings.REPORT_JOBS_MAX_RUNNING) + 1) if slot not in taken]
+
+
+def claim_next():
+    """Pasa el trabajo en cola más antiguo a RUNNING ocupando una ranura libre, o devuelve ``None``."""
+    while True:
+        slots = _free_slots()
+        if not slots:
+            return None
+        job_id = (
+            ReportJob.objects.filter(status=ReportJob.Status.QUEUED)
+            .order_by("created_at", "id")
+            .values_list("id", flat=True)
+            .first()
+        )
+        if job_id is None:
+            return None
+        now = timezone.now()
+        try:
+            with transaction.atomic():
+                claimed = ReportJob.objects.filter(pk=job_id, status=ReportJob.Status.QUEUED).update(
+                    status=ReportJob.Status.RUNNING,
+                    slot=slots[0],
+                    progress=0,
+                    attempts=F("attempts") + 1,
+                    started_at=now,
+                    heartbeat_at=now,
+                    updated_at=now,
+                )
+        except IntegrityError:
+            # Otro proceso tomó la misma ranura; se vuelve a mirar cuáles quedan.
+            continue
+        if claimed:
+            return ReportJob.objects.get(pk=job_id)
+
+
+class _ProgressWriter:
+    """Guarda el avance del trabajo (y su latido) sin escribir en cada evento de reportlab."""
+
+    def __init__(self, job_id):
+        self.job_id = job_id
+        self.written = 0
+        self.written_at = time.monotonic()
+
+    def __call__(self, percent):
+        now = time.monotonic()
+        if percent - self.written < PROGRESS_STEP and now - self.written_at < PROGRESS_INTERVAL_SECONDS:
+            return
+        self.written = percent
+        self.written_at = now
+        ReportJob.objects.filter(pk=self.job_id, status=ReportJob.Status.RUNNING).update(
+            progress=percent, heartbeat_at=timezone.now()
+        )
+
+
+def _file_name(job_id, now):
+    return f"reporte_reservas_{job_id}_{timezone.localtime(now).strftime('%Y%m%d_%H%M')}.pdf"
+
+
+def run_job(job):
+    """Genera el PDF de un trabajo ya reclamado y libera su ranura, termine bien o mal."""
+    running = ReportJob.objects.filter(pk=job.pk, status=ReportJob.Status.RUNNING)
+    version = None
+    output = None
+    try:
+        filters = report_cache.normalize_filters(**job_filters(job.params))
+        cached = report_cache.lookup(filters)
+        if cached is not None:
+            output = io.BytesIO(cached.content)
+        else:
+            version = report_cache.current_version(filters)
+            output = spooled_reservations_report(
+                report_queryset(**filters),
+                start=filters["start"],
+                end=filters["end"],
+                space=filters["space_id"],
+                statuses=filters["statuses"],
+                progress=_ProgressWriter(job.pk),
+            )
+        _finish(job, running, output)
+    except Exception as exc:
+        logger.exception("Falló el reporte %s", job.pk)
+        running.update(
+            status=ReportJob.Status.FAILED,
+            slot=None,
+            error=str(exc)[:1000] or exc.__class__.__name__,
+            finished_at=timezone.now(),
+            updated_at=timezone.now(),
+        )
+        if output is not None:
+            output.close()
+        return
+    if version is not None:
+        try:
+            report_cache.store_file(filters, version, output)
+        except Exception:
+            logger.exception("No se pudo guardar en caché el reporte %s", job.pk)
+    output.close()
+
+
+def _finish(job, running, output):
+    """Guarda el archivo y marca el trabajo DONE en una transacción.
+
+    Si el trabajo dejó de estar RUNNING (se dio por caído y volvió a la cola) no se guarda nada.
+    """
+    with transaction.atomic():
+        size = store_artifact(job.pk, output)
+        now = timezone.now()
+        finished = running.update(
+            status=ReportJob.Status.DONE,
+            slot=None,
+            progress=100,
+            error="",
+            file_size=size,
+            file_name=_file_name(job.pk, now),
+            finished_at=now,
+            expires_at=now + timedelta(hours=settings.REPORT_JOBS_TTL_HOURS),
+            updated_at=now,
+        )
+        if not finished:
+            transaction.set_rollback(True)
+
+
+def recover_stale(now=None):
+    """Devuelve a la cola (o da por fallidos) los trabajos RUNNING sin latido reciente."""
+    now = now or timezone.now()
+    stale = ReportJob.objects.filter(
+        status=ReportJob.Status.RUNNING,
+        heartbeat_at__lt=now - timedelta(seconds=settings.REPORT_JOBS_STALE_SECONDS),
+    )
+    failed = stale.filter(attempts__gte=settings.REPORT_JOBS_MAX_ATTEMPTS).update(
+        status=ReportJob.Status.FAILED,
+        slot=None,
+        error="El trabajo dejó de responder",
+        finished_at=now,
+        updated_at=now,
+    )
+    requeued = stale.update(status=ReportJob.Status.QUEUED, slot=None, progress=0, updated_at=now)
+    return requeued, failed
+
+
+def purge_expired(now=None):
+    """Descarta los archivos vencidos; la fila queda como EXPIRED. Devuelve cuántos se purgaron."""
+    now = now or timezone.now()
+    expired = ReportJob.objects.filter(status=ReportJob.Status.DONE, expires_at__lte=now).update(
+        status=ReportJob.Status.EXPIRED, updated_at=now
+    )
+    ReportJobChunk.objects.filter(job__status=ReportJob.Status.EXPIRED).delete()
+    return expired
@@ -1,6 +1,15 @@
+import os
 from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import ExitStack
+from functools import lru_cache
 from io import BytesIO
+from itertools import islice
+from multiprocessing import get_context
+from tempfile import SpooledTemporaryFile, TemporaryDirectory
 
+from django.conf import settings
+from django.db.models import Count
 from django.utils import timezone
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import LETTER
@@ -10,6 +19,7 @@ from reportlab.platypus import (
     BaseDocTemplate,
     Frame,
     KeepTogether,
+    LongTable,
     PageTemplate,
     Paragraph,
     Spacer,
@@ -19,6 +29,9 @@ from reportlab.platypus import (
     PageBreak,
 )
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+from reservations.streaming import iterate_keyset
 
 # ============================================================================
 # PALETA PROFESIONAL INSTITUCIONAL
@@ -183,61 +196,195 @@ def _get_styles():
     return styles
 
 
-def _extract_reservation_data(reservation):
-    """Extrae datos de una reserva (modelo desnormalizado de microservicio)."""
-    creator = f"{reservation.created_by_first_name} {reservation.created_by_last_name}".strip()
-    creator = creator or reservation.created_by_email or "Usuario"
+# Columnas que lee el reporte; el resto de la reserva no se carga.
+REPORT_FIELDS = (
+    "id",
+    "space_name",
+    "title",
+    "start_at",
+    "end_at",
+    "status",
+    "created_by_email",
+    "created_by_first_name",
+    "created_by_last_name",
+)
+NO_SPACE_LABEL = "Sin espacio"
+
+REPORT_TITLE = "Reporte de Reservas - LibApartado"
+REPORT_AUTHOR = "Sistema LibApartado - FESC"
+
 
-    approver = ""
-    if reservation.approved_by_id:
-        approver = f"{reservation.approved_by_first_name} {reservation.approved_by_last_name}".strip()
-        approver = approver or reservation.approved_by_email
+def _extract_reservation_data(row):
+    """Extrae datos de una fila de ``values(*REPORT_FIELDS)`` (modelo desnormalizado de microservicio)."""
+    creator = f"{row['created_by_first_name']} {row['created_by_last_name']}".strip()
+    creator = creator or row["created_by_email"] or "Usuario"
 
     return {
-        "id": reservation.id,
-        "title": reservation.title or "Sin título",
-        "description": reservation.description or "",
-        "space": reservation.space_name or "Sin espacio",
-        "location": reservation.space_location or "",
-        "start_at": reservation.start_at,
-        "end_at": reservation.end_at,
-        "status": reservation.status,
+        "title": row["title"] or "Sin título",
+        "space": row["space_name"] or NO_SPACE_LABEL,
+        "start_at": row["start_at"],
+        "end_at": row["end_at"],
+        "status": row["status"],
         "created_by": creator,
-        "created_by_email": reservation.created_by_email or "",
-        "approved_by": approver,
-        "decision_note": reservation.decision_note or "",
     }
 
 
-def _create_status_cell(status):
-    config = STATUS_CONFIG.get(status, STATUS_CONFIG["PENDING"])
-    styles = _get_styles()
+def _summarize(reservations):
+    """Conteos por espacio (nombre mostrado) y estado, calculados en SQL."""
+    per_space = defaultdict(Counter)
+    counts = reservations.order_by().values_list("space_name", "status").annotate(total=Count("id"))
+    for space_name, status, total in counts:
+        per_space[space_name or NO_SPACE_LABEL][status] += total
+    return per_space
 
-    badge_style = ParagraphStyle(
-        name=f"BadgeStyle_{status}",
-        parent=styles["RptBadge"],
-        textColor=config["color"],
-    )
 
-    return Table(
-        [[Paragraph(config["label"], badge_style)]],
-        colWidths=[55],
-        rowHeights=[16],
-        style=TableStyle([
-            ("BACKGROUND", (0, 0), (-1, -1), config["bg"]),
+def _space_rows(reservations, space_name, chunk_size):
+    """Filas de un espacio en orden de inicio, leídas por lotes keyset."""
+    names = [space_name, ""] if space_name == NO_SPACE_LABEL else [space_name]
+    queryset = reservations.filter(space_name__in=names).values(*REPORT_FIELDS)
+    return iterate_keyset(queryset, ("start_at", "id"), chunk_size)
+
+
+# Columnas de la tabla de reservas y su encabezado (se repite en cada página).
+RESERVATION_COLUMNS = (
+    ("RESERVA", 45*mm),
+    ("ESPACIO", 35*mm),
+    ("SOLICITANTE", 40*mm),
+    ("FECHA/HORA", 35*mm),
+    ("ESTADO", 20*mm),
+)
+
+
+class _CellParagraph(Paragraph):
+    """Párrafo de celda que no vuelve a partir líneas si el ancho disponible no cambió.
+
+    ``Table`` mide cada celda al calcular alturas, al partir la tabla entre páginas y al
+    dibujarla; el ancho de columna es fijo, así que basta con partir las líneas una vez.
+    """
+
+    _wrapped_width = None
+
+    def wrap(self, availWidth, availHeight):
+        if availWidth != self._wrapped_width:
+            super().wrap(availWidth, availHeight)
+            self._wrapped_width = availWidth
+        return self.width, self.height
+
+
+class ReportTheme:
+    """Estilos del reporte construidos una sola vez por proceso (ver ``report_theme``).
+
+    Solo guarda objetos que reportlab lee pero no modifica al maquetar (hojas de estilo,
+    ``ParagraphStyle``, ``TableStyle`` y anchos), así que se comparten entre reportes e hilos.
+    Los flowables sí guardan estado al maquetarse: esos se crean por documento con ``badges``.
+    """
+
+    def __init__(self):
+        self.styles = _get_styles()
+        self.badge_styles = {
+            status: ParagraphStyle(
+                name=f"BadgeStyle_{status}",
+                parent=self.styles["RptBadge"],
+                textColor=config["color"],
+            )
+            for status, config in STATUS_CONFIG.items()
+        }
+        self.badge_table_styles = {
+            status: TableStyle([
+                ("BACKGROUND", (0, 0), (-1, -1), config["bg"]),
+                ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+                ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+                ("LEFTPADDING", (0, 0), (-1, -1), 4),
+                ("RIGHTPADDING", (0, 0), (-1, -1), 4),
+                ("TOPPADDING", (0, 0), (-1, -1), 2),
+                ("BOTTOMPADDING", (0, 0), (-1, -1), 2),
+            ])
+            for status, config in STATUS_CONFIG.items()
+        }
+        self.summary_table_style = TableStyle([
             ("ALIGN", (0, 0), (-1, -1), "CENTER"),
             ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-            ("LEFTPADDING", (0, 0), (-1, -1), 4),
-            ("RIGHTPADDING", (0, 0), (-1, -1), 4),
-            ("TOPPADDING", (0, 0), (-1, -1), 2),
-            ("BOTTOMPADDING", (0, 0), (-1, -1), 2),
+            ("BACKGROUND", (0, 0), (-1, -1), COLORS["gray_bg"]),
+            ("BOX", (0, 0), (-1, -1), 0.5, COLORS["gray_border"]),
+            ("LEFTPADDING", (0, 0), (-1, -1), 8),
+            ("RIGHTPADDING", (0, 0), (-1, -1), 8),
+            ("TOPPADDING", (0, 0), (-1, -1), 8),
+            ("BOTTOMPADDING", (0, 0), (-1, -1), 8),
         ])
-    )
+        self.reservation_col_widths = [width for _, width in RESERVATION_COLUMNS]
+        self.reservations_table_style = TableStyle([
+            # Header
+            ("BACKGROUND", (0, 0), (-1, 0), COLORS["primary"]),
+            ("TEXTCOLOR", (0, 0), (-1, 0), COLORS["white"]),
+            ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+            ("FONTSIZE", (0, 0), (-1, 0), 9),
+            ("ALIGN", (0, 0), (-1, 0), "CENTER"),
+            ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
 
+            # Filas (alternadas con un solo comando en vez de uno por fila)
+            ("FONTNAME", (0, 1), (-1, -1), "Helvetica"),
+            ("FONTSIZE", (0, 1), (-1, -1), 9),
+            ("ALIGN", (0, 1), (-1, -1), "LEFT"),
+            ("ALIGN", (-1, 1), (-1, -1), "CENTER"),
+            ("ROWBACKGROUNDS", (0, 1), (-1, -1), [COLORS["white"], COLORS["gray_row_alt"]]),
 
-def _create_summary_stats(counter):
+            # Bordes
+            ("BOX", (0, 0), (-1, -1), 1, COLORS["gray_border"]),
+            ("LINEBELOW", (0, 0), (-1, 0), 2, COLORS["primary_dark"]),
+            ("LINEBELOW", (0, 1), (-1, -2), 0.5, COLORS["gray_border"]),
+
+            # Padding
+            ("LEFTPADDING", (0, 0), (-1, -1), 8),
+            ("RIGHTPADDING", (0, 0), (-1, -1), 8),
+            ("TOPPADDING", (0, 0), (-1, -1), 8),
+            ("BOTTOMPADDING", (0, 0), (-1, -1), 8),
+        ])
+        self.main_title_style = ParagraphStyle(
+            name="ReportMainTitle",
+            fontName="Helvetica-Bold",
+            fontSize=18,
+            leading=22,
+            textColor=COLORS["black"],
+            alignment=TA_CENTER,
+            spaceAfter=15,
+        )
+        self.space_title_style = ParagraphStyle(
+            name="SpaceTitle",
+            fontName="Helvetica-Bold",
+            fontSize=12,
+            textColor=COLORS["white"],
+        )
+        self.space_title_table_style = TableStyle([
+            ("BACKGROUND", (0, 0), (-1, -1), COLORS["primary"]),
+            ("ALIGN", (0, 0), (-1, -1), "LEFT"),
+            ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+            ("LEFTPADDING", (0, 0), (-1, -1), 10),
+            ("RIGHTPADDING", (0, 0), (-1, -1), 10),
+            ("TOPPADDING", (0, 0), (-1, -1), 8),
+            ("BOTTOMPADDING", (0, 0), (-1, -1), 8),
+        ])
+
+    def badges(self):
+        """Una insignia por estado para un documento; todas las filas con ese estado la reutilizan."""
+        return {
+            status: Table(
+                [[_CellParagraph(config["label"], self.badge_styles[status])]],
+                colWidths=[55],
+                rowHeights=[16],
+                style=self.badge_table_styles[status],
+            )
+            for status, config in STATUS_CONFIG.items()
+        }
+
+
+@lru_cache(maxsize=None)
+def report_theme():
+    return ReportTheme()
+
+
+def _create_summary_stats(counter, theme):
     """Crea estadísticas de resumen en formato horizontal."""
-    styles = _get_styles()
+    styles = theme.styles
     total = sum(counter.values())
 
     stats_data = []
@@ -254,84 +401,106 @@ def _create_summary_stats(counter):
         Paragraph(f'<b>{total}</b>', styles["RptBody"]),
     ])
 
-    return Table(
-        [stats_data],
-        colWidths=[35*mm] * 5,
-        style=TableStyle([
-            ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-            ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-            ("BACKGROUND", (0, 0), (-1, -1), COLORS["gray_bg"]),
-            ("BOX", (0, 0), (-1, -1), 0.5, COLORS["gray_border"]),
-            ("LEFTPADDING", (0, 0), (-1, -1), 8),
-            ("RIGHTPADDING", (0, 0), (-1, -1), 8),
-            ("TOPPADDING", (0, 0), (-1, -1), 8),
-            ("BOTTOMPADDING", (0, 0), (-1, -1), 8),
-        ])
-    )
-
-
-def _create_reservations_table(reservations_data):
-    """Crea tabla profesional de reservas."""
-    styles = _get_styles()
-
-    # Encabezados
-    headers = [
-        Paragraph("<b>RESERVA</b>", styles["RptTableHeader"]),
-        Paragraph("<b>ESPACIO</b>", styles["RptTableHeader"]),
-        Paragraph("<b>SOLICITANTE</b>", styles["RptTableHeader"]),
-        Paragraph("<b>FECHA/HORA</b>", styles["RptTableHeader"]),
-        Paragraph("<b>ESTADO</b>", styles["RptTableHeader"]),
-    ]
-
-    rows = [headers]
-
-    for i, data in enumerate(reservations_data):
-        row = [
-            Paragraph(data["title"][:30] + ("..." if len(data["title"]) > 30 else ""), styles["RptTableCell"]),
-            Paragraph(data["space"], styles["RptTableCell"]),
-            Paragraph(data["created_by"], styles["RptTableCell"]),
-            Paragraph(f'{_format_date_short(data["start_at"])}<br/>{_format_time(data["start_at"])} - {_format_time(data["end_at"])}', styles["RptTableCell"]),
-            _create_status_cell(data["status"]),
+    return Table([stats_data], colWidths=[35*mm] * 5, style=theme.summary_table_style)
+
+
+class _ReservationRows:
+    """Marcador en el story que entrega la tabla de un espacio por lotes mientras se maqueta.
+
+    ``_ReportDocTemplate`` lo reemplaza por una ``LongTable`` con el siguiente lote y, cuando a la
+    tabla en curso le quedan pocas filas por ubicar, la reconstruye con esas filas más el lote
+    siguiente. Así solo hay en memoria un lote de filas (y sus párrafos) a la vez, y la tabla
+    sigue de corrido entre lotes con el encabezado repetido en cada página.
+    """
+
+    # Algo más de una página de filas: por debajo se completa con el lote siguiente.
+    refill_rows = 60
+
+    def __init__(self, rows, theme, badges, chunk_size, on_rows=None):
+        self.rows = iter(rows)
+        self.theme = theme
+        self.badges = badges
+        self.chunk_size = chunk_size
+        self.on_rows = on_rows
+        self.started = False
+        self.exhausted = False
+        self.cell_style = theme.styles["RptTableCell"]
+        self.default_badge = badges["PENDING"]
+        # Espacio y solicitante se repiten entre filas: un párrafo por texto distinto.
+        self.shared_cells = {}
+        self.header = [_CellParagraph(f"<b>{label}</b>", theme.styles["RptTableHeader"]) for label, _ in RESERVATION_COLUMNS]
+
+    def _shared_cell(self, text):
+        cell = self.shared_cells.get(text)
+        if cell is None:
+            cell = self.shared_cells[text] = _CellParagraph(text, self.cell_style)
+        return cell
+
+    def _cells(self, data):
+        title = data["title"]
+        return [
+            _CellParagraph(title[:30] + ("..." if len(title) > 30 else ""), self.cell_style),
+            self._shared_cell(data["space"]),
+            self._shared_cell(data["created_by"]),
+            _CellParagraph(f'{_format_date_short(data["start_at"])}<br/>{_format_time(data["start_at"])} - {_format_time(data["end_at"])}', self.cell_style),
+            self.badges.get(data["status"], self.default_badge),
         ]
-        rows.append(row)
-
-    col_widths = [45*mm, 35*mm, 40*mm, 35*mm, 20*mm]
-
-    table_style = [
-        # Header
-        ("BACKGROUND", (0, 0), (-1, 0), COLORS["primary"]),
-        ("TEXTCOLOR", (0, 0), (-1, 0), COLORS["white"]),
-        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-        ("FONTSIZE", (0, 0), (-1, 0), 9),
-        ("ALIGN", (0, 0), (-1, 0), "CENTER"),
-        ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-
-        # Filas
-        ("FONTNAME", (0, 1), (-1, -1), "Helvetica"),
-        ("FONTSIZE", (0, 1), (-1, -1), 9),
-        ("ALIGN", (0, 1), (-1, -1), "LEFT"),
-        ("ALIGN", (-1, 1), (-1, -1), "CENTER"),
-
-        # Bordes
-        ("BOX", (0, 0), (-1, -1), 1, COLORS["gray_border"]),
-        ("LINEBELOW", (0, 0), (-1, 0), 2, COLORS["primary_dark"]),
-        ("LINEBELOW", (0, 1), (-1, -2), 0.5, COLORS["gray_border"]),
-
-        # Padding
-        ("LEFTPADDING", (0, 0), (-1, -1), 8),
-        ("RIGHTPADDING", (0, 0), (-1, -1), 8),
-        ("TOPPADDING", (0, 0), (-1, -1), 8),
-        ("BOTTOMPADDING", (0, 0), (-1, -1), 8),
-    ]
-
-    # Filas alternadas
-    for i in range(1, len(rows)):
-        if i % 2 == 0:
-            table_style.append(("BACKGROUND", (0, i), (-1, i), COLORS["gray_row_alt"]))
-        else:
-            table_style.append(("BACKGROUND", (0, i), (-1, i), COLORS["white"]))
 
-    return Table(rows, colWidths=col_widths, style=TableStyle(table_style), repeatRows=1)
+    def _next_chunk(self):
+        cells = [self._cells(_extract_reservation_data(row)) for row in islice(self.rows, self.chunk_size)]
+        if len(cells) < self.chunk_size:
+            self.exhausted = True
+        if cells and self.on_rows:
+            self.on_rows(len(cells))
+        return cells
+
+    def _table(self, rows):
+        return LongTable(
+            [self.header] + rows,
+            colWidths=self.theme.reservation_col_widths,
+            style=self.theme.reservations_table_style,
+            repeatRows=1,
+        )
+
+    def _fill(self, rows):
+        while len(rows) <= self.refill_rows and not self.exhausted:
+            rows.extend(self._next_chunk())
+        return rows
+
+    def next_table(self):
+        """Tabla con las siguientes filas; ``None`` cuando ya no quedan."""
+        self.started = True
+        rows = self._fill([])
+        return self._table(rows) if rows else None
+
+    def refill(self, table):
+        """Devuelve ``table`` o, si le quedan pocas filas, una tabla con ellas más las siguientes."""
+        if not self.started or self.exhausted:
+            return table
+        pending = table._cellvalues[1:]
+        if len(pending) > self.refill_rows:
+            return table
+        return self._table(self._fill(list(pending)))
+
+
+class _ReportDocTemplate(BaseDocTemplate):
+    """Documento que pide las filas de cada espacio a ``_ReservationRows`` a medida que las maqueta.
+
+    Con ``number_pages=False`` el pie se dibuja sin número de página: las secciones que se generan
+    en paralelo se numeran al unirlas (ver ``_stamp_page_numbers``).
+    """
+
+    def __init__(self, filename, number_pages=True, **kw):
+        self.number_pages = number_pages
+        super().__init__(filename, **kw)
+
+    def filterFlowables(self, flowables):
+        first = flowables[0]
+        if isinstance(first, _ReservationRows):
+            table = first.next_table()
+            flowables[0:1] = [table, first] if table is not None else [None]
+        elif len(flowables) > 1 and isinstance(flowables[1], _ReservationRows):
+            flowables[0] = flowables[1].refill(first)
 
 
 def _add_header_footer(canvas, doc):
@@ -349,8 +518,9 @@ def _add_header_footer(canvas, doc):
     canvas.setFillColor(COLORS["gray_muted"])
 
     # Número de página
-    page_num = canvas.getPageNumber()
-    canvas.drawCentredString(width / 2, 12*mm, f"Página {page_num}")
+    if doc.number_pages:
+        page_num = canvas.getPageNumber()
+        canvas.drawCentredString(width / 2, 12*mm, f"Página {page_num}")
 
     # Línea inferior
     canvas.setStrokeColor(COLORS["gray_border"])
@@ -364,19 +534,17 @@ def _add_header_footer(canvas, doc):
     canvas.restoreState()
 
 
-def build_reservations_report(reservations, *, start=None, end=None, space=None, statuses=None):
-    """Genera un reporte PDF profesional e institucional."""
-    buffer = BytesIO()
-
-    doc = BaseDocTemplate(
-        buffer,
+def _new_document(output, number_pages=True):
+    doc = _ReportDocTemplate(
+        output,
+        number_pages=number_pages,
         pagesize=LETTER,
         rightMargin=20*mm,
         leftMargin=20*mm,
         topMargin=25*mm,
         bottomMargin=25*mm,
-        title="Reporte de Reservas - LibApartado",
-        author="Sistema LibApartado - FESC",
+        title=REPORT_TITLE,
+        author=REPORT_AUTHOR,
     )
 
     # Frame principal
@@ -391,13 +559,13 @@ def build_reservations_report(reservations, *, start=None, end=None, space=None,
     # Template con header/footer
     template = PageTemplate(id="main", frames=frame, onPage=_add_header_footer)
     doc.addPageTemplates([template])
+    return doc
 
-    styles = _get_styles()
+
+def _cover_story(theme, start=None, end=None, space=None, statuses=None):
+    styles = theme.styles
     story = []
 
-    # ═══════════════════════════════════════════════════════════════════════
-    # PORTADA / ENCABEZADO
-    # ═══════════════════════════════════════════════════════════════════════
     story.append(Spacer(1, 10*mm))
 
     # Título institucional
@@ -422,15 +590,7 @@ def build_reservations_report(reservations, *, start=None, end=None, space=None,
     story.append(Spacer(1, 8*mm))
 
     # Título del reporte
-    story.append(Paragraph("REPORTE DE RESERVAS", ParagraphStyle(
-        name="ReportMainTitle",
-        fontName="Helvetica-Bold",
-        fontSize=18,
-        leading=22,
-        textColor=COLORS["black"],
-        alignment=TA_CENTER,
-        spaceAfter=15,
-    )))
+    story.append(Paragraph("REPORTE DE RESERVAS", theme.main_title_style))
 
     # Información del reporte
     info_data = [
@@ -441,7 +601,7 @@ def build_reservations_report(reservations, *, start=None, end=None, space=None,
     if end:
         info_data.append(["Período hasta:", _format_datetime(end)])
     if space:
-        info_data.append(["Espacio filtrado:", space])
+        info_data.append(["Espacio filtrado:", str(space)])
     if statuses:
         status_names = [STATUS_CONFIG.get(s, {}).get("label", s) for s in statuses]
         info_data.append(["Estados incluidos:", ", ".join(status_names)])
@@ -463,29 +623,18 @@ def build_reservations_report(reservations, *, start=None, end=None, space=None,
     story.append(info_table)
 
     story.append(Spacer(1, 10*mm))
+    return story
 
-    # ═══════════════════════════════════════════════════════════════════════
-    # PROCESAR DATOS
-    # ═══════════════════════════════════════════════════════════════════════
-    reservation_data = [_extract_reservation_data(r) for r in reservations]
-
-    grouped = defaultdict(list)
-    global_counter = Counter()
 
-    for data in reservation_data:
-        grouped[data["space"]].append(data)
-        global_counter[data["status"]] += 1
+def _summary_story(theme, grouped, global_counter, total_rows):
+    styles = theme.styles
+    story = [Paragraph("RESUMEN EJECUTIVO", styles["RptSection"])]
 
-    # ═══════════════════════════════════════════════════════════════════════
-    # RESUMEN EJECUTIVO
-    # ═══════════════════════════════════════════════════════════════════════
-    story.append(Paragraph("RESUMEN EJECUTIVO", styles["RptSection"]))
-
-    if reservation_data:
-        story.append(_create_summary_stats(global_counter))
+    if total_rows:
+        story.append(_create_summary_stats(global_counter, theme))
         story.append(Spacer(1, 5*mm))
         story.append(Paragraph(
-            f"Se registraron un total de <b>{len(reservation_data)}</b> reservas distribuidas en <b>{len(grouped)}</b> espacio(s).",
+            f"Se registraron un total de <b>{total_rows}</b> reservas distribuidas en <b>{len(grouped)}</b> espacio(s).",
             styles["RptBody"]
         ))
     else:
@@ -495,61 +644,48 @@ def build_reservations_report(reservations, *, start=None, end=None, space=None,
         ))
 
     story.append(Spacer(1, 10*mm))
+    return story
 
-    # ═══════════════════════════════════════════════════════════════════════
-    # DETALLE POR ESPACIO
-    # ═══════════════════════════════════════════════════════════════════════
-    for space_name in sorted(grouped.keys()):
-        space_reservations = grouped[space_name]
-
-        # Título del espacio con línea
-        story.append(Table(
-            [[Paragraph(f"<b>{space_name.upper()}</b>", ParagraphStyle(
-                name="SpaceTitle",
-                fontName="Helvetica-Bold",
-                fontSize=12,
-                textColor=COLORS["white"],
-            ))]],
-            colWidths=[175*mm],
-            style=TableStyle([
-                ("BACKGROUND", (0, 0), (-1, -1), COLORS["primary"]),
-                ("ALIGN", (0, 0), (-1, -1), "LEFT"),
-                ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-                ("LEFTPADDING", (0, 0), (-1, -1), 10),
-                ("RIGHTPADDING", (0, 0), (-1, -1), 10),
-                ("TOPPADDING", (0, 0), (-1, -1), 8),
-                ("BOTTOMPADDING", (0, 0), (-1, -1), 8),
-            ])
-        ))
 
-        story.append(Spacer(1, 3*mm))
+def _space_story(theme, badges, reservations, space_name, space_counter, chunk_size, on_rows=None):
+    styles = theme.styles
+    story = []
 
-        # Resumen del espacio
-        space_counter = Counter(r["status"] for r in space_reservations)
-        summary_text = []
-        for status_key in ["APPROVED", "PENDING", "REJECTED", "CANCELLED"]:
-            count = space_counter.get(status_key, 0)
-            if count > 0:
-                config = STATUS_CONFIG[status_key]
-                summary_text.append(f'<font color="{config["color"]}">{config["label"]}: {count}</font>')
+    # Título del espacio con línea
+    story.append(Table(
+        [[Paragraph(f"<b>{space_name.upper()}</b>", theme.space_title_style)]],
+        colWidths=[175*mm],
+        style=theme.space_title_table_style,
+    ))
 
-        story.append(Paragraph(
-            f"<b>Total:</b> {len(space_reservations)} reserva(s) — " + " | ".join(summary_text),
-            styles["RptMuted"]
-        ))
+    story.append(Spacer(1, 3*mm))
+
+    # Resumen del espacio
+    summary_text = []
+    for status_key in ["APPROVED", "PENDING", "REJECTED", "CANCELLED"]:
+        count = space_counter.get(status_key, 0)
+        if count > 0:
+            config = STATUS_CONFIG[status_key]
+            summary_text.append(f'<font color="{config["color"]}">{config["label"]}: {count}</font>')
 
-        story.append(Spacer(1, 4*mm))
+    story.append(Paragraph(
+        f"<b>Total:</b> {sum(space_counter.values())} reserva(s) — " + " | ".join(summary_text),
+        styles["RptMuted"]
+    ))
 
-        # Tabla de reservas del espacio
-        sorted_reservations = sorted(space_reservations, key=lambda x: x["start_at"] or timezone.now())
-        story.append(_create_reservations_table(sorted_reservations))
+    story.append(Spacer(1, 4*mm))
 
-        story.append(Spacer(1, 8*mm))
+    # Tabla de reservas del espacio
+    story.append(_ReservationRows(
+        _space_rows(reservations, space_name, chunk_size), theme, badges, chunk_size, on_rows
+    ))
 
-    # ═══════════════════════════════════════════════════════════════════════
-    # PIE DEL DOCUMENTO
-    # ═══════════════════════════════════════════════════════════════════════
-    story.append(Spacer(1, 10*mm))
+    story.append(Spacer(1, 8*mm))
+    return story
+
+
+def _closing_story(theme):
+    story = [Spacer(1, 10*mm)]
 
     # Línea final
     story.append(Table(
@@ -564,12 +700,217 @@ def build_reservations_report(reservations, *, start=None, end=None, space=None,
     story.append(Paragraph(
         "Este documento fue generado automáticamente por el sistema LibApartado.<br/>"
         "Para consultas, comuníquese con la administración de la biblioteca.",
-        styles["RptFooter"]
+        theme.styles["RptFooter"]
     ))
+    return story
+
+
+def build_reservations_report(reservations, **options):
+    """Genera el reporte PDF y lo devuelve como ``bytes`` (ver ``render_reservations_report``)."""
+    buffer = BytesIO()
+    render_reservations_report(reservations, buffer, **options)
+    return buffer.getvalue()
+
+
+def spooled_reservations_report(reservations, **options):
+    """Genera el reporte en un archivo temporal (en memoria hasta ``REPORT_SPOOL_MAX_BYTES``) rebobinado."""
+    output = SpooledTemporaryFile(max_size=settings.REPORT_SPOOL_MAX_BYTES, suffix=".pdf")
+    try:
+        render_reservations_report(reservations, output, **options)
+    except BaseException:
+        output.close()
+        raise
+    output.seek(0)
+    return output
+
+
+def _use_parallel(grouped, total_rows):
+    return (
+        settings.REPORT_RENDER_WORKERS > 1
+        and len(grouped) > 1
+        and total_rows >= settings.REPORT_PARALLEL_MIN_ROWS
+    )
+
+
+def render_reservations_report(reservations, output, *, start=None, end=None, space=None, statuses=None,
+                               progress=None):
+    """Genera un reporte PDF profesional e institucional y lo escribe en ``output``.
+
+    ``reservations`` es un queryset de reservas ya filtrado. Los totales se calculan en SQL y las
+    filas de cada espacio se leen por lotes de ``RESERVATION_REPORT_CHUNK_SIZE`` mientras se
+    maqueta, así que la memoria no crece con el tamaño del reporte. ``progress``, si se indica,
+    recibe el porcentaje de avance (0-99); si lanza una excepción la generación se abandona.
+
+    Los reportes con varios espacios y al menos ``REPORT_PARALLEL_MIN_ROWS`` filas se maquetan por
+    espacio en ``REPORT_RENDER_WORKERS`` procesos y se unen en un solo PDF; los demás se generan en
+    serie en el proceso actual.
+    """
+    theme = report_theme()
+    story = _cover_story(theme, start=start, end=end, space=space, statuses=statuses)
+
+    grouped = _summarize(reservations)
+    global_counter = Counter()
+    for space_counter in grouped.values():
+        global_counter.update(space_counter)
+    total_rows = sum(global_counter.values())
+    chunk_size = settings.RESERVATION_REPORT_CHUNK_SIZE
+
+    story.extend(_summary_story(theme, grouped, global_counter, total_rows))
+
+    if progress:
+        progress(10)
+
+    if _use_parallel(grouped, total_rows):
+        _render_parallel(reservations, output, story, grouped, total_rows, progress)
+        return
+
+    on_rows = None
+    if progress:
+        done = {"rows": 0}
+
+        def on_rows(count):
+            done["rows"] += count
+            progress(10 + 89 * done["rows"] // max(total_rows, 1))
+
+    badges = theme.badges()
+    for space_name in sorted(grouped.keys()):
+        story.extend(_space_story(
+            theme, badges, reservations, space_name, grouped[space_name], chunk_size, on_rows
+        ))
+    story.extend(_closing_story(theme))
 
     # Construir PDF
-    doc.build(story)
-    pdf_content = buffer.getvalue()
-    buffer.close()
+    _new_document(output).build(story)
+
+
+# ============================================================================
+# MAQUETACIÓN EN PARALELO
+# ============================================================================
 
-    return pdf_content
+def _init_render_worker():
+    """Prepara Django en cada proceso del pool (se crean con ``spawn``, sin conexiones heredadas)."""
+    import django
+
+    django.setup()
+
+
+def _render_space_section(model, query, space_name, space_counter, closing, path):
+    """Maqueta la sección de un espacio sin numerar sus páginas en el archivo ``path`` y lo devuelve.
+
+    Se ejecuta en un proceso del pool: recibe la consulta ya construida (``query`` del queryset
+    original) y lee sus filas por lotes igual que el modo en serie. La sección se escribe en disco
+    para que ni el proceso ni el padre tengan que pasarse el PDF entero en memoria.
+    """
+    reservations = model._default_manager.all()
+    reservations.query = query
+
+    theme = report_theme()
+    story = _space_story(
+        theme, theme.badges(), reservations, space_name, space_counter, settings.RESERVATION_REPORT_CHUNK_SIZE
+    )
+    if closing:
+        story.extend(_closing_story(theme))
+
+    _new_document(path, number_pages=False).build(story)
+    return path
+
+
+def _stamp_page_numbers(writer):
+    """Numera las páginas ya unidas con el mismo texto, fuente y posición que ``_add_header_footer``.
+
+    Se agrega un flujo de contenido corto a cada página (el original queda entre ``q``/``Q``) en
+    lugar de fusionar páginas, que obligaría a reescribir el contenido completo de cada una.
+    """
+    from pypdf.generic import ArrayObject, DecodedStreamObject, DictionaryObject, NameObject
+
+    def content(data):
+        stream = DecodedStreamObject()
+        stream.set_data(data)
+        return writer._add_object(stream)
+
+    font = writer._add_object(DictionaryObject({
+        NameObject("/Type"): NameObject("/Font"),
+        NameObject("/Subtype"): NameObject("/Type1"),
+        NameObject("/BaseFont"): NameObject("/Helvetica"),
+        NameObject("/Encoding"): NameObject("/WinAnsiEncoding"),
+    }))
+    save, restore = content(b"q\n"), content(b"\nQ\n")
+    gray = COLORS["gray_muted"]
+    for page_num, page in enumerate(writer.pages, start=1):
+        text = f"Página {page_num}"
+        x = LETTER[0] / 2 - stringWidth(text, "Helvetica", 8) / 2
+        number = content(
+            f"q {gray.red:.4f} {gray.green:.4f} {gray.blue:.4f} rg BT /FPag 8 Tf "
+            f"{x:.2f} {12*mm:.2f} Td ({text}) Tj ET Q\n".encode("cp1252")
+        )
+        contents = page.get("/Contents")
+        if contents is None:
+            parts = []
+        elif isinstance(contents.get_object(), ArrayObject):
+            parts = list(contents.get_object())
+        else:
+            parts = [contents]
+        page[NameObject("/Contents")] = ArrayObject([save, *parts, restore, number])
+
+        resources = page.setdefault(NameObject("/Resources"), DictionaryObject()).get_object()
+        fonts = resources.setdefault(NameObject("/Font"), DictionaryObject()).get_object()
+        fonts[NameObject("/FPag")] = font
+
+
+def _render_parallel(reservations, output, head_story, grouped, total_rows, progress=None):
+    """Maqueta portada y resumen aquí y cada espacio en el pool; luego une y numera las páginas.
+
+    Cada parte queda en un archivo de un directorio temporal y el resultado se escribe directo en
+    ``output``; el directorio se borra al terminar, también si la generación falla.
+    """
+    with TemporaryDirectory(prefix="reporte_") as workdir:
+        _render_parallel_in(workdir, reservations, output, head_story, grouped, total_rows, progress)
+
+
+def _render_parallel_in(workdir, reservations, output, head_story, grouped, total_rows, progress):
+    from pypdf import PdfReader, PdfWriter
+
+    head = os.path.join(workdir, "portada.pdf")
+    _new_document(head, number_pages=False).build(head_story)
+
+    names = sorted(grouped.keys())
+    sections = [os.path.join(workdir, f"espacio_{index:04d}.pdf") for index in range(len(names))]
+    workers = min(settings.REPORT_RENDER_WORKERS, len(names))
+    done_rows = 0
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=get_context("spawn"), initializer=_init_render_worker
+    ) as pool:
+        # Los espacios más grandes primero, para que ninguno quede solo al final.
+        by_size = sorted(range(len(names)), key=lambda index: -sum(grouped[names[index]].values()))
+        futures = {
+            pool.submit(
+                _render_space_section,
+                reservations.model,
+                reservations.query,
+                names[index],
+                dict(grouped[names[index]]),
+                index == len(names) - 1,
+                sections[index],
+            ): index
+            for index in by_size
+        }
+        try:
+            for future in as_completed(futures):
+                index = futures[future]
+                future.result()
+                if progress:
+                    done_rows += sum(grouped[names[index]].values())
+                    progress(10 + 85 * done_rows // max(total_rows, 1))
+        except BaseException:
+            # Un error (o ``progress`` que aborta) descarta las secciones que aún no empezaron.
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+
+    # Se pasan archivos abiertos y no rutas: con una ruta pypdf lee el archivo entero a memoria.
+    with ExitStack() as files:
+        writer = PdfWriter()
+        for path in [head, *sections]:
+            writer.append(PdfReader(files.enter_context(open(path, "rb"))))
+        _stamp_page_numbers(writer)
+        writer.add_metadata({"/Title": REPORT_TITLE, "/Author": REPORT_AUTHOR})
+        writer.write(output)
@@ -0,0 +1,82 @@
+"""Totales diarios de reservas (``ReservationDailyRollup``).
+
+Cada reserva aporta ``count=1`` y su duración en minutos a la fila (espacio, fecha local de
+inicio, estado). Las funciones de ``reservations.services`` llaman a ``apply_changes`` dentro de
+la misma transacción (y con el espacio bloqueado) con la foto de la reserva antes y después de
+la escritura; ``expected_rollups`` recalcula lo mismo desde cero para reconstruir o verificar.
+"""
+from collections import defaultdict
+
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from reservations.models import Reservation, ReservationDailyRollup
+
+
+def snapshot(reservation):
+    return (reservation.space_id, reservation.start_at, reservation.end_at, reservation.status)
+
+
+def _contribution(space_id, start_at, end_at, status):
+    local_date = timezone.localtime(start_at, timezone.get_default_timezone()).date()
+    minutes = round((end_at - start_at).total_seconds() / 60)
+    return (space_id, local_date, status), minutes
+
+
+def _accumulate(totals, rows, sign=1):
+    for row in rows:
+        key, minutes = _contribution(*row)
+        totals[key][0] += sign
+        totals[key][1] += sign * minutes
+
+
+def apply_changes(removed=(), added=()):
+    """Aplica la diferencia entre las fotos ``removed`` y ``added`` (tuplas de ``snapshot``)."""
+    deltas = defaultdict(lambda: [0, 0])
+    _accumulate(deltas, (row for row in removed if row), sign=-1)
+    _accumulate(deltas, (row for row in added if row))
+    for (space_id, date, status), (count, minutes) in deltas.items():
+        if not count and not minutes:
+            continue
+        updated = ReservationDailyRollup.objects.filter(space_id=space_id, date=date, status=status).update(
+            count=F("count") + count, occupied_minutes=F("occupied_minutes") + minutes
+        )
+        if not updated:
+            # El espacio está bloqueado por el llamador: nadie más puede crear esta fila a la vez.
+            ReservationDailyRollup.objects.create(
+                space_id=space_id, date=date, status=status, count=count, occupied_minutes=minutes
+            )
+
+
+def expected_rollups(space_ids, chunk_size=2000):
+    """Totales recalculados desde ``Reservation`` para los espacios dados: ``{(space, date, status): [n, min]}``."""
+    totals = defaultdict(lambda: [0, 0])
+    rows = (
+        Reservation.objects.filter(space_id__in=space_ids)
+        .values_list("space_id", "start_at", "end_at", "status")
+        .iterator(chunk_size=chunk_size)
+    )
+    _accumulate(totals, rows)
+    return totals
+
+
+def stored_rollups(space_ids):
+    rows = ReservationDailyRollup.objects.filter(space_id__in=space_ids).values_list(
+        "space_id", "date", "status", "count", "occupied_minutes"
+    )
+    return {(space_id, date, status): [count, minutes] for space_id, date, status, count, minutes in rows}
+
+
+def summarize(start_date, end_date, space_ids=None, group_by=("space_id", "status")):
+    """Suma los totales diarios del rango de fechas (inclusive), agrupados por ``group_by``."""
+    queryset = ReservationDailyRollup.objects.filter(date__gte=start_date, date__lte=end_date)
+    if space_ids:
+        queryset = queryset.filter(space_id__in=space_ids)
+    group_by = list(group_by)
+    rows = (
+        queryset.values(*group_by)
+        .annotate(count=Sum("count"), occupied_minutes=Sum("occupied_minutes"))
+        .filter(count__gt=0)
+        .order_by(*group_by)
+    )
+    return list(rows)
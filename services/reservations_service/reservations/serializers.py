@@ -1,6 +1,10 @@
-﻿from rest_framework import serializers
+﻿from django.conf import settings
+from rest_framework import serializers
+from rest_framework.reverse import reverse
 
-from reservations.models import Reservation
+from reservations.models import ReportJob, Reservation, ReservationSeries
+from reservations.occupancy import BUCKETS
+from reservations.recurrence import WEEKDAYS
 
 
 class SpaceSnapshotSerializer(serializers.Serializer):
@@ -99,6 +103,120 @@ class ReservationCreateSerializer(serializers.Serializer):
     space_id = serializers.IntegerField()
 
 
+class ReservationBulkCreateSerializer(serializers.Serializer):
+    mode = serializers.ChoiceField(choices=["atomic", "partial"], default="atomic")
+    reservations = serializers.ListField(child=serializers.DictField(), allow_empty=False)
+
+    def validate_reservations(self, value):
+        limit = settings.RESERVATION_BULK_MAX_ITEMS
+        if len(value) > limit:
+            raise serializers.ValidationError(f"Se permiten como máximo {limit} reservas por lote")
+        return value
+
+
+class BusyBlocksQuerySerializer(serializers.Serializer):
+    space_ids = serializers.ListField(child=serializers.IntegerField(min_value=1), allow_empty=False)
+    start = serializers.DateTimeField(required=False)
+    end = serializers.DateTimeField(required=False)
+    merge = serializers.BooleanField(default=False)
+
+    def validate_space_ids(self, value):
+        value = list(dict.fromkeys(value))
+        limit = settings.RESERVATION_BUSY_MAX_SPACES
+        if len(value) > limit:
+            raise serializers.ValidationError(f"Se permiten como máximo {limit} espacios por consulta")
+        return value
+
+
+class FreeSlotsQuerySerializer(serializers.Serializer):
+    space_id = serializers.IntegerField(min_value=1)
+    duration = serializers.IntegerField(min_value=1, required=False, help_text="Minutos")
+    step = serializers.IntegerField(min_value=1, required=False, help_text="Minutos")
+    limit = serializers.IntegerField(min_value=1, required=False)
+
+    def validate_limit(self, value):
+        return min(value, settings.RESERVATION_FREE_SLOTS_MAX)
+
+
+class OccupancyQuerySerializer(serializers.Serializer):
+    space_ids = serializers.ListField(child=serializers.IntegerField(min_value=1), required=False)
+    bucket = serializers.ChoiceField(choices=list(BUCKETS), default="1h")
+    status = serializers.ListField(child=serializers.ChoiceField(choices=Reservation.Status.choices), required=False)
+
+    def validate_space_ids(self, value):
+        value = list(dict.fromkeys(value))
+        limit = settings.RESERVATION_BUSY_MAX_SPACES
+        if len(value) > limit:
+            raise serializers.ValidationError(f"Se permiten como máximo {limit} espacios por consulta")
+        return value
+
+
+class ReservationStatsQuerySerializer(serializers.Serializer):
+    GROUP_BY_CHOICES = ["space_id", "date", "status"]
+
+    start_date = serializers.DateField(required=False)
+    end_date = serializers.DateField(required=False)
+    space_ids = serializers.ListField(child=serializers.IntegerField(min_value=1), required=False)
+    group_by = serializers.ListField(
+        child=serializers.ChoiceField(choices=GROUP_BY_CHOICES), required=False, default=["space_id", "status"]
+    )
+
+    def validate(self, attrs):
+        start_date = attrs.get("start_date")
+        end_date = attrs.get("end_date")
+        if start_date and end_date and start_date > end_date:
+            raise serializers.ValidationError("start_date debe ser anterior o igual a end_date")
+        return attrs
+
+
+class ReportJobCreateSerializer(serializers.Serializer):
+    start = serializers.DateTimeField(required=False)
+    end = serializers.DateTimeField(required=False)
+    space_id = serializers.IntegerField(required=False, min_value=1)
+    status = serializers.CharField(required=False, allow_blank=True)
+
+    def validate(self, attrs):
+        start = attrs.get("start")
+        end = attrs.get("end")
+        if start and end and start >= end:
+            raise serializers.ValidationError("La fecha de inicio debe ser anterior a la fecha fin")
+        statuses = None
+        status = attrs.pop("status", "")
+        if status and status.lower() != "all":
+            requested = [value.strip().upper() for value in status.split(",") if value.strip()]
+            statuses = [value for value in requested if value in Reservation.Status.values] or None
+        attrs["statuses"] = statuses
+        return attrs
+
+
+class ReportJobSerializer(serializers.ModelSerializer):
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ReportJob
+        fields = [
+            "id",
+            "status",
+            "progress",
+            "params",
+            "attempts",
+            "error",
+            "file_name",
+            "file_size",
+            "download_url",
+            "created_at",
+            "started_at",
+            "finished_at",
+            "expires_at",
+        ]
+        read_only_fields = fields
+
+    def get_download_url(self, obj):
+        if obj.status != ReportJob.Status.DONE:
+            return None
+        return reverse("report-job-file", args=[obj.pk], request=self.context.get("request"))
+
+
 class ReservationUpdateSerializer(serializers.Serializer):
     title = serializers.CharField(max_length=255, required=False)
     description = serializers.CharField(required=False, allow_blank=True)
@@ -109,3 +227,101 @@ class ReservationUpdateSerializer(serializers.Serializer):
 class ReservationDecisionSerializer(serializers.Serializer):
     note = serializers.CharField(required=False, allow_blank=True, allow_null=True)
 
+
+class SeriesOccurrenceSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Reservation
+        fields = ["id", "start_at", "end_at", "status"]
+
+
+class ReservationSeriesSerializer(serializers.ModelSerializer):
+    space = serializers.SerializerMethodField()
+    created_by = serializers.SerializerMethodField()
+    weekdays = serializers.SerializerMethodField()
+    occurrences = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ReservationSeries
+        fields = [
+            "id",
+            "space",
+            "created_by",
+            "title",
+            "description",
+            "start_at",
+            "end_at",
+            "frequency",
+            "interval",
+            "weekdays",
+            "until",
+            "count",
+            "exceptions",
+            "occurrences",
+            "created_at",
+            "updated_at",
+        ]
+
+    def get_space(self, obj):
+        return {
+            "id": obj.space_id,
+            "name": obj.space_name,
+            "location": obj.space_location,
+            "description": obj.space_description,
+        }
+
+    def get_created_by(self, obj):
+        return {
+            "id": obj.created_by_id,
+            "email": obj.created_by_email,
+            "first_name": obj.created_by_first_name,
+            "last_name": obj.created_by_last_name,
+        }
+
+    def get_weekdays(self, obj):
+        return [day for day in obj.weekdays.split(",") if day]
+
+    def get_occurrences(self, obj):
+        # Precargadas y ordenadas por ``ReservationSeriesViewSet.get_queryset``.
+        return SeriesOccurrenceSerializer(obj.occurrences.all(), many=True).data
+
+
+class ReservationSeriesCreateSerializer(serializers.Serializer):
+    title = serializers.CharField(max_length=255)
+    description = serializers.CharField(required=False, allow_blank=True)
+    space_id = serializers.IntegerField()
+    start_at = serializers.DateTimeField(help_text="Inicio de la primera ocurrencia")
+    end_at = serializers.DateTimeField(help_text="Fin de la primera ocurrencia")
+    frequency = serializers.ChoiceField(choices=ReservationSeries.Frequency.choices)
+    interval = serializers.IntegerField(min_value=1, max_value=52, default=1)
+    weekdays = serializers.ListField(child=serializers.ChoiceField(choices=list(WEEKDAYS)), required=False)
+    until = serializers.DateField(required=False, allow_null=True)
+    count = serializers.IntegerField(min_value=1, required=False, allow_null=True)
+    exceptions = serializers.ListField(child=serializers.DateField(), required=False)
+    on_conflict = serializers.ChoiceField(choices=["fail", "skip"], default="fail")
+
+    def validate(self, attrs):
+        if not attrs.get("until") and not attrs.get("count"):
+            raise serializers.ValidationError("Indica la fecha final (until) o el número de ocurrencias (count)")
+        return attrs
+
+
+class SpaceReplicaDataSerializer(serializers.Serializer):
+    id = serializers.IntegerField(min_value=1)
+    name = serializers.CharField(max_length=255, required=False, allow_blank=True)
+    description = serializers.CharField(required=False, allow_blank=True)
+    location = serializers.CharField(max_length=255, required=False, allow_blank=True)
+    is_active = serializers.BooleanField(required=False, default=True)
+    updated_at = serializers.DateTimeField(required=False, allow_null=True)
+
+
+class SpaceReplicaEventSerializer(serializers.Serializer):
+    EVENT_UPSERT = "upsert"
+    EVENT_DELETE = "delete"
+
+    event = serializers.ChoiceField(choices=[EVENT_UPSERT, EVENT_DELETE])
+    space = SpaceReplicaDataSerializer()
+
+    def validate(self, attrs):
+        if attrs["event"] == self.EVENT_UPSERT and not attrs["space"].get("name"):
+            raise serializers.ValidationError("El aviso de un espacio creado o editado debe incluir su nombre")
+        return attrs
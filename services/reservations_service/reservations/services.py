@@ -1,14 +1,22 @@
-﻿from datetime import timedelta
+﻿from collections import defaultdict
+from datetime import timedelta
 
 import requests
 from django.conf import settings
 from django.core.exceptions import PermissionDenied
 from django.db import transaction
-from django.db.models import Q
+from django.db.models import F, Q
 from django.utils import timezone
-from rest_framework.exceptions import ValidationError
+from rest_framework.exceptions import NotFound, ValidationError
 
-from reservations.models import Reservation
+from reservations.conflicts import sweep_conflicts
+from reservations.interval_index import interval_index
+from reservations.locks import space_lock
+from reservations.models import ACTIVE_STATUSES, DataVersion, Reservation, ReservationSeries, SpaceCalendar
+from reservations.occupancy import bucket_edges, occupancy_matrix
+from reservations.recurrence import expand_occurrences
+from reservations import deadlines, interservice, report_cache, space_replica
+from reservations.rollups import apply_changes as apply_rollup_changes, snapshot
 
 
 def _validate_duration(start_at, end_at):
@@ -30,11 +38,23 @@ def _make_aware(dt):
 
 
 def fetch_space(space_id, auth_header=None):
+    """Datos del espacio para validar y copiar en la reserva: de la réplica local o de spaces-service."""
+    data = space_replica.lookup(space_id)
+    if data is None:
+        data = _fetch_remote_space(space_id, auth_header)
+        space_replica.remember(data)
+    if not data.get("is_active", True):
+        raise ValidationError("El espacio no está activo")
+    return data
+
+
+def _fetch_remote_space(space_id, auth_header=None):
     try:
-        resp = requests.get(
+        resp = interservice.get(
+            "spaces.detail",
             f"{settings.SPACES_BASE_URL}/spaces/{space_id}/",
             headers={"Authorization": auth_header or ""},
-            timeout=5,
+            timeout=settings.SPACES_DETAIL_TIMEOUT,
         )
     except requests.RequestException as exc:
         raise ValidationError("No se pudo consultar el servicio de espacios") from exc
@@ -42,44 +62,263 @@ def fetch_space(space_id, auth_header=None):
         raise ValidationError("No se encontró el espacio")
     if resp.status_code != 200:
         raise ValidationError("Error consultando el servicio de espacios")
-    data = resp.json()
-    if not data.get("is_active", True):
-        raise ValidationError("El espacio no está activo")
-    return data
+    return resp.json()
 
 
-def validate_overlap(space_id, start_at, end_at, exclude_reservation_id=None):
-    _validate_duration(start_at, end_at)
+def _active_interval(reservation):
+    if reservation.status in ACTIVE_STATUSES:
+        return (reservation.id, reservation.start_at, reservation.end_at)
+    return None
+
+
+def _touch_global():
+    """Incrementa el contador global de datos (``DataVersion``) en su propia sentencia."""
+    DataVersion.objects.get_or_create(pk=1)
+    DataVersion.objects.filter(pk=1).update(version=F("version") + 1, updated_at=timezone.now())
+
+
+def _touch_space(space_id):
+    """Incrementa la versión de la agenda del espacio dentro de la transacción en curso.
+
+    El contador global se incrementa al confirmar y no dentro de la transacción: así su fila no
+    queda bloqueada hasta el commit y las escrituras sobre espacios distintos siguen en paralelo.
+    """
+    SpaceCalendar.objects.get_or_create(space_id=space_id)
+    SpaceCalendar.objects.filter(space_id=space_id).update(version=F("version") + 1, updated_at=timezone.now())
+    transaction.on_commit(_touch_global)
+    return SpaceCalendar.objects.filter(space_id=space_id).values_list("version", flat=True).get()
+
+
+def _record_change(space_id, before=None, after=None):
+    """Registra una escritura sobre el espacio y sincroniza el índice al confirmar la transacción."""
+    version = _touch_space(space_id)
+    removed = before[:2] if before else None
+    transaction.on_commit(lambda: interval_index.apply(space_id, version, removed, after))
+    return version
+
+
+def _record_bulk_change(space_id):
+    """Como ``_record_change`` para escrituras masivas: el índice recarga el espacio al confirmar."""
+    version = _touch_space(space_id)
+    transaction.on_commit(lambda: interval_index.invalidate(space_id))
+    return version
+
+
+def _apply_changes(removed=(), added=()):
+    """Actualiza lo que se deriva de las reservas (totales diarios y reportes en caché) tras una escritura."""
+    apply_rollup_changes(removed=removed, added=added)
+    report_cache.invalidate([*removed, *added])
+
+
+def _orm_has_overlap(space_id, start_at, end_at, exclude_reservation_id=None):
     overlap_filter = Q(start_at__lt=end_at) & Q(end_at__gt=start_at)
-    active_statuses = [Reservation.Status.PENDING, Reservation.Status.APPROVED]
-    qs = Reservation.objects.filter(space_id=space_id, status__in=active_statuses)
+    qs = Reservation.objects.filter(space_id=space_id, status__in=ACTIVE_STATUSES)
     if exclude_reservation_id:
         qs = qs.exclude(id=exclude_reservation_id)
-    if qs.filter(overlap_filter).exists():
+    return qs.filter(overlap_filter).exists()
+
+
+def _orm_busy_blocks(space_id, start_at, end_at):
+    return Reservation.objects.filter(
+        space_id=space_id,
+        status__in=ACTIVE_STATUSES,
+        start_at__lt=end_at,
+        end_at__gt=start_at,
+    ).order_by("start_at").values_list("start_at", "end_at")
+
+
+def validate_overlap(space_id, start_at, end_at, exclude_reservation_id=None):
+    _validate_duration(start_at, end_at)
+    # Se llama con el espacio bloqueado: la espera del bloqueo pudo consumir el plazo.
+    deadlines.check("comprobar los solapamientos")
+    conflict = interval_index.has_overlap(space_id, start_at, end_at, exclude_reservation_id)
+    if conflict is None:
+        conflict = _orm_has_overlap(space_id, start_at, end_at, exclude_reservation_id)
+    if conflict:
         raise ValidationError("Ya existe una reserva en ese rango")
 
 
-def create_reservation(user, data, auth_header=None):
-    space_data = fetch_space(data["space_id"], auth_header)
+def create_reservation(user, data, auth_header=None, space_data=None):
+    if space_data is None:
+        space_data = fetch_space(data["space_id"], auth_header)
     start_at = _make_aware(data["start_at"])
     end_at = _make_aware(data["end_at"])
-    with transaction.atomic():
+    with space_lock(space_data["id"]):
         validate_overlap(space_data["id"], start_at, end_at)
-        reservation = Reservation.objects.create(
-            space_id=space_data["id"],
-            space_name=space_data.get("name", ""),
-            space_location=space_data.get("location", ""),
-            space_description=space_data.get("description", ""),
-            created_by_id=user.id,
-            created_by_email=getattr(user, "email", ""),
-            created_by_first_name=getattr(user, "first_name", ""),
-            created_by_last_name=getattr(user, "last_name", ""),
-            title=data.get("title"),
-            description=data.get("description", ""),
-            start_at=start_at,
-            end_at=end_at,
-            status=Reservation.Status.PENDING,
+        reservation = _build_reservation(user, space_data, data, start_at, end_at)
+        reservation.save()
+        _record_change(reservation.space_id, after=_active_interval(reservation))
+        _apply_changes(added=[snapshot(reservation)])
+    return reservation
+
+
+def _build_reservation(user, space_data, data, start_at, end_at):
+    return Reservation(
+        space_id=space_data["id"],
+        space_name=space_data.get("name", ""),
+        space_location=space_data.get("location", ""),
+        space_description=space_data.get("description", ""),
+        created_by_id=user.id,
+        created_by_email=getattr(user, "email", ""),
+        created_by_first_name=getattr(user, "first_name", ""),
+        created_by_last_name=getattr(user, "last_name", ""),
+        title=data.get("title"),
+        description=data.get("description", ""),
+        start_at=start_at,
+        end_at=end_at,
+        status=Reservation.Status.PENDING,
+    )
+
+
+def _fill_missing_ids(reservations):
+    """MySQL no devuelve ids tras ``bulk_create``; se recuperan por (espacio, inicio), único entre activas."""
+    missing = [reservation for reservation in reservations if reservation.pk is None]
+    if not missing:
+        return
+    rows = Reservation.objects.filter(
+        space_id__in={reservation.space_id for reservation in missing},
+        start_at__in={reservation.start_at for reservation in missing},
+        status__in=ACTIVE_STATUSES,
+    ).values_list("space_id", "start_at", "id")
+    ids = {(space_id, start_at): reservation_id for space_id, start_at, reservation_id in rows}
+    for reservation in missing:
+        reservation.pk = ids.get((reservation.space_id, reservation.start_at))
+
+
+def _load_active_intervals(space_ids, start_at, end_at):
+    """Intervalos activos de varios espacios en una sola consulta, agrupados y ordenados por inicio."""
+    grouped = defaultdict(list)
+    rows = (
+        Reservation.objects.filter(
+            space_id__in=space_ids,
+            status__in=ACTIVE_STATUSES,
+            start_at__lt=end_at,
+            end_at__gt=start_at,
         )
+        .order_by("space_id", "start_at")
+        .values_list("space_id", "id", "start_at", "end_at")
+    )
+    for space_id, reservation_id, block_start, block_end in rows:
+        grouped[space_id].append((reservation_id, block_start, block_end))
+    return grouped
+
+
+def _conflict_detail(verdict):
+    kind, key = verdict
+    if kind == "reservation":
+        return {"reservation_id": key}
+    return {"index": key}
+
+
+BULK_MODE_ATOMIC = "atomic"
+BULK_MODE_PARTIAL = "partial"
+
+
+def bulk_create_reservations(user, items, mode=BULK_MODE_ATOMIC, auth_header=None):
+    """Crea un lote de reservas con una sola consulta de solapamiento y un ``bulk_create``.
+
+    ``items`` es una lista de ``(index, data)`` ya validados con ``ReservationCreateSerializer``.
+    Cada espacio distinto se consulta una sola vez en spaces-service. En modo ``atomic`` no se
+    crea nada si algún elemento falla; en ``partial`` se crean los que no tienen conflictos.
+    Devuelve ``(reservas creadas, resultados por elemento ordenados por índice)``.
+    """
+    results = {}
+    spaces = {}
+    for space_id in sorted({data["space_id"] for _, data in items}):
+        try:
+            spaces[space_id] = fetch_space(space_id, auth_header)
+        except ValidationError as exc:
+            spaces[space_id] = exc
+
+    pending = defaultdict(list)
+    for index, data in items:
+        space_data = spaces[data["space_id"]]
+        if isinstance(space_data, ValidationError):
+            results[index] = {"index": index, "status": "invalid", "errors": space_data.detail}
+            continue
+        start_at = _make_aware(data["start_at"])
+        end_at = _make_aware(data["end_at"])
+        try:
+            _validate_duration(start_at, end_at)
+        except ValidationError as exc:
+            results[index] = {"index": index, "status": "invalid", "errors": exc.detail}
+            continue
+        pending[space_data["id"]].append((index, data, start_at, end_at))
+
+    created = []
+    with space_lock(*pending.keys()):
+        accepted = []
+        if pending:
+            deadlines.check("comprobar los solapamientos")
+            window_start = min(start_at for rows in pending.values() for _, _, start_at, _ in rows)
+            window_end = max(end_at for rows in pending.values() for _, _, _, end_at in rows)
+            existing = _load_active_intervals(list(pending), window_start, window_end)
+            for space_id, rows in pending.items():
+                verdicts = sweep_conflicts(
+                    [(index, start_at, end_at) for index, _, start_at, end_at in rows], existing[space_id]
+                )
+                for index, data, start_at, end_at in rows:
+                    if verdicts[index] is None:
+                        accepted.append((index, space_id, data, start_at, end_at))
+                    else:
+                        results[index] = {
+                            "index": index,
+                            "status": "conflict",
+                            "conflict_with": _conflict_detail(verdicts[index]),
+                        }
+
+        if mode == BULK_MODE_ATOMIC and results:
+            for index, *_ in accepted:
+                results[index] = {"index": index, "status": "skipped"}
+        elif accepted:
+            accepted.sort(key=lambda row: row[0])
+            created = [
+                _build_reservation(user, spaces[data["space_id"]], data, start_at, end_at)
+                for _, _, data, start_at, end_at in accepted
+            ]
+            Reservation.objects.bulk_create(created, batch_size=500)
+            _fill_missing_ids(created)
+            for space_id in {reservation.space_id for reservation in created}:
+                _record_bulk_change(space_id)
+            _apply_changes(added=[snapshot(reservation) for reservation in created])
+            for (index, *_), reservation in zip(accepted, created):
+                results[index] = {"index": index, "status": "created", "id": reservation.pk}
+
+    return created, [results[index] for index in sorted(results)]
+
+
+DECISION_FIELDS = [
+    "status",
+    "approved_by_id",
+    "approved_by_email",
+    "approved_by_first_name",
+    "approved_by_last_name",
+    "decision_at",
+    "decision_note",
+    "updated_at",
+]
+
+
+def _locked(reservation):
+    """Relee ``reservation`` con la fila bloqueada; llamar con el espacio ya bloqueado.
+
+    La vista obtiene la instancia antes de tomar el bloqueo: otra escritura pudo cambiarla
+    (cancelarla, moverla) entre tanto, así que las decisiones se toman sobre esta copia.
+    """
+    try:
+        return Reservation.objects.select_for_update().get(pk=reservation.pk)
+    except Reservation.DoesNotExist:
+        raise NotFound("La reserva ya no existe")
+
+
+def _save_locked(reservation, before, previous, fields):
+    after = _active_interval(reservation)
+    if before is None and after is not None:
+        # Vuelve a ocupar el horario: su hueco pudo reservarse mientras estaba inactiva.
+        validate_overlap(reservation.space_id, reservation.start_at, reservation.end_at, reservation.id)
+    reservation.save(update_fields=fields)
+    _record_change(reservation.space_id, before, after)
+    _apply_changes(removed=[previous], added=[snapshot(reservation)])
     return reservation
 
 
@@ -92,25 +331,37 @@ def update_reservation(admin_user, reservation, data):
         start_at = _make_aware(start_at)
     if end_at:
         end_at = _make_aware(end_at)
-    with transaction.atomic():
+    with space_lock(reservation.space_id):
+        reservation = _locked(reservation)
+        before = _active_interval(reservation)
+        previous = snapshot(reservation)
+        fields = ["updated_at"]
         if start_at:
             reservation.start_at = start_at
+            fields.append("start_at")
         if end_at:
             reservation.end_at = end_at
+            fields.append("end_at")
         if start_at or end_at:
             validate_overlap(reservation.space_id, reservation.start_at, reservation.end_at, reservation.id)
         if "title" in data:
             reservation.title = data["title"]
+            fields.append("title")
         if "description" in data:
             reservation.description = data.get("description", "")
-        reservation.save()
-    return reservation
+            fields.append("description")
+        return _save_locked(reservation, before, previous, fields)
 
 
 def cancel_reservation(actor, reservation: Reservation):
     if getattr(actor, "role", "").upper() != "ADMIN" and reservation.created_by_id != actor.id:
         raise PermissionDenied("Cannot cancel another user's reservation")
-    with transaction.atomic():
+    with space_lock(reservation.space_id):
+        reservation = _locked(reservation)
+        if reservation.status not in ACTIVE_STATUSES:
+            raise ValidationError("Solo se pueden cancelar reservas pendientes o aprobadas")
+        before = _active_interval(reservation)
+        previous = snapshot(reservation)
         reservation.status = Reservation.Status.CANCELLED
         reservation.decision_at = timezone.now()
         reservation.approved_by_id = None
@@ -118,52 +369,329 @@ def cancel_reservation(actor, reservation: Reservation):
         reservation.approved_by_first_name = ""
         reservation.approved_by_last_name = ""
         reservation.decision_note = ""
-        reservation.save()
-    return reservation
+        return _save_locked(reservation, before, previous, DECISION_FIELDS)
 
 
-def approve_reservation(admin_user, reservation: Reservation, note=None):
-    if getattr(admin_user, "role", "").upper() != "ADMIN":
-        raise PermissionDenied("Only admins can approve")
-    with transaction.atomic():
-        reservation.status = Reservation.Status.APPROVED
+def _decide(admin_user, reservation, new_status, note):
+    with space_lock(reservation.space_id):
+        reservation = _locked(reservation)
+        if reservation.status != Reservation.Status.PENDING:
+            raise ValidationError("La reserva ya no está pendiente de decisión")
+        before = _active_interval(reservation)
+        previous = snapshot(reservation)
+        reservation.status = new_status
         reservation.approved_by_id = admin_user.id
         reservation.approved_by_email = getattr(admin_user, "email", "")
         reservation.approved_by_first_name = getattr(admin_user, "first_name", "")
         reservation.approved_by_last_name = getattr(admin_user, "last_name", "")
         reservation.decision_at = timezone.now()
         reservation.decision_note = note or ""
-        reservation.save()
-    return reservation
+        return _save_locked(reservation, before, previous, DECISION_FIELDS)
+
+
+def approve_reservation(admin_user, reservation: Reservation, note=None):
+    if getattr(admin_user, "role", "").upper() != "ADMIN":
+        raise PermissionDenied("Only admins can approve")
+    return _decide(admin_user, reservation, Reservation.Status.APPROVED, note)
 
 
 def reject_reservation(admin_user, reservation: Reservation, note=None):
     if getattr(admin_user, "role", "").upper() != "ADMIN":
         raise PermissionDenied("Only admins can reject")
-    with transaction.atomic():
-        reservation.status = Reservation.Status.REJECTED
-        reservation.approved_by_id = admin_user.id
-        reservation.approved_by_email = getattr(admin_user, "email", "")
-        reservation.approved_by_first_name = getattr(admin_user, "first_name", "")
-        reservation.approved_by_last_name = getattr(admin_user, "last_name", "")
-        reservation.decision_at = timezone.now()
-        reservation.decision_note = note or ""
-        reservation.save()
-    return reservation
+    return _decide(admin_user, reservation, Reservation.Status.REJECTED, note)
+
+
+SERIES_ON_CONFLICT_FAIL = "fail"
+SERIES_ON_CONFLICT_SKIP = "skip"
+
+
+def create_series(user, data, auth_header=None):
+    """Crea una serie recurrente y todas sus ocurrencias en una sola transacción.
+
+    Las ocurrencias se cruzan contra las reservas existentes con una consulta de rango y un
+    barrido en memoria. Con ``on_conflict="fail"`` cualquier conflicto aborta la creación; con
+    ``"skip"`` las fechas en conflicto se agregan a las excepciones de la serie.
+    Devuelve ``(serie, ocurrencias creadas, conflictos)``.
+    """
+    space_data = fetch_space(data["space_id"], auth_header)
+    space_id = space_data["id"]
+    start_at = _make_aware(data["start_at"])
+    end_at = _make_aware(data["end_at"])
+    _validate_duration(start_at, end_at)
+    exceptions = sorted(set(data.get("exceptions") or []))
+    weekdays = data.get("weekdays") or []
+    try:
+        occurrences = expand_occurrences(
+            start_at,
+            end_at,
+            data["frequency"],
+            interval=data.get("interval", 1),
+            weekdays=weekdays,
+            until=data.get("until"),
+            count=data.get("count"),
+            exceptions=exceptions,
+            limit=settings.RESERVATION_SERIES_MAX_OCCURRENCES,
+        )
+    except ValueError as exc:
+        raise ValidationError(str(exc)) from exc
+    if not occurrences:
+        raise ValidationError("La serie no genera ninguna ocurrencia")
+
+    with space_lock(space_id):
+        deadlines.check("comprobar los solapamientos")
+        existing = _load_active_intervals([space_id], occurrences[0][0], occurrences[-1][1])[space_id]
+        verdicts = sweep_conflicts(
+            [(position, occurrence_start, occurrence_end)
+             for position, (occurrence_start, occurrence_end) in enumerate(occurrences)],
+            existing,
+        )
+        conflicts = [
+            {
+                "start_at": timezone.localtime(occurrence_start).isoformat(),
+                "end_at": timezone.localtime(occurrence_end).isoformat(),
+                "conflict_with": _conflict_detail(verdicts[position]),
+            }
+            for position, (occurrence_start, occurrence_end) in enumerate(occurrences)
+            if verdicts[position] is not None
+        ]
+        if conflicts and data.get("on_conflict", SERIES_ON_CONFLICT_FAIL) == SERIES_ON_CONFLICT_FAIL:
+            raise ValidationError({"detail": "La serie tiene ocurrencias en conflicto", "conflicts": conflicts})
+        free = [occurrences[position] for position in range(len(occurrences)) if verdicts[position] is None]
+        if not free:
+            raise ValidationError({"detail": "Todas las ocurrencias están en conflicto", "conflicts": conflicts})
+        exceptions.extend(
+            timezone.localtime(occurrences[position][0]).date()
+            for position in range(len(occurrences))
+            if verdicts[position] is not None
+        )
+
+        series = ReservationSeries.objects.create(
+            space_id=space_id,
+            space_name=space_data.get("name", ""),
+            space_location=space_data.get("location", ""),
+            space_description=space_data.get("description", ""),
+            created_by_id=user.id,
+            created_by_email=getattr(user, "email", ""),
+            created_by_first_name=getattr(user, "first_name", ""),
+            created_by_last_name=getattr(user, "last_name", ""),
+            title=data.get("title"),
+            description=data.get("description", ""),
+            start_at=start_at,
+            end_at=end_at,
+            frequency=data["frequency"],
+            interval=data.get("interval", 1),
+            weekdays=",".join(weekdays),
+            until=data.get("until"),
+            count=data.get("count"),
+            exceptions=[day.isoformat() for day in sorted(set(exceptions))],
+        )
+        created = []
+        for occurrence_start, occurrence_end in free:
+            reservation = _build_reservation(user, space_data, data, occurrence_start, occurrence_end)
+            reservation.series = series
+            created.append(reservation)
+        Reservation.objects.bulk_create(created, batch_size=500)
+        _fill_missing_ids(created)
+        _record_bulk_change(space_id)
+        _apply_changes(added=[snapshot(reservation) for reservation in created])
+    return series, created, conflicts
+
+
+def cancel_series(actor, series: ReservationSeries):
+    if getattr(actor, "role", "").upper() != "ADMIN" and series.created_by_id != actor.id:
+        raise PermissionDenied("Cannot cancel another user's series")
+    now = timezone.now()
+    with space_lock(series.space_id):
+        affected = Reservation.objects.filter(series=series, status__in=ACTIVE_STATUSES)
+        previous = list(affected.values_list("space_id", "start_at", "end_at", "status"))
+        updated = affected.update(
+            status=Reservation.Status.CANCELLED,
+            decision_at=now,
+            approved_by_id=None,
+            approved_by_email="",
+            approved_by_first_name="",
+            approved_by_last_name="",
+            decision_note="",
+            updated_at=now,
+        )
+        if updated:
+            _record_bulk_change(series.space_id)
+            _apply_changes(
+                removed=previous, added=[row[:3] + (Reservation.Status.CANCELLED,) for row in previous]
+            )
+    return updated
 
 
-def busy_blocks(space_id, start_at, end_at):
+def _decide_series(admin_user, series, new_status, note):
+    now = timezone.now()
+    with space_lock(series.space_id):
+        affected = Reservation.objects.filter(series=series, status=Reservation.Status.PENDING)
+        previous = list(affected.values_list("space_id", "start_at", "end_at", "status"))
+        updated = affected.update(
+            status=new_status,
+            approved_by_id=admin_user.id,
+            approved_by_email=getattr(admin_user, "email", ""),
+            approved_by_first_name=getattr(admin_user, "first_name", ""),
+            approved_by_last_name=getattr(admin_user, "last_name", ""),
+            decision_at=now,
+            decision_note=note or "",
+            updated_at=now,
+        )
+        if updated:
+            _record_bulk_change(series.space_id)
+            _apply_changes(removed=previous, added=[row[:3] + (new_status,) for row in previous])
+    return updated
+
+
+def approve_series(admin_user, series: ReservationSeries, note=None):
+    if getattr(admin_user, "role", "").upper() != "ADMIN":
+        raise PermissionDenied("Only admins can approve")
+    return _decide_series(admin_user, series, Reservation.Status.APPROVED, note)
+
+
+def reject_series(admin_user, series: ReservationSeries, note=None):
+    if getattr(admin_user, "role", "").upper() != "ADMIN":
+        raise PermissionDenied("Only admins can reject")
+    return _decide_series(admin_user, series, Reservation.Status.REJECTED, note)
+
+
+def delete_reservation(reservation: Reservation):
+    with space_lock(reservation.space_id):
+        reservation = _locked(reservation)
+        before = _active_interval(reservation)
+        previous = snapshot(reservation)
+        space_id = reservation.space_id
+        reservation.delete()
+        _record_change(space_id, before)
+        _apply_changes(removed=[previous])
+
+
+def delete_space_reservations(space_ids):
+    """Borra todas las reservas de ``space_ids`` (datos sintéticos de las pruebas de carga).
+
+    Pasa por el mismo mantenimiento que las demás escrituras: totales diarios, reportes en caché
+    e índice. Las filas de ``SpaceCalendar`` se conservan para que sus versiones nunca retrocedan.
+    Devuelve cuántas reservas se borraron.
+    """
+    with space_lock(*space_ids):
+        rows = Reservation.objects.filter(space_id__in=space_ids)
+        previous = list(rows.values_list("space_id", "start_at", "end_at", "status"))
+        rows.delete()
+        for space_id in sorted({row[0] for row in previous}):
+            _record_bulk_change(space_id)
+        _apply_changes(removed=previous)
+    return len(previous)
+
+
+def merge_blocks(blocks):
+    """Une bloques ``(start_at, end_at)`` ordenados por inicio que se solapan o son contiguos."""
+    merged = []
+    for block_start, block_end in blocks:
+        if merged and block_start <= merged[-1][1]:
+            if block_end > merged[-1][1]:
+                merged[-1][1] = block_end
+        else:
+            merged.append([block_start, block_end])
+    return merged
+
+
+def busy_blocks(space_id, start_at, end_at, merge=False):
     start_at = _make_aware(start_at)
     end_at = _make_aware(end_at)
-    active_statuses = [Reservation.Status.PENDING, Reservation.Status.APPROVED]
-    qs = Reservation.objects.filter(
-        space_id=space_id,
-        status__in=active_statuses,
-        start_at__lt=end_at,
-        end_at__gt=start_at,
-    ).order_by("start_at")
+    blocks = interval_index.busy(space_id, start_at, end_at)
+    if blocks is None:
+        blocks = _orm_busy_blocks(space_id, start_at, end_at)
+    if merge:
+        blocks = merge_blocks(blocks)
     return [
-        {"start_at": r.start_at, "end_at": r.end_at}
-        for r in qs
+        {"start_at": block_start, "end_at": block_end}
+        for block_start, block_end in blocks
     ]
 
+
+def align_to_step(moment, step):
+    """Primer inicio de la grilla de ``step`` (desde la medianoche local) en o después de ``moment``."""
+    local = timezone.localtime(moment, timezone.get_default_timezone())
+    offset = local - local.replace(hour=0, minute=0, second=0, microsecond=0)
+    return moment + (-offset % step)
+
+
+def free_slots(space_id, start_at, end_at, duration, step, limit):
+    """Horarios libres de ``duration`` dentro de ``[start_at, end_at)`` con inicios cada ``step``.
+
+    Los inicios se alinean a múltiplos de ``step`` desde la medianoche local. Un solo barrido
+    sobre los bloques ocupados (ya ordenados y unidos): cuando un candidato choca, se salta al
+    primer inicio de la grilla posterior al fin del bloque. Devuelve ``(slots, truncated)``.
+    """
+    start_at = _make_aware(start_at)
+    end_at = _make_aware(end_at)
+    _validate_duration(start_at, start_at + duration)
+    blocks = interval_index.busy(space_id, start_at, end_at)
+    if blocks is None:
+        blocks = _orm_busy_blocks(space_id, start_at, end_at)
+    busy = merge_blocks(blocks)
+
+    candidate = align_to_step(start_at, step)
+    slots = []
+    position = 0
+    while candidate + duration <= end_at:
+        slot_end = candidate + duration
+        while position < len(busy) and busy[position][1] <= candidate:
+            position += 1
+        if position < len(busy) and busy[position][0] < slot_end:
+            candidate += -((candidate - busy[position][1]) // step) * step
+            continue
+        if len(slots) == limit:
+            return slots, True
+        slots.append({"start_at": candidate, "end_at": slot_end})
+        candidate += step
+    return slots, False
+
+
+def occupancy(space_ids, start_at, end_at, bucket, statuses=None):
+    """Minutos ocupados por espacio e intervalo; devuelve ``(edges, {space_id: [minutos, ...]})``.
+
+    Sin ``space_ids`` se incluyen los espacios con reservas en el rango, en orden ascendente.
+    """
+    start_at = _make_aware(start_at)
+    end_at = _make_aware(end_at)
+    edges = bucket_edges(start_at, end_at, bucket)
+    limit = settings.RESERVATION_OCCUPANCY_MAX_BUCKETS
+    if len(edges) - 1 > limit:
+        raise ValidationError(f"El rango genera más de {limit} intervalos; usa un intervalo mayor o un rango menor")
+    queryset = Reservation.objects.filter(
+        status__in=statuses or ACTIVE_STATUSES,
+        start_at__lt=edges[-1],
+        end_at__gt=edges[0],
+    )
+    if space_ids:
+        queryset = queryset.filter(space_id__in=space_ids)
+    rows = queryset.order_by("space_id", "start_at").values_list("space_id", "start_at", "end_at")
+    return edges, occupancy_matrix(rows, edges, space_ids or [])
+
+
+def busy_blocks_many(space_ids, start_at, end_at, merge=False):
+    """Bloques ocupados de varios espacios con una sola consulta ``space_id IN (...)``.
+
+    Devuelve un dict ``space_id -> [{"start_at", "end_at"}, ...]`` con todos los espacios pedidos
+    (los que no tienen reservas quedan con lista vacía).
+    """
+    start_at = _make_aware(start_at)
+    end_at = _make_aware(end_at)
+    grouped = {space_id: [] for space_id in space_ids}
+    rows = Reservation.objects.filter(
+        space_id__in=grouped,
+        status__in=ACTIVE_STATUSES,
+        start_at__lt=end_at,
+        end_at__gt=start_at,
+    ).order_by("space_id", "start_at").values_list("space_id", "start_at", "end_at")
+    for space_id, block_start, block_end in rows:
+        grouped[space_id].append((block_start, block_end))
+    return {
+        space_id: [
+            {"start_at": block_start, "end_at": block_end}
+            for block_start, block_end in (merge_blocks(blocks) if merge else blocks)
+        ]
+        for space_id, blocks in grouped.items()
+    }
+
@@ -0,0 +1,137 @@
+"""Réplica local del catálogo de espacios (``SpaceReplica``).
+
+``services.fetch_space`` la consulta antes de llamar a spaces-service, así que crear una reserva
+no depende de la latencia de ese servicio. La réplica se alimenta de tres fuentes:
+
+- Avisos de spaces-service al crear, editar o borrar un espacio (``SpaceReplicaEventView``).
+- La respuesta de spaces-service cuando hubo que consultarlo por un fallo de la réplica.
+- ``sync``, que trae el catálogo completo (``GET /spaces/replica/``) y corrige lo que los avisos
+  perdidos hayan dejado desactualizado; lo ejecuta ``sync_space_replica`` de forma periódica.
+
+Una fila sincronizada hace más de ``SPACE_REPLICA_MAX_AGE_SECONDS`` se trata como ausente (0
+desactiva la réplica). Un aviso con ``updated_at`` anterior al de la copia no la sobrescribe.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from reservations import interservice
+from reservations.models import SpaceReplica
+
+FIELDS = ("name", "description", "location", "is_active")
+
+
+def enabled():
+    return settings.SPACE_REPLICA_MAX_AGE_SECONDS > 0
+
+
+def lookup(space_id):
+    """Datos del espacio como los devuelve spaces-service, o ``None`` si no hay copia vigente."""
+    if not enabled():
+        return None
+    fresh_since = timezone.now() - timedelta(seconds=settings.SPACE_REPLICA_MAX_AGE_SECONDS)
+    row = (
+        SpaceReplica.objects.filter(space_id=space_id, synced_at__gt=fresh_since)
+        .values("space_id", *FIELDS)
+        .first()
+    )
+    if row is None:
+        return None
+    row["id"] = row.pop("space_id")
+    return row
+
+
+def _source_updated_at(value):
+    if isinstance(value, str):
+        value = parse_datetime(value)
+    return value
+
+
+def _values(data, synced_at):
+    return {
+        "name": data.get("name") or "",
+        "description": data.get("description") or "",
+        "location": data.get("location") or "",
+        "is_active": data.get("is_active", True),
+        "source_updated_at": _source_updated_at(data.get("updated_at")),
+        "synced_at": synced_at,
+    }
+
+
+def upsert(data, synced_at=None):
+    """Guarda ``data`` (un espacio de spaces-service); devuelve ``False`` si la copia es más nueva."""
+    values = _values(data, synced_at or timezone.now())
+    rows = SpaceReplica.objects.filter(space_id=data["id"])
+    if values["source_updated_at"] is not None:
+        rows = rows.filter(
+            Q(source_updated_at__isnull=True) | Q(source_updated_at__lte=values["source_updated_at"])
+        )
+    if rows.update(**values):
+        return True
+    if SpaceReplica.objects.filter(space_id=data["id"]).exists():
+        return False
+    try:
+        SpaceReplica.objects.create(space_id=data["id"], **values)
+    except IntegrityError:
+        # Otro aviso creó la fila a la vez; la próxima sincronización deja la versión más nueva.
+        return False
+    return True
+
+
+def remember(data):
+    """Guarda un espacio leído de spaces-service por un fallo de la réplica."""
+    if enabled():
+        upsert(data)
+
+
+def remove(space_id):
+    deleted, _ = SpaceReplica.objects.filter(space_id=space_id).delete()
+    return deleted
+
+
+def resync(spaces, synced_at=None):
+    """Deja la réplica igual a ``spaces`` (el catálogo completo); devuelve (creados, actualizados, borrados).
+
+    ``synced_at`` debe tomarse antes de leer el catálogo: las filas que un aviso tocó después no
+    se pisan ni se borran.
+    """
+    synced_at = synced_at or timezone.now()
+    existing = {row.space_id: row for row in SpaceReplica.objects.all()}
+    created, unchanged, updated = [], [], 0
+    for data in spaces:
+        values = _values(data, synced_at)
+        current = existing.pop(data["id"], None)
+        if current is None:
+            created.append(SpaceReplica(space_id=data["id"], **values))
+        elif all(getattr(current, name) == values[name] for name in FIELDS + ("source_updated_at",)):
+            unchanged.append(current.pk)
+        elif current.synced_at < synced_at:
+            updated += upsert(data, synced_at)
+    SpaceReplica.objects.bulk_create(created, ignore_conflicts=True)
+    SpaceReplica.objects.filter(pk__in=unchanged, synced_at__lt=synced_at).update(synced_at=synced_at)
+    deleted = 0
+    if existing:
+        stale = [row.pk for row in existing.values()]
+        deleted, _ = SpaceReplica.objects.filter(pk__in=stale, synced_at__lt=synced_at).delete()
+    return len(created), updated, deleted
+
+
+def fetch_catalog():
+    """Catálogo completo de spaces-service; lanza ``requests.RequestException`` si no responde."""
+    resp = interservice.get(
+        "spaces.replica",
+        f"{settings.SPACES_BASE_URL}/spaces/replica/",
+        headers=interservice.service_headers("reservations"),
+        timeout=settings.SPACE_REPLICA_SYNC_TIMEOUT,
+    )
+    resp.raise_for_status()
+    return resp.json()["results"]
+
+
+def sync():
+    synced_at = timezone.now()
+    return resync(fetch_catalog(), synced_at)
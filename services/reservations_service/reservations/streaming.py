@@ -0,0 +1,82 @@
+"""Respuestas JSON/NDJSON en streaming para listados grandes.
+
+Las filas se leen por lotes con paginación keyset (cada lote es una consulta acotada) y se
+serializan a medida que se envían, así la memoria del worker no crece con el tamaño del
+rango. Se usan lotes en lugar de ``QuerySet.iterator()`` porque el driver (PyMySQL) descarga el
+resultado completo al cliente aunque Django lo lea por partes.
+"""
+import json
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from rest_framework.utils.encoders import JSONEncoder
+
+from reservations.pagination import keyset_filter, keyset_position
+
+STREAM_JSON = "json"
+STREAM_NDJSON = "ndjson"
+NDJSON_CONTENT_TYPE = "application/x-ndjson"
+
+
+def stream_format(request):
+    """Formato pedido con ``?stream=`` (``json``/``ndjson``), o ``None`` si no se pidió streaming."""
+    value = request.query_params.get("stream", "").lower()
+    if value in ("", "0", "false", "no"):
+        return None
+    if value == STREAM_NDJSON or NDJSON_CONTENT_TYPE in request.headers.get("Accept", ""):
+        return STREAM_NDJSON
+    return STREAM_JSON
+
+
+def iterate_keyset(queryset, ordering, chunk_size=None):
+    """Recorre el queryset completo en lotes de ``chunk_size`` filas sin OFFSET."""
+    chunk_size = chunk_size or getattr(settings, "RESERVATION_STREAM_CHUNK_SIZE", 1000)
+    queryset = queryset.order_by(*ordering)
+    position = None
+    while True:
+        batch = queryset.filter(keyset_filter(ordering, position)) if position else queryset
+        rows = list(batch[:chunk_size])
+        yield from rows
+        if len(rows) < chunk_size:
+            return
+        position = keyset_position(ordering, rows[-1])
+
+
+def _encode(item):
+    # Mismo formato que JSONRenderer con COMPACT_JSON.
+    return json.dumps(item, cls=JSONEncoder, ensure_ascii=False, separators=(",", ":"))
+
+
+def _json_array(items, flush_every):
+    buffer = ["["]
+    separator = ""
+    for item in items:
+        buffer.append(separator + _encode(item))
+        separator = ","
+        if len(buffer) >= flush_every:
+            yield "".join(buffer)
+            buffer = []
+    buffer.append("]")
+    yield "".join(buffer)
+
+
+def _ndjson(items, flush_every):
+    buffer = []
+    for item in items:
+        buffer.append(_encode(item) + "\n")
+        if len(buffer) >= flush_every:
+            yield "".join(buffer)
+            buffer = []
+    if buffer:
+        yield "".join(buffer)
+
+
+def streaming_response(items, fmt=STREAM_JSON, flush_every=200):
+    """``StreamingHttpResponse`` con un arreglo JSON (o NDJSON) construido a partir de ``items``."""
+    if fmt == STREAM_NDJSON:
+        response = StreamingHttpResponse(_ndjson(items, flush_every), content_type=NDJSON_CONTENT_TYPE)
+    else:
+        response = StreamingHttpResponse(_json_array(items, flush_every), content_type="application/json")
+    # Evita que nginx acumule la respuesta completa antes de reenviarla.
+    response["X-Accel-Buffering"] = "no"
+    return response
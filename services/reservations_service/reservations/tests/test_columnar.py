@@ -0,0 +1,51 @@
+import io
+from datetime import timedelta
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from reservations import services
+from reservations.authentication import StatelessUser
+from reservations.exports import EXPORT_COLUMNS
+from reservations.interval_index import interval_index
+
+SPACE = {"id": 71, "name": "Sala 71", "location": "", "description": ""}
+ADMIN = StatelessUser(user_id=1, email="admin@example.com", role="ADMIN")
+TEACHER = StatelessUser(user_id=2, email="teacher@example.com", role="TEACHER")
+
+
+@override_settings(RESERVATION_STREAM_CHUNK_SIZE=2)
+class ColumnarExportTests(TestCase):
+    """Las exportaciones Arrow y Parquet entregan las columnas del CSV con tipos, en varios lotes."""
+
+    def setUp(self):
+        interval_index.invalidate()
+        self.client = APIClient()
+        self.client.force_authenticate(ADMIN)
+        start = (timezone.now() + timedelta(days=1)).replace(minute=0, second=0, microsecond=0)
+        for hours in range(0, 10, 2):
+            start_at = start + timedelta(hours=hours)
+            data = {"space_id": SPACE["id"], "title": "Clase", "start_at": start_at, "end_at": start_at + timedelta(hours=1)}
+            services.create_reservation(TEACHER, data, space_data=SPACE)
+
+    def test_arrow_stream_is_read_batch_by_batch(self):
+        response = self.client.get("/api/reservations/export/arrow/")
+        self.assertEqual(response.status_code, 200)
+        reader = pa.ipc.open_stream(b"".join(response.streaming_content))
+        batches = list(reader)
+
+        self.assertEqual(reader.schema.names, list(EXPORT_COLUMNS))
+        self.assertEqual([batch.num_rows for batch in batches], [2, 2, 1])
+        self.assertEqual(reader.schema.field("start_at").type, pa.timestamp("us", tz="UTC"))
+
+    def test_parquet_has_same_schema_and_rows(self):
+        response = self.client.get("/api/reservations/export/parquet/")
+        self.assertEqual(response.status_code, 200)
+        table = pq.read_table(io.BytesIO(b"".join(response.streaming_content)))
+
+        self.assertEqual(table.num_rows, 5)
+        self.assertEqual(table.schema.names, list(EXPORT_COLUMNS))
+        self.assertEqual(set(table.column("status").to_pylist()), {"PENDING"})
@@ -0,0 +1,87 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from reservations import services
+from reservations.authentication import StatelessUser
+from reservations.conditional import data_version
+from reservations.interval_index import interval_index
+from reservations.models import SpaceCalendar
+
+SPACE = {"id": 21, "name": "Sala 21", "location": "Bloque C", "description": ""}
+TEACHER = StatelessUser(user_id=5, email="teacher@example.com", role="TEACHER")
+ADMIN = StatelessUser(user_id=1, email="admin@example.com", role="ADMIN")
+
+
+class ConditionalGetTests(TestCase):
+    """Los ETag dependen de los parámetros, del rango resuelto (al minuto) y de la versión de datos."""
+
+    def setUp(self):
+        interval_index.invalidate()
+        self.client = APIClient()
+        self.client.force_authenticate(TEACHER)
+        self.start = (timezone.now() + timedelta(days=1)).replace(minute=0, second=0, microsecond=0)
+
+    def book(self, start_at):
+        data = {"space_id": SPACE["id"], "title": "Clase", "start_at": start_at, "end_at": start_at + timedelta(hours=1)}
+        with self.captureOnCommitCallbacks(execute=True):
+            return services.create_reservation(TEACHER, data, space_data=SPACE)
+
+    def assert_revalidates(self, url):
+        first = self.client.get(url)
+        self.assertEqual(first.status_code, 200)
+        second = self.client.get(url)
+        self.assertEqual(second["ETag"], first["ETag"])
+        cached = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(cached.status_code, 304)
+        return first["ETag"]
+
+    def test_implicit_range_changes_etag_when_clock_moves(self):
+        self.book(self.start)
+        self.client.force_authenticate(ADMIN)
+        now = timezone.now().replace(second=10, microsecond=0)
+        urls = [
+            "/api/reservations/",
+            f"/api/reservations/busy/?space_id={SPACE['id']}",
+            f"/api/reservations/busy/?space_ids={SPACE['id']}",
+            f"/api/reservations/free-slots/?space_id={SPACE['id']}",
+            "/api/reservations/occupancy/",
+            "/api/reservations/mine/?end=2099-01-01T00:00:00Z",
+        ]
+        for url in urls:
+            with mock.patch("django.utils.timezone.now", return_value=now):
+                etag = self.assert_revalidates(url)
+            # Dentro del mismo minuto el rango implícito no cambia.
+            with mock.patch("django.utils.timezone.now", return_value=now + timedelta(seconds=30)):
+                self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304, url)
+            with mock.patch("django.utils.timezone.now", return_value=now + timedelta(hours=1)):
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 200, url)
+            self.assertNotEqual(response["ETag"], etag, url)
+
+    def test_implicit_free_slots_start_on_the_next_grid_point(self):
+        now = timezone.now().replace(minute=40, second=10, microsecond=0)
+        with mock.patch("django.utils.timezone.now", return_value=now):
+            response = self.client.get(f"/api/reservations/free-slots/?space_id={SPACE['id']}&step=30&limit=1")
+        self.assertEqual(response.status_code, 200)
+        expected = now.replace(minute=0, second=0) + timedelta(hours=1)
+        self.assertEqual(response.data["start"], expected)
+        self.assertEqual(response.data["slots"][0]["start_at"], expected)
+
+    def test_write_changes_etag(self):
+        url = f"/api/reservations/busy/?space_id={SPACE['id']}"
+        etag = self.assert_revalidates(url)
+        self.book(self.start)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_global_version_never_repeats_after_calendar_rows_are_deleted(self):
+        self.book(self.start)
+        before = data_version()
+        SpaceCalendar.objects.all().delete()
+        self.book(self.start + timedelta(hours=2))
+        self.assertNotEqual(data_version(), before)
@@ -0,0 +1,71 @@
+import random
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.test import SimpleTestCase
+
+from reservations.conflicts import sweep_conflicts
+
+BASE = datetime(2030, 1, 1, tzinfo=dt_timezone.utc)
+
+
+def at(minutes):
+    return BASE + timedelta(minutes=minutes)
+
+
+def overlaps(first, second):
+    return first[0] < second[1] and second[0] < first[1]
+
+
+class SweepConflictsTests(SimpleTestCase):
+    """El barrido decide igual que comparar cada candidato contra todo, en orden de inicio."""
+
+    def check(self, candidates, existing):
+        verdicts = sweep_conflicts(candidates, sorted(existing, key=lambda row: row[1]))
+        spans = {key: (start_at, end_at) for key, start_at, end_at in candidates}
+        booked = {reservation_id: (start_at, end_at) for reservation_id, start_at, end_at in existing}
+        accepted = []
+        for _, (key, start_at, end_at) in sorted(enumerate(candidates), key=lambda item: (item[1][1], item[0])):
+            span = (start_at, end_at)
+            verdict = verdicts[key]
+            if any(overlaps(span, other) for other in booked.values()):
+                self.assertEqual(verdict[0], "reservation", key)
+                self.assertTrue(overlaps(span, booked[verdict[1]]), key)
+            elif any(overlaps(span, spans[other]) for other in accepted):
+                self.assertEqual(verdict[0], "candidate", key)
+                self.assertIn(verdict[1], accepted)
+                self.assertTrue(overlaps(span, spans[verdict[1]]), key)
+            else:
+                self.assertIsNone(verdict, key)
+                accepted.append(key)
+        return verdicts
+
+    def test_random_batches_match_pairwise_check(self):
+        rng = random.Random(3)
+        for _ in range(300):
+            existing = []
+            for reservation_id in range(rng.randrange(0, 8)):
+                start = rng.randrange(0, 600, 15)
+                existing.append((reservation_id + 1, at(start), at(start + rng.choice([15, 30, 60, 240]))))
+            candidates = []
+            for key in range(rng.randrange(1, 10)):
+                start = rng.randrange(0, 600, 15)
+                candidates.append((f"c{key}", at(start), at(start + rng.choice([15, 30, 60, 120]))))
+            self.check(candidates, existing)
+
+    def test_touching_intervals_do_not_conflict(self):
+        verdicts = self.check(
+            [("a", at(60), at(120)), ("b", at(120), at(180))],
+            [(1, at(0), at(60)), (2, at(180), at(240))],
+        )
+        self.assertEqual(verdicts, {"a": None, "b": None})
+
+    def test_first_arrival_wins_on_equal_start(self):
+        verdicts = self.check([("late", at(0), at(30)), ("early", at(0), at(60))], [])
+        self.assertEqual(verdicts, {"late": None, "early": ("candidate", "late")})
+
+    def test_long_existing_reservation_shadows_later_candidates(self):
+        verdicts = self.check(
+            [("a", at(120), at(150)), ("b", at(300), at(330))],
+            [(1, at(0), at(400)), (2, at(60), at(90))],
+        )
+        self.assertEqual(verdicts, {"a": ("reservation", 1), "b": ("reservation", 1)})
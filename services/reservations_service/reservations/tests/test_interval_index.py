@@ -0,0 +1,141 @@
+import random
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from reservations import services
+from reservations.authentication import StatelessUser
+from reservations.interval_index import SpaceIntervals, interval_index
+from reservations.models import Reservation
+
+SPACE = {"id": 51, "name": "Sala 51", "location": "", "description": ""}
+ADMIN = StatelessUser(user_id=1, email="admin@example.com", role="ADMIN")
+TEACHER = StatelessUser(user_id=2, email="teacher@example.com", role="TEACHER")
+BASE = datetime(2030, 1, 1, tzinfo=dt_timezone.utc)
+
+
+def at(hours):
+    return BASE + timedelta(hours=hours)
+
+
+def brute_force(intervals, start_at, end_at, exclude_id=None):
+    return sorted(
+        reservation_id
+        for reservation_id, (low, high) in intervals.items()
+        if low < end_at and high > start_at and reservation_id != exclude_id
+    )
+
+
+class SpaceIntervalsTests(SimpleTestCase):
+    """Altas y bajas mantienen el orden por inicio y el máximo acumulado de fin."""
+
+    def assert_consistent(self, entry, intervals):
+        self.assertEqual(sorted(entry.ids), sorted(intervals))
+        self.assertEqual(entry.starts, sorted(entry.starts))
+        running = None
+        for end_at, max_end in zip(entry.ends, entry.max_ends):
+            running = end_at if running is None else max(running, end_at)
+            self.assertEqual(max_end, running)
+        for probe in range(-2, 60):
+            start_at, end_at = at(probe), at(probe + 3)
+            found = sorted(entry.ids[position] for position in entry.overlapping(start_at, end_at))
+            self.assertEqual(found, brute_force(intervals, start_at, end_at))
+            self.assertEqual(entry.has_overlap(start_at, end_at), bool(found))
+
+    def test_random_adds_and_removes_match_brute_force(self):
+        rng = random.Random(7)
+        entry = SpaceIntervals(0, at(-100))
+        intervals = {}
+        for reservation_id in range(1, 200):
+            if intervals and rng.random() < 0.35:
+                victim = rng.choice(sorted(intervals))
+                entry.remove(victim, intervals.pop(victim)[0])
+            else:
+                start = rng.randrange(0, 50)
+                # Algunos intervalos largos para que el máximo acumulado importe.
+                length = rng.choice([1, 1, 2, 3, 12])
+                intervals[reservation_id] = (at(start), at(start + length))
+                entry.add(reservation_id, *intervals[reservation_id])
+            self.assert_consistent(entry, intervals)
+
+    def test_remove_finds_id_when_start_changed(self):
+        entry = SpaceIntervals(0, at(-100), [(1, at(0), at(1)), (2, at(2), at(3))])
+        entry.remove(1, at(10))
+        self.assertEqual(entry.ids, [2])
+        self.assertEqual(entry.max_ends, [at(3)])
+
+    def test_add_ignores_duplicates_and_intervals_before_horizon(self):
+        entry = SpaceIntervals(0, at(0), [(1, at(1), at(2))])
+        entry.add(1, at(1), at(2))
+        entry.add(2, at(-3), at(-1))
+        self.assertEqual(entry.ids, [1])
+
+    def test_exclude_id_skips_the_reservation_itself(self):
+        entry = SpaceIntervals(0, at(-100), [(1, at(0), at(2)), (2, at(1), at(3))])
+        self.assertEqual([entry.ids[p] for p in entry.overlapping(at(0), at(2), exclude_id=1)], [2])
+        self.assertFalse(entry.has_overlap(at(0), at(1), exclude_id=1))
+
+
+class IntervalIndexApplyTests(TestCase):
+    """Las escrituras confirmadas se aplican sobre la entrada cargada sin recargarla."""
+
+    def setUp(self):
+        interval_index.invalidate()
+        self.start = (timezone.now() + timedelta(days=2)).replace(minute=0, second=0, microsecond=0)
+
+    def book(self, offset_hours):
+        start_at = self.start + timedelta(hours=offset_hours)
+        data = {"space_id": SPACE["id"], "title": "Clase", "start_at": start_at, "end_at": start_at + timedelta(hours=1)}
+        with self.captureOnCommitCallbacks(execute=True):
+            return services.create_reservation(TEACHER, data, space_data=SPACE)
+
+    def entry(self):
+        return interval_index._spaces.get(SPACE["id"])
+
+    def assert_matches_database(self):
+        report = interval_index.verify(SPACE["id"])
+        self.assertEqual((report["missing"], report["unexpected"], report["mismatched"]), ([], [], []))
+        self.assertTrue(report["ordered"])
+
+    def test_writes_update_loaded_entry_in_place(self):
+        first = self.book(0)
+        interval_index.load(SPACE["id"])
+        loaded = self.entry()
+
+        second = self.book(3)
+        moved = self.start + timedelta(hours=6)
+        with self.captureOnCommitCallbacks(execute=True):
+            services.update_reservation(
+                ADMIN, Reservation.objects.get(pk=first.pk), {"start_at": moved, "end_at": moved + timedelta(hours=1)}
+            )
+        with self.captureOnCommitCallbacks(execute=True):
+            services.cancel_reservation(TEACHER, Reservation.objects.get(pk=second.pk))
+
+        self.assertIs(self.entry(), loaded)
+        self.assertEqual(loaded.ids, [first.pk])
+        self.assertEqual(loaded.starts, [moved])
+        self.assert_matches_database()
+
+    def test_out_of_order_version_drops_entry(self):
+        self.book(0)
+        entry = interval_index.load(SPACE["id"])
+
+        interval_index.apply(SPACE["id"], entry.version + 2, added=(999, self.start, self.start + timedelta(hours=1)))
+
+        self.assertIsNone(self.entry())
+        self.assert_matches_database()
+
+    def test_index_answers_overlap_like_the_database(self):
+        self.book(0)
+        self.book(2)
+        inside = self.start + timedelta(minutes=30)
+        self.assertTrue(interval_index.has_overlap(SPACE["id"], inside, inside + timedelta(hours=1)))
+        gap = self.start + timedelta(hours=1)
+        self.assertFalse(interval_index.has_overlap(SPACE["id"], gap, gap + timedelta(hours=1)))
+        self.assertEqual(
+            interval_index.busy(SPACE["id"], self.start, self.start + timedelta(hours=4)),
+            list(
+                Reservation.objects.filter(space_id=SPACE["id"]).order_by("start_at").values_list("start_at", "end_at")
+            ),
+        )
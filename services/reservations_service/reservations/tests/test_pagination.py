@@ -0,0 +1,86 @@
+import base64
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.exceptions import NotFound
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from reservations import services
+from reservations.authentication import StatelessUser
+from reservations.interval_index import interval_index
+from reservations.models import Reservation
+from reservations.pagination import KeysetPagination
+
+TEACHER = StatelessUser(user_id=2, email="teacher@example.com", role="TEACHER")
+
+
+def paginator(cursor=None):
+    pagination = KeysetPagination()
+    pagination.ordering = ("-start_at", "-id")
+    pagination.model = Reservation
+    query = {"cursor": cursor} if cursor is not None else {}
+    return pagination, Request(APIRequestFactory().get("/api/reservations/", query))
+
+
+class CursorTests(TestCase):
+    """El cursor opaco guarda los valores de la última fila y se decodifica a los tipos del modelo."""
+
+    def test_round_trip_keeps_aware_datetime(self):
+        start_at = timezone.now().replace(microsecond=123456)
+        pagination, _ = paginator()
+        cursor = pagination.encode_cursor({"start_at": start_at, "id": 17})
+
+        pagination, request = paginator(cursor)
+        position = pagination.decode_cursor(request)
+
+        self.assertEqual(position, {"start_at": start_at, "id": 17})
+        self.assertIsNotNone(position["start_at"].tzinfo)
+        self.assertNotIn("=", cursor)
+
+    def test_invalid_cursors_are_not_found(self):
+        wrong_length = base64.urlsafe_b64encode(b"[1]").decode("ascii")
+        wrong_type = base64.urlsafe_b64encode(b'["ayer", 1]').decode("ascii")
+        for cursor in ("%%%", "bm90IGpzb24", wrong_length, wrong_type):
+            pagination, request = paginator(cursor)
+            with self.assertRaises(NotFound, msg=cursor):
+                pagination.decode_cursor(request)
+
+
+class KeysetWalkTests(TestCase):
+    """Recorrer las páginas entrega cada reserva una vez, también con inicios repetidos."""
+
+    def setUp(self):
+        interval_index.invalidate()
+        self.client = APIClient()
+        self.client.force_authenticate(TEACHER)
+        start = (timezone.now() + timedelta(days=1)).replace(minute=0, second=0, microsecond=0)
+        # Cinco reservas con el mismo inicio (espacios distintos): el desempate es por id.
+        for space_id in range(61, 66):
+            self.book(space_id, start)
+        for space_id in (61, 62):
+            self.book(space_id, start + timedelta(hours=2))
+
+    def book(self, space_id, start_at):
+        space = {"id": space_id, "name": f"Sala {space_id}", "location": "", "description": ""}
+        data = {"space_id": space_id, "title": "Clase", "start_at": start_at, "end_at": start_at + timedelta(hours=1)}
+        services.create_reservation(TEACHER, data, space_data=space)
+
+    def test_pages_cover_every_row_once_in_order(self):
+        url = "/api/reservations/?page_size=2"
+        seen = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertLessEqual(len(response.data["results"]), 2)
+            seen.extend(row["id"] for row in response.data["results"])
+            url = response.data["next"]
+
+        expected = list(Reservation.objects.order_by("-start_at", "-id").values_list("id", flat=True))
+        self.assertEqual(seen, expected)
+
+    def test_paginate_false_returns_plain_list(self):
+        response = self.client.get("/api/reservations/?paginate=false")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), Reservation.objects.count())
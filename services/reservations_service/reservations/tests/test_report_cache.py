@@ -0,0 +1,80 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.test import TestCase, override_settings
+
+from reservations import report_cache
+from reservations.models import ReportCacheEntry, Reservation
+from reservations.report_jobs import report_queryset
+from reservations.services import _touch_space
+
+JAN = datetime(2030, 1, 1, tzinfo=dt_timezone.utc)
+FEB = datetime(2030, 2, 1, tzinfo=dt_timezone.utc)
+MAR = datetime(2030, 3, 1, tzinfo=dt_timezone.utc)
+END_OF_JAN = FEB - timedelta(microseconds=1)
+END_OF_FEB = MAR - timedelta(microseconds=1)
+
+
+@override_settings(REPORT_CACHE_TTL_HOURS=24)
+class InvalidateTests(TestCase):
+    """Una escritura descarta solo los reportes cuyo espacio y rango incluyen la reserva."""
+
+    def setUp(self):
+        self.entries = {
+            "todo": self.store(),
+            "enero": self.store(start=JAN, end=END_OF_JAN),
+            "febrero": self.store(start=FEB, end=END_OF_FEB),
+            "sala1_enero": self.store(start=JAN, end=END_OF_JAN, space_id=1),
+            "sala2_enero": self.store(start=JAN, end=END_OF_JAN, space_id=2),
+            "hasta_enero": self.store(end=END_OF_JAN),
+            "desde_febrero": self.store(start=FEB),
+        }
+
+    def store(self, **filters):
+        filters = report_cache.normalize_filters(**filters)
+        entry = report_cache.store(filters, report_cache.current_version(filters), b"%PDF-")
+        self.assertIsNotNone(entry)
+        return entry.pk
+
+    def invalidate(self, *rows):
+        report_cache.invalidate(list(rows))
+        remaining = set(ReportCacheEntry.objects.values_list("pk", flat=True))
+        return {name for name, pk in self.entries.items() if pk not in remaining}
+
+    def test_reservation_invalidates_only_matching_space_and_range(self):
+        dropped = self.invalidate((1, JAN + timedelta(days=9), JAN + timedelta(days=9, hours=1), "APPROVED"))
+        self.assertEqual(dropped, {"todo", "enero", "sala1_enero", "hasta_enero"})
+
+    def test_boundaries_match_report_filters(self):
+        # Termina justo cuando empieza febrero: el reporte de febrero la incluye (``end_at >= start``).
+        reservation = Reservation.objects.create(
+            space_id=2, space_name="Sala 2", title="Clase", start_at=FEB - timedelta(hours=1), end_at=FEB,
+            created_by_id=1,
+        )
+        february = report_cache.normalize_filters(start=FEB, end=END_OF_FEB)
+        self.assertIn(reservation, report_queryset(**february))
+
+        dropped = self.invalidate((2, reservation.start_at, reservation.end_at))
+
+        self.assertEqual(
+            dropped, {"todo", "enero", "febrero", "sala2_enero", "hasta_enero", "desde_febrero"}
+        )
+
+    def test_rows_of_one_space_are_merged_into_one_span(self):
+        dropped = self.invalidate(
+            (1, JAN + timedelta(days=2), JAN + timedelta(days=2, hours=1)),
+            (1, MAR + timedelta(days=2), MAR + timedelta(days=2, hours=1)),
+        )
+        # Enero y marzo en la misma sala se tratan como un solo rango: febrero también se descarta.
+        self.assertEqual(dropped, {"todo", "enero", "febrero", "sala1_enero", "hasta_enero", "desde_febrero"})
+
+    def test_empty_rows_invalidate_nothing(self):
+        self.assertEqual(report_cache.invalidate([None, ()]), 0)
+        self.assertEqual(self.invalidate(), set())
+
+    def test_store_is_skipped_when_data_changed(self):
+        filters = report_cache.normalize_filters(space_id=3)
+        stale = report_cache.current_version(filters)
+
+        _touch_space(3)
+
+        self.assertIsNone(report_cache.store(filters, stale, b"%PDF-"))
@@ -0,0 +1,75 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from reservations import report_jobs, services
+from reservations.authentication import StatelessUser
+from reservations.interval_index import interval_index
+from reservations.models import ReportJob, ReportJobChunk
+
+SPACE = {"id": 31, "name": "Auditorio", "location": "Bloque D", "description": ""}
+ADMIN = StatelessUser(user_id=1, email="admin@example.com", role="ADMIN")
+
+
+@override_settings(REPORT_CACHE_TTL_HOURS=0)
+@mock.patch.object(report_jobs, "CHUNK_BYTES", 1024)
+class ReportJobArtifactTests(TestCase):
+    """El PDF de un trabajo se guarda en trozos y se descarga sin pasar entero por memoria."""
+
+    def setUp(self):
+        interval_index.invalidate()
+        start = (timezone.now() + timedelta(days=1)).replace(minute=0, second=0, microsecond=0)
+        for hour in range(3):
+            data = {
+                "space_id": SPACE["id"],
+                "title": f"Clase {hour}",
+                "start_at": start + timedelta(hours=hour),
+                "end_at": start + timedelta(hours=hour, minutes=50),
+            }
+            services.create_reservation(ADMIN, data, space_data=SPACE)
+        self.client = APIClient()
+        self.client.force_authenticate(ADMIN)
+
+    def run_job(self):
+        job = report_jobs.create_job(ADMIN, {"space_id": SPACE["id"]})
+        report_jobs.run_job(report_jobs.claim_next())
+        return ReportJob.objects.get(pk=job.pk)
+
+    def test_done_job_is_stored_in_chunks_and_served_whole(self):
+        job = self.run_job()
+
+        self.assertEqual(job.status, ReportJob.Status.DONE)
+        chunks = list(job.chunks.values_list("index", "data"))
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual([index for index, _ in chunks], list(range(len(chunks))))
+
+        response = self.client.get(f"/api/reservations/report-jobs/{job.pk}/file/")
+        self.assertEqual(response.status_code, 200)
+        body = b"".join(response.streaming_content)
+        self.assertTrue(body.startswith(b"%PDF"))
+        self.assertEqual(len(body), job.file_size)
+        self.assertEqual(int(response["Content-Length"]), job.file_size)
+        self.assertEqual(body, b"".join(bytes(data) for _, data in chunks))
+
+    def test_job_requeued_meanwhile_keeps_no_chunks(self):
+        report_jobs.create_job(ADMIN, {"space_id": SPACE["id"]})
+        claimed = report_jobs.claim_next()
+        ReportJob.objects.filter(pk=claimed.pk).update(status=ReportJob.Status.QUEUED, slot=None)
+
+        report_jobs.run_job(claimed)
+
+        self.assertEqual(ReportJob.objects.get(pk=claimed.pk).status, ReportJob.Status.QUEUED)
+        self.assertFalse(ReportJobChunk.objects.filter(job_id=claimed.pk).exists())
+
+    def test_purge_expired_drops_chunks(self):
+        job = self.run_job()
+
+        purged = report_jobs.purge_expired(now=job.expires_at + timedelta(seconds=1))
+
+        self.assertEqual(purged, 1)
+        self.assertFalse(ReportJobChunk.objects.filter(job_id=job.pk).exists())
+        response = self.client.get(f"/api/reservations/report-jobs/{job.pk}/file/")
+        self.assertEqual(response.status_code, 410)
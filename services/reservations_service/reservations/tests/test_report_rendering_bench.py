@@ -0,0 +1,79 @@
+import os
+import random
+import re
+import sys
+import time
+import unittest
+from datetime import timedelta
+
+from django.conf import settings
+from django.test import TransactionTestCase, override_settings
+from django.utils import timezone
+
+from reservations.models import Reservation
+from reservations.reporting import build_reservations_report
+
+PAGE_PATTERN = re.compile(rb"/Type\s*/Page\b(?!s)")
+BENCH = os.environ.get("RESERVATIONS_BENCH")
+
+
+def _sizes(name, default):
+    value = os.environ.get(name)
+    return [int(item) for item in value.split(",")] if value else default
+
+
+@unittest.skipUnless(BENCH, "benchmark opcional: define RESERVATIONS_BENCH=1 para ejecutarlo")
+class ReportRenderingBenchmark(TransactionTestCase):
+    """Páginas por segundo del reporte PDF con reservas sintéticas.
+
+    Tamaños en ``RESERVATIONS_BENCH_ROWS`` (por defecto 1000,10000,50000) y procesos de maquetación
+    a comparar en ``RESERVATIONS_BENCH_WORKERS`` (por defecto ``REPORT_RENDER_WORKERS``). Las filas se
+    confirman porque los procesos en paralelo usan sus propias conexiones; con SQLite en memoria
+    solo tiene sentido el modo en serie (1).
+    """
+
+    spaces = 8
+    first_space = 999000
+
+    def test_pages_per_second(self):
+        rng = random.Random(7)
+        base = timezone.now().replace(minute=0, second=0, microsecond=0)
+        statuses = list(Reservation.Status.values)
+        space_ids = [self.first_space + offset for offset in range(self.spaces)]
+        queryset = Reservation.objects.filter(space_id__in=space_ids).order_by("space_name", "start_at")
+
+        inserted = 0
+        for size in sorted(_sizes("RESERVATIONS_BENCH_ROWS", [1000, 10000, 50000])):
+            rows = []
+            for i in range(inserted, size):
+                start_at = base + timedelta(minutes=30 * i)
+                space_id = rng.choice(space_ids)
+                rows.append(Reservation(
+                    space_id=space_id,
+                    space_name=f"Sala {space_id}",
+                    space_location="Bloque B",
+                    created_by_id=rng.randint(1, 50),
+                    created_by_email="bench@example.com",
+                    created_by_first_name="Ana",
+                    created_by_last_name="Pérez",
+                    title=f"Reserva de prueba {i}" + " larga" * rng.randint(0, 6),
+                    start_at=start_at,
+                    end_at=start_at + timedelta(minutes=30 * rng.randint(1, 4)),
+                    status=rng.choice(statuses),
+                ))
+            Reservation.objects.bulk_create(rows, batch_size=1000)
+            inserted = size
+
+            for workers in _sizes("RESERVATIONS_BENCH_WORKERS", [settings.REPORT_RENDER_WORKERS]):
+                # Umbral en 0 para medir el modo pedido aunque el reporte sea pequeño.
+                with override_settings(REPORT_RENDER_WORKERS=workers, REPORT_PARALLEL_MIN_ROWS=0):
+                    started = time.perf_counter()
+                    content = build_reservations_report(queryset)
+                    elapsed = time.perf_counter() - started
+                pages = len(PAGE_PATTERN.findall(content))
+                self.assertGreater(pages, 0)
+                sys.stderr.write(
+                    f"\n{size:>7} reservas, {workers} proceso(s): {pages:>6} páginas en {elapsed:8.2f} s | "
+                    f"{pages / elapsed:8.1f} páginas/s | {size / elapsed:9.0f} filas/s | "
+                    f"{len(content) / 1024:9.0f} KiB"
+                )
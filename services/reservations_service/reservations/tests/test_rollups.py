@@ -0,0 +1,87 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from reservations import services, space_replica
+from reservations.authentication import StatelessUser
+from reservations.interval_index import interval_index
+from reservations.models import Reservation, ReservationDailyRollup, SpaceCalendar
+from reservations.rollups import summarize
+
+ADMIN = StatelessUser(user_id=1, email="admin@example.com", role="ADMIN")
+TEACHER = StatelessUser(user_id=2, email="teacher@example.com", role="TEACHER")
+SPACES = [
+    {"id": 11, "name": "Sala 11", "location": "", "description": "", "is_active": True},
+    {"id": 12, "name": "Sala 12", "location": "", "description": "", "is_active": True},
+]
+
+
+class RollupMaintenanceTests(TestCase):
+    """Los totales que mantiene cada escritura coinciden con los que recalcula ``rebuild_daily_rollups``."""
+
+    def setUp(self):
+        interval_index.invalidate()
+        for space in SPACES:
+            space_replica.upsert(space)
+        # A las 23:00 locales: mover la reserva una hora la cambia de día.
+        self.start = timezone.localtime(timezone.now() + timedelta(days=3)).replace(
+            hour=23, minute=0, second=0, microsecond=0
+        )
+
+    def assert_consistent(self):
+        call_command("rebuild_daily_rollups", "--verify", stdout=StringIO())
+
+    def data(self, space, offset_hours, hours=1):
+        start_at = self.start + timedelta(hours=offset_hours)
+        return {"space_id": space["id"], "title": "Clase", "start_at": start_at, "end_at": start_at + timedelta(hours=hours)}
+
+    def test_every_write_path_keeps_rollups_consistent(self):
+        first = services.create_reservation(TEACHER, self.data(SPACES[0], 0), space_data=SPACES[0])
+        second = services.create_reservation(TEACHER, self.data(SPACES[0], -5), space_data=SPACES[0])
+        created, _ = services.bulk_create_reservations(
+            TEACHER, [(0, self.data(SPACES[1], 0)), (1, self.data(SPACES[1], 2, hours=2))]
+        )
+        series, _, _ = services.create_series(
+            TEACHER, {**self.data(SPACES[1], 24), "frequency": "DAILY", "count": 4}
+        )
+        self.assert_consistent()
+
+        moved = self.start + timedelta(hours=1)
+        services.update_reservation(ADMIN, first, {"start_at": moved, "end_at": moved + timedelta(hours=2)})
+        services.approve_reservation(ADMIN, second)
+        services.reject_reservation(ADMIN, created[0])
+        services.cancel_reservation(TEACHER, created[1])
+        services.approve_series(ADMIN, series)
+        services.cancel_series(TEACHER, series)
+        services.delete_reservation(second)
+        self.assert_consistent()
+
+        totals = summarize(self.start.date() - timedelta(days=1), self.start.date() + timedelta(days=10))
+        self.assertEqual(sum(row["count"] for row in totals), Reservation.objects.count())
+
+    def test_rebuild_replaces_drifted_rows(self):
+        services.create_reservation(TEACHER, self.data(SPACES[0], 0), space_data=SPACES[0])
+        ReservationDailyRollup.objects.update(count=99)
+        with self.assertRaises(CommandError):
+            self.assert_consistent()
+        call_command("rebuild_daily_rollups", stdout=StringIO())
+        self.assert_consistent()
+        self.assertEqual(ReservationDailyRollup.objects.get().count, 1)
+
+    def test_deleting_synthetic_reservations_keeps_rollups_and_versions(self):
+        for offset in (0, 2, 4):
+            services.create_reservation(TEACHER, self.data(SPACES[0], offset), space_data=SPACES[0])
+        services.create_reservation(TEACHER, self.data(SPACES[1], 0), space_data=SPACES[1])
+        versions = dict(SpaceCalendar.objects.values_list("space_id", "version"))
+
+        self.assertEqual(services.delete_space_reservations([SPACES[0]["id"]]), 3)
+
+        self.assert_consistent()
+        self.assertFalse(Reservation.objects.filter(space_id=SPACES[0]["id"]).exists())
+        after = dict(SpaceCalendar.objects.values_list("space_id", "version"))
+        self.assertGreater(after[SPACES[0]["id"]], versions[SPACES[0]["id"]])
+        self.assertEqual(after[SPACES[1]["id"]], versions[SPACES[1]["id"]])
+        self.assertEqual(services.busy_blocks(SPACES[0]["id"], self.start, self.start + timedelta(days=1)), [])
@@ -0,0 +1,77 @@
+from datetime import timedelta
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from reservations import services, space_replica
+from reservations.authentication import StatelessUser
+from reservations.interval_index import interval_index
+
+TEACHER = StatelessUser(user_id=2, email="teacher@example.com", role="TEACHER")
+SPACE = {"id": 41, "name": "Sala 41", "location": "", "description": "", "is_active": True}
+
+
+class SeriesListTests(TestCase):
+    """El listado de series precarga las ocurrencias: las consultas no crecen con el número de series."""
+
+    def setUp(self):
+        interval_index.invalidate()
+        space_replica.upsert(SPACE)
+        self.start = (timezone.now() + timedelta(days=2)).replace(minute=0, second=0, microsecond=0)
+        self.client = APIClient()
+        self.client.force_authenticate(TEACHER)
+
+    def create_series(self, offset_hours):
+        start_at = self.start + timedelta(hours=offset_hours)
+        data = {
+            "space_id": SPACE["id"],
+            "title": "Clase",
+            "start_at": start_at,
+            "end_at": start_at + timedelta(hours=1),
+            "frequency": "DAILY",
+            "count": 3,
+        }
+        return services.create_series(TEACHER, data)[0]
+
+    def list_series(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/reservations/series/")
+        self.assertEqual(response.status_code, 200)
+        results = response.data["results"] if isinstance(response.data, dict) else response.data
+        return results, len(queries)
+
+    def test_query_count_does_not_grow_with_series(self):
+        self.create_series(0)
+        _, one = self.list_series()
+        for offset in (2, 4, 6):
+            self.create_series(offset)
+        results, many = self.list_series()
+
+        self.assertEqual(len(results), 4)
+        self.assertEqual(many, one)
+
+    def test_occurrences_are_in_start_order(self):
+        self.create_series(0)
+        results, _ = self.list_series()
+        starts = [occurrence["start_at"] for occurrence in results[0]["occurrences"]]
+        self.assertEqual(len(starts), 3)
+        self.assertEqual(starts, sorted(starts))
+
+    def test_create_response_lists_occurrences_in_start_order(self):
+        start_at = self.start + timedelta(hours=8)
+        response = self.client.post("/api/reservations/series/", {
+            "space_id": SPACE["id"],
+            "title": "Taller",
+            "start_at": start_at.isoformat(),
+            "end_at": (start_at + timedelta(hours=1)).isoformat(),
+            "frequency": "DAILY",
+            "count": 3,
+        }, format="json")
+
+        self.assertEqual(response.status_code, 201, response.data)
+        starts = [occurrence["start_at"] for occurrence in response.data["occurrences"]]
+        self.assertEqual(len(starts), 3)
+        self.assertEqual(starts, sorted(starts))
@@ -0,0 +1,132 @@
+import threading
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, skipUnlessDBFeature
+from django.utils import timezone
+from rest_framework.exceptions import NotFound, ValidationError
+
+from reservations import services
+from reservations.authentication import StatelessUser
+from reservations.interval_index import interval_index
+from reservations.locks import space_lock
+from reservations.models import Reservation, SpaceCalendar
+
+SPACE = {"id": 7, "name": "Sala 7", "location": "Bloque A", "description": ""}
+ADMIN = StatelessUser(user_id=1, email="admin@example.com", role="ADMIN")
+OWNER = StatelessUser(user_id=2, email="owner@example.com", role="TEACHER")
+OTHER = StatelessUser(user_id=3, email="other@example.com", role="TEACHER")
+
+
+def assert_rollups_consistent():
+    call_command("rebuild_daily_rollups", "--verify", space=[SPACE["id"]], stdout=StringIO())
+
+
+def book(user, start_at, hours=1, title="Clase"):
+    data = {"space_id": SPACE["id"], "title": title, "start_at": start_at, "end_at": start_at + timedelta(hours=hours)}
+    return services.create_reservation(user, data, space_data=SPACE)
+
+
+class StaleInstanceTests(TestCase):
+    """Las escrituras deciden sobre la fila releída con el espacio bloqueado, no sobre la copia de la vista."""
+
+    def setUp(self):
+        interval_index.invalidate()
+        self.start = (timezone.now() + timedelta(days=2)).replace(minute=0, second=0, microsecond=0)
+
+    def test_approve_from_stale_copy_does_not_double_book(self):
+        reservation = book(OWNER, self.start)
+        stale = Reservation.objects.get(pk=reservation.pk)
+        services.cancel_reservation(OWNER, Reservation.objects.get(pk=reservation.pk))
+        second = book(OTHER, self.start)
+
+        with self.assertRaises(ValidationError):
+            services.approve_reservation(ADMIN, stale)
+
+        active = Reservation.objects.filter(space_id=SPACE["id"], status__in=["PENDING", "APPROVED"])
+        self.assertEqual(list(active.values_list("id", "status")), [(second.id, "PENDING")])
+
+    def test_cancel_from_stale_copy_keeps_committed_reschedule(self):
+        reservation = book(OWNER, self.start)
+        stale = Reservation.objects.get(pk=reservation.pk)
+        moved = self.start + timedelta(hours=3)
+        services.update_reservation(
+            ADMIN, Reservation.objects.get(pk=reservation.pk), {"start_at": moved, "end_at": moved + timedelta(hours=1)}
+        )
+
+        services.cancel_reservation(OWNER, stale)
+
+        reservation.refresh_from_db()
+        self.assertEqual(reservation.status, Reservation.Status.CANCELLED)
+        self.assertEqual(reservation.start_at, moved)
+        assert_rollups_consistent()
+
+    def test_decisions_require_pending(self):
+        reservation = book(OWNER, self.start)
+        services.reject_reservation(ADMIN, reservation)
+        with self.assertRaises(ValidationError):
+            services.approve_reservation(ADMIN, reservation)
+        with self.assertRaises(ValidationError):
+            services.cancel_reservation(OWNER, reservation)
+        reservation.refresh_from_db()
+        self.assertEqual(reservation.status, Reservation.Status.REJECTED)
+
+    def test_delete_of_already_deleted_row(self):
+        reservation = book(OWNER, self.start)
+        stale = Reservation.objects.get(pk=reservation.pk)
+        services.delete_reservation(reservation)
+        with self.assertRaises(NotFound):
+            services.delete_reservation(stale)
+        assert_rollups_consistent()
+
+
+class SpaceLockTests(TestCase):
+    def test_locks_each_space_once_in_ascending_order(self):
+        with mock.patch("reservations.locks._lock_rows") as lock_rows:
+            with space_lock(9, "4", 9):
+                pass
+        lock_rows.assert_called_once_with([4, 9])
+        self.assertEqual(
+            sorted(SpaceCalendar.objects.filter(space_id__in=[4, 9]).values_list("space_id", flat=True)), [4, 9]
+        )
+
+    def test_rolls_back_the_block_on_error(self):
+        start = timezone.now() + timedelta(days=1)
+        with self.assertRaises(RuntimeError):
+            with space_lock(SPACE["id"]):
+                book(OWNER, start)
+                raise RuntimeError
+        self.assertFalse(Reservation.objects.exists())
+
+
+@skipUnlessDBFeature("has_select_for_update")
+class ConcurrentCreateTests(TransactionTestCase):
+    """Dos solicitudes simultáneas por el mismo horario: solo una puede crearse."""
+
+    def test_same_slot_is_booked_once(self):
+        interval_index.invalidate()
+        start = timezone.now() + timedelta(days=3)
+        barrier = threading.Barrier(2)
+        outcomes = []
+
+        def attempt(user):
+            try:
+                barrier.wait()
+                book(user, start)
+                outcomes.append("created")
+            except ValidationError:
+                outcomes.append("conflict")
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=attempt, args=(user,)) for user in (OWNER, OTHER)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(outcomes), ["conflict", "created"])
+        self.assertEqual(Reservation.objects.filter(space_id=SPACE["id"]).count(), 1)
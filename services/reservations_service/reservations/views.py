@@ -1,35 +1,68 @@
 from datetime import timedelta
+from io import BytesIO
 
+from django.conf import settings
+from django.db.models import Prefetch
 from django.utils import timezone
 from django.utils.dateparse import parse_datetime
-from django.http import HttpResponse
+from django.http import FileResponse
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import OpenApiParameter, extend_schema, extend_schema_view
-from rest_framework import status, viewsets
+from rest_framework import mixins, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.exceptions import PermissionDenied, ValidationError
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
+from rest_framework.reverse import reverse
 from rest_framework.views import APIView
 
-from reservations.models import Reservation
-from reservations.permissions import IsAdminRole, IsOwnerOrAdmin
+from reservations import columnar, deadlines, interservice, report_cache, space_replica
+from reservations.conditional import conditional_response, data_version, data_versions, make_etag
+from reservations.exports import csv_response, xlsx_response
+from reservations.models import ReportJob, Reservation, ReservationSeries
+from reservations.pagination import KeysetPagination
+from reservations.permissions import IsAdminRole, IsOwnerOrAdmin, IsServiceRole
 from reservations.serializers import (
+    BusyBlocksQuerySerializer,
+    FreeSlotsQuerySerializer,
+    OccupancyQuerySerializer,
+    ReportJobCreateSerializer,
+    ReportJobSerializer,
+    ReservationStatsQuerySerializer,
     ReservationAdminSerializer,
+    ReservationBulkCreateSerializer,
     ReservationCreateSerializer,
     ReservationDecisionSerializer,
     ReservationPublicSerializer,
+    ReservationSeriesCreateSerializer,
+    ReservationSeriesSerializer,
     ReservationUpdateSerializer,
+    SpaceReplicaEventSerializer,
 )
 from reservations.services import (
+    BULK_MODE_ATOMIC,
+    align_to_step,
     approve_reservation,
+    approve_series,
+    bulk_create_reservations,
     busy_blocks,
+    busy_blocks_many,
     cancel_reservation,
+    cancel_series,
     create_reservation,
+    create_series,
+    delete_reservation,
+    free_slots,
+    occupancy,
     reject_reservation,
+    reject_series,
     update_reservation,
 )
-from reservations.reporting import build_reservations_report
+from reservations.rollups import summarize
+from reservations.readers import FIELDS, Projection, parse_fields
+from reservations.report_jobs import create_job, dispatch, open_artifact, report_queryset
+from reservations.reporting import spooled_reservations_report
+from reservations.streaming import iterate_keyset, stream_format, streaming_response
 
 
 class HealthCheckView(APIView):
@@ -38,6 +71,46 @@ class HealthCheckView(APIView):
     def get(self, request):
         return Response({'status': 'ok', 'service': 'reservations'})
 
+
+@extend_schema(
+    tags=["Salud"],
+    summary="Métricas del cliente entre servicios",
+    description=(
+        "Latencia por endpoint, reuso de conexiones y estado del circuit breaker de las llamadas "
+        "a spaces-service. Los valores son del proceso que atiende la petición (cada worker de gunicorn "
+        "lleva los suyos). Requiere rol ADMIN."
+    ),
+)
+class InterserviceMetricsView(APIView):
+    permission_classes = [IsAuthenticated, IsAdminRole]
+
+    def get(self, request):
+        return Response(interservice.metrics())
+
+
+@extend_schema(
+    tags=["Espacios (Servicio)"],
+    summary="Aviso de cambio en el catálogo de espacios",
+    description=(
+        "Lo envía spaces-service al crear, editar o borrar un espacio para mantener la réplica local "
+        "con la que se validan las reservas. Requiere un token de servicio o rol ADMIN."
+    ),
+    request=SpaceReplicaEventSerializer,
+    responses={204: None},
+)
+class SpaceReplicaEventView(APIView):
+    permission_classes = [IsAuthenticated, IsServiceRole | IsAdminRole]
+
+    def post(self, request):
+        serializer = SpaceReplicaEventSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        space = serializer.validated_data["space"]
+        if serializer.validated_data["event"] == SpaceReplicaEventSerializer.EVENT_DELETE:
+            space_replica.remove(space["id"])
+        else:
+            space_replica.upsert(space)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
 DATE_RANGE_PARAMS = [
     OpenApiParameter(
         name="start",
@@ -62,6 +135,53 @@ LIST_PARAMS = DATE_RANGE_PARAMS + [
     ),
 ]
 
+FIELDS_PARAMS = [
+    OpenApiParameter(
+        name="fields",
+        type=OpenApiTypes.STR,
+        required=False,
+        description=(
+            "Campos a devolver separados por coma (" + ", ".join(FIELDS) + "); los anidados admiten "
+            "subcampos, p. ej. space.name. Solo se leen de la base de datos las columnas necesarias."
+        ),
+    ),
+]
+
+REPORT_STATUS_PARAM = OpenApiParameter(
+    name="status",
+    type=OpenApiTypes.STR,
+    required=False,
+    description="Filtra por estado. Acepta valores separados por coma (PENDING,APPROVED,REJECTED,CANCELLED).",
+)
+
+PAGINATION_PARAMS = [
+    OpenApiParameter(
+        name="cursor",
+        type=OpenApiTypes.STR,
+        required=False,
+        description="Cursor opaco devuelto en `next` por la página anterior.",
+    ),
+    OpenApiParameter(
+        name="page_size",
+        type=OpenApiTypes.INT,
+        required=False,
+        description="Tamaño de página (por defecto API_PAGE_SIZE, máximo API_MAX_PAGE_SIZE).",
+    ),
+    OpenApiParameter(
+        name="paginate",
+        type=OpenApiTypes.BOOL,
+        required=False,
+        description="Con `false` devuelve la lista completa sin paginar (formato anterior).",
+    ),
+    OpenApiParameter(
+        name="stream",
+        type=OpenApiTypes.STR,
+        required=False,
+        enum=["json", "ndjson"],
+        description="Devuelve todas las filas en streaming (arreglo JSON o NDJSON) sin paginar.",
+    ),
+]
+
 
 def _parse_datetime(value):
     dt = parse_datetime(value)
@@ -72,21 +192,28 @@ def _parse_datetime(value):
     return dt
 
 
+def _now_minute():
+    return timezone.now().replace(second=0, microsecond=0)
+
+
 @extend_schema_view(
     list=extend_schema(
         tags=["Reservas (Teacher)"],
         summary="Consultar reservas en un rango",
         description=(
             "Admin ve todas las reservas con detalle completo. Teachers ven reservas en estado PENDING/APPROVED "
-            "con detalle completo (incluyendo quién creó y quién aprobó cada reserva)."
+            "con detalle completo (incluyendo quién creó y quién aprobó cada reserva). "
+            "Respuesta paginada por cursor ({next, results}) ordenada por inicio descendente. "
+            "Devuelve ETag; con If-None-Match responde 304 si los datos no cambiaron."
         ),
-        parameters=LIST_PARAMS,
+        parameters=LIST_PARAMS + FIELDS_PARAMS + PAGINATION_PARAMS,
         responses=ReservationAdminSerializer(many=True),
     ),
     retrieve=extend_schema(
         tags=["Reservas (Teacher)"],
         summary="Detalle de reserva",
         description="Todos los usuarios ven detalle completo de las reservas.",
+        parameters=FIELDS_PARAMS,
         responses=ReservationAdminSerializer,
     ),
     create=extend_schema(
@@ -96,6 +223,17 @@ def _parse_datetime(value):
         request=ReservationCreateSerializer,
         responses=ReservationAdminSerializer,
     ),
+    bulk=extend_schema(
+        tags=["Reservas (Teacher)"],
+        summary="Crear reservas en lote",
+        description=(
+            "Crea varias reservas en una sola transacción. Cada espacio se consulta una vez y los solapamientos "
+            "(contra la base de datos y dentro del lote) se detectan con un solo barrido por espacio. "
+            "mode=atomic no crea nada si algún elemento falla; mode=partial crea los que no tienen conflicto. "
+            "Devuelve un resultado por elemento (created, invalid, conflict o skipped)."
+        ),
+        request=ReservationBulkCreateSerializer,
+    ),
     update=extend_schema(
         tags=["Reservas (Admin)"],
         summary="Editar reserva",
@@ -109,8 +247,8 @@ def _parse_datetime(value):
     mine=extend_schema(
         tags=["Reservas (Teacher)"],
         summary="Mis reservas",
-        description="Devuelve todas las reservas del usuario autenticado (pasadas, presentes y futuras) incluyendo todos los estados (PENDING, APPROVED, REJECTED, CANCELLED). Opcionalmente filtra por rango de fechas si se proporcionan los parámetros start/end.",
-        parameters=DATE_RANGE_PARAMS,
+        description="Devuelve todas las reservas del usuario autenticado (pasadas, presentes y futuras) incluyendo todos los estados (PENDING, APPROVED, REJECTED, CANCELLED). Opcionalmente filtra por rango de fechas si se proporcionan los parámetros start/end. Respuesta paginada por cursor ({next, results}); admite ETag/If-None-Match.",
+        parameters=DATE_RANGE_PARAMS + FIELDS_PARAMS + PAGINATION_PARAMS,
         responses=ReservationAdminSerializer(many=True),
     ),
     cancel=extend_schema(
@@ -135,46 +273,203 @@ def _parse_datetime(value):
     ),
     busy=extend_schema(
         tags=["Reservas (Teacher)"],
-        summary="Bloques ocupados para un espacio",
-        parameters=LIST_PARAMS,
-        description="Endpoint ligero para que spaces-service consulte disponibilidad.",
+        summary="Bloques ocupados de uno o varios espacios",
+        parameters=LIST_PARAMS
+        + [
+            OpenApiParameter(
+                name="space_ids",
+                type=OpenApiTypes.STR,
+                required=False,
+                description="IDs de espacio separados por coma; responde los bloques agrupados por espacio.",
+            ),
+            OpenApiParameter(
+                name="merge",
+                type=OpenApiTypes.BOOL,
+                required=False,
+                description="Une los bloques solapados o contiguos.",
+            ),
+        ],
+        request=BusyBlocksQuerySerializer,
+        description=(
+            "Endpoint ligero para que spaces-service consulte disponibilidad. Con space_ids (o POST con "
+            "{space_ids, start, end, merge} para listas largas) resuelve todos los espacios con una sola "
+            "consulta. En GET devuelve ETag; con If-None-Match responde 304 si los espacios no cambiaron."
+        ),
     ),
-    report=extend_schema(
+    free_slots=extend_schema(
+        tags=["Reservas (Teacher)"],
+        summary="Horarios libres de un espacio",
+        parameters=DATE_RANGE_PARAMS
+        + [
+            OpenApiParameter(name="space_id", type=OpenApiTypes.INT, required=True, description="ID de espacio."),
+            OpenApiParameter(
+                name="duration",
+                type=OpenApiTypes.INT,
+                required=False,
+                description="Duración en minutos (por defecto la mínima permitida; respeta mínimo y máximo).",
+            ),
+            OpenApiParameter(
+                name="step",
+                type=OpenApiTypes.INT,
+                required=False,
+                description="Separación en minutos entre inicios candidatos (por defecto la duración mínima).",
+            ),
+            OpenApiParameter(
+                name="limit",
+                type=OpenApiTypes.INT,
+                required=False,
+                description="Máximo de horarios a devolver (tope RESERVATION_FREE_SLOTS_MAX).",
+            ),
+        ],
+        description=(
+            "Calcula en el servidor los horarios libres del rango con un barrido lineal sobre los bloques "
+            "ocupados. truncated indica que había más horarios que el límite. Admite ETag/If-None-Match."
+        ),
+    ),
+    occupancy=extend_schema(
         tags=["Reservas (Admin)"],
-        summary="Generar PDF de reservas",
-        parameters=LIST_PARAMS
+        summary="Mapa de ocupación por espacio",
+        parameters=DATE_RANGE_PARAMS
         + [
+            OpenApiParameter(
+                name="bucket",
+                type=OpenApiTypes.STR,
+                required=False,
+                enum=["15m", "1h", "1d"],
+                description="Tamaño del intervalo (por defecto 1h). Los diarios empiezan a medianoche local.",
+            ),
+            OpenApiParameter(
+                name="space_ids",
+                type=OpenApiTypes.STR,
+                required=False,
+                description="IDs de espacio separados por coma. Por defecto, los espacios con reservas en el rango.",
+            ),
             OpenApiParameter(
                 name="status",
                 type=OpenApiTypes.STR,
                 required=False,
-                description="Filtra por estado. Acepta valores separados por coma (PENDING,APPROVED,REJECTED,CANCELLED).",
-            )
+                description="Estados a contar separados por coma (por defecto PENDING,APPROVED).",
+            ),
+        ],
+        description=(
+            "Solo ADMIN. Matriz compacta de minutos ocupados: matrix[i][j] corresponde a spaces[i] y al "
+            "intervalo j contado desde start. Admite ETag/If-None-Match."
+        ),
+    ),
+    stats=extend_schema(
+        tags=["Reservas (Admin)"],
+        summary="Estadísticas de uso por espacio y estado",
+        parameters=[
+            OpenApiParameter(
+                name="start_date",
+                type=OpenApiTypes.DATE,
+                required=False,
+                description="Fecha inicial (inclusive). Por defecto el primer día del mes actual.",
+            ),
+            OpenApiParameter(
+                name="end_date",
+                type=OpenApiTypes.DATE,
+                required=False,
+                description="Fecha final (inclusive). Por defecto el último día del mes de start_date.",
+            ),
+            OpenApiParameter(
+                name="space_ids",
+                type=OpenApiTypes.STR,
+                required=False,
+                description="IDs de espacio separados por coma.",
+            ),
+            OpenApiParameter(
+                name="group_by",
+                type=OpenApiTypes.STR,
+                required=False,
+                description="Agrupación separada por coma: space_id, date, status (por defecto space_id,status).",
+            ),
         ],
+        description=(
+            "Solo ADMIN. Cantidad de reservas y minutos reservados leídos de la tabla de totales diarios "
+            "(fecha local de inicio), sin recorrer las reservas. Admite ETag/If-None-Match."
+        ),
+    ),
+    report=extend_schema(
+        tags=["Reservas (Admin)"],
+        summary="Generar PDF de reservas",
+        parameters=LIST_PARAMS + [REPORT_STATUS_PARAM],
         responses={200: {"content": {"application/pdf": {}}}},
+        description=(
+            "Solo ADMIN. Genera el PDF dentro de la petición; para rangos grandes use "
+            "POST /api/reservations/report-jobs/, que lo genera en segundo plano. Si el mismo reporte "
+            "se generó antes y ninguna reserva de su rango cambió, se entrega el PDF guardado."
+        ),
+    ),
+    export_csv=extend_schema(
+        tags=["Reservas (Admin)"],
+        summary="Exportar reservas en CSV",
+        parameters=LIST_PARAMS + [REPORT_STATUS_PARAM],
+        responses={200: {"content": {"text/csv": {}}}},
+        description=(
+            "Solo ADMIN. Mismos filtros que el reporte PDF. Una fila por reserva con los datos en bruto, "
+            "en orden de inicio; el archivo se envía a medida que se genera (UTF-8 con BOM)."
+        ),
+    ),
+    export_xlsx=extend_schema(
+        tags=["Reservas (Admin)"],
+        summary="Exportar reservas en XLSX",
+        parameters=LIST_PARAMS + [REPORT_STATUS_PARAM],
+        responses={200: {"content": {"application/vnd.openxmlformats-officedocument.spreadsheetml.sheet": {}}}},
+        description=(
+            "Solo ADMIN. Mismas columnas y filtros que el CSV, con fechas como celdas de fecha. "
+            "Límite de 1.048.575 filas (una hoja de Excel)."
+        ),
+    ),
+    export_arrow=extend_schema(
+        tags=["Reservas (Admin)"],
+        summary="Exportar reservas en Arrow IPC",
+        parameters=LIST_PARAMS + [REPORT_STATUS_PARAM],
+        responses={200: {"content": {"application/vnd.apache.arrow.stream": {}}}},
+        description=(
+            "Solo ADMIN. Mismas columnas y filtros que el CSV en formato Arrow IPC (stream) con tipos: ids "
+            "int64, fechas timestamp[us, UTC] y status categórico. Se envía lote a lote."
+        ),
+    ),
+    export_parquet=extend_schema(
+        tags=["Reservas (Admin)"],
+        summary="Exportar reservas en Parquet",
+        parameters=LIST_PARAMS + [REPORT_STATUS_PARAM],
+        responses={200: {"content": {"application/vnd.apache.parquet": {}}}},
+        description="Solo ADMIN. Mismo esquema que la exportación Arrow, en Parquet.",
     ),
 )
 class ReservationViewSet(viewsets.ModelViewSet):
     queryset = Reservation.objects.all()
     permission_classes = [IsAuthenticated]
     serializer_class = ReservationAdminSerializer
+    pagination_class = KeysetPagination
+    # Orden estable para el cursor; lo cubren IX_reservations_space_start e IX_reservations_created_start.
+    keyset_ordering = ("-start_at", "-id")
 
     def get_permissions(self):
-        if self.action in ["update", "partial_update", "approve", "reject", "report"]:
+        if self.action in [
+            "update", "partial_update", "approve", "reject", "report", "export_csv", "export_xlsx", "export_arrow",
+            "export_parquet", "occupancy", "stats",
+        ]:
             return [IsAuthenticated(), IsAdminRole()]
         return super().get_permissions()
 
     def get_serializer_class(self):
         if self.action == "create":
             return ReservationCreateSerializer
+        if self.action == "bulk":
+            return ReservationBulkCreateSerializer
         if self.action in ["update", "partial_update"]:
             return ReservationUpdateSerializer
         return ReservationAdminSerializer
 
-    def _get_date_range(self, request):
-        start_param = request.query_params.get("start")
-        end_param = request.query_params.get("end")
-        now = timezone.now()
+    def _get_date_range(self, request, params=None):
+        params = request.query_params if params is None else params
+        start_param = params.get("start")
+        end_param = params.get("end")
+        # Truncado al minuto: el rango implícito avanza en pasos y entra en el ETag junto con el resto.
+        now = _now_minute()
         default_end = now + timedelta(days=30)
         start_dt = _parse_datetime(start_param) if start_param else now
         end_dt = _parse_datetime(end_param) if end_param else default_end
@@ -182,6 +477,21 @@ class ReservationViewSet(viewsets.ModelViewSet):
             raise ValidationError("La fecha de inicio debe ser anterior a la fecha fin")
         return start_dt, end_dt
 
+    def _projection(self, request):
+        return Projection(parse_fields(request.query_params.get("fields")))
+
+    def _list_response(self, request, queryset):
+        """Respuesta de listado (streaming, paginada o completa) con la misma forma que ReservationAdminSerializer."""
+        projection = self._projection(request)
+        rows = projection.rows(queryset)
+        fmt = stream_format(request)
+        if fmt:
+            return streaming_response(projection.serialize(iterate_keyset(rows, self.keyset_ordering)), fmt)
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(list(projection.serialize(page)))
+        return Response(list(projection.serialize(rows)))
+
     def list(self, request, *args, **kwargs):
         start_dt, end_dt = self._get_date_range(request)
         queryset = self.filter_queryset(self.get_queryset())
@@ -191,8 +501,8 @@ class ReservationViewSet(viewsets.ModelViewSet):
         if space_id:
             queryset = queryset.filter(space_id=space_id)
         queryset = queryset.filter(start_at__lt=end_dt, end_at__gt=start_dt)
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        etag = make_etag(request, data_version(space_id or None), start_dt, end_dt)
+        return conditional_response(request, etag, lambda: self._list_response(request, queryset))
 
     @action(detail=False, methods=["get"], url_path="mine")
     def mine(self, request, *args, **kwargs):
@@ -208,9 +518,10 @@ class ReservationViewSet(viewsets.ModelViewSet):
         # Solo aplicar filtro de fechas si se proporcionan explícitamente
         start_param = request.query_params.get("start")
         end_param = request.query_params.get("end")
+        start_dt = end_dt = None
 
         if start_param or end_param:
-            now = timezone.now()
+            now = _now_minute()
             if start_param:
                 start_dt = _parse_datetime(start_param)
             else:
@@ -223,10 +534,14 @@ class ReservationViewSet(viewsets.ModelViewSet):
 
         # Ordenar por fecha de inicio descendente (más recientes primero)
         queryset = queryset.order_by("-start_at")
-        serializer = ReservationAdminSerializer(queryset, many=True)
-        return Response(serializer.data)
+        etag = make_etag(request, data_version(), start_dt, end_dt)
+        return conditional_response(request, etag, lambda: self._list_response(request, queryset))
 
     def retrieve(self, request, *args, **kwargs):
+        projection = self._projection(request)
+        if projection.selection is not None:
+            self.queryset = self.queryset.only(*projection.columns)
+            return Response(projection.serialize_instance(self.get_object()))
         reservation = self.get_object()
         serializer = ReservationAdminSerializer(reservation)
         return Response(serializer.data)
@@ -239,6 +554,38 @@ class ReservationViewSet(viewsets.ModelViewSet):
         headers = self.get_success_headers(output.data)
         return Response(output.data, status=status.HTTP_201_CREATED, headers=headers)
 
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        mode = serializer.validated_data["mode"]
+        items = []
+        invalid = []
+        for index, item in enumerate(serializer.validated_data["reservations"]):
+            item_serializer = ReservationCreateSerializer(data=item)
+            if item_serializer.is_valid():
+                items.append((index, item_serializer.validated_data))
+            else:
+                invalid.append({"index": index, "status": "invalid", "errors": item_serializer.errors})
+
+        if invalid and mode == BULK_MODE_ATOMIC:
+            results = invalid + [{"index": index, "status": "skipped"} for index, _ in items]
+            created = []
+        else:
+            created, results = bulk_create_reservations(
+                request.user, items, mode, request.headers.get("Authorization")
+            )
+            results = invalid + results
+        results.sort(key=lambda result: result["index"])
+        payload = {
+            "mode": mode,
+            "created": len(created),
+            "failed": sum(result["status"] in ("invalid", "conflict") for result in results),
+            "results": results,
+        }
+        response_status = status.HTTP_201_CREATED if created else status.HTTP_400_BAD_REQUEST
+        return Response(payload, status=response_status)
+
     def partial_update(self, request, *args, **kwargs):
         reservation = self.get_object()
         serializer = self.get_serializer(data=request.data, partial=True)
@@ -246,6 +593,9 @@ class ReservationViewSet(viewsets.ModelViewSet):
         reservation = update_reservation(request.user, reservation, serializer.validated_data)
         return Response(ReservationAdminSerializer(reservation).data)
 
+    def perform_destroy(self, instance):
+        delete_reservation(instance)
+
     @action(detail=True, methods=["post"], url_path="cancel", permission_classes=[IsAuthenticated, IsOwnerOrAdmin])
     def cancel(self, request, pk=None):
         reservation = self.get_object()
@@ -268,9 +618,8 @@ class ReservationViewSet(viewsets.ModelViewSet):
         reservation = reject_reservation(request.user, reservation, serializer.validated_data.get("note"))
         return Response(ReservationAdminSerializer(reservation).data)
 
-    @action(detail=False, methods=["get"], url_path="report")
-    def report(self, request):
-        queryset = self.filter_queryset(self.get_queryset())
+    def _report_filters(self, request):
+        """Filtros de ``report`` y ``export`` (start, end, space_id, status) ya normalizados."""
         start_param = request.query_params.get("start")
         end_param = request.query_params.get("end")
         space_param = request.query_params.get("space_id") or request.query_params.get("space")
@@ -281,39 +630,381 @@ class ReservationViewSet(viewsets.ModelViewSet):
         if start_dt and end_dt and start_dt >= end_dt:
             raise ValidationError("La fecha de inicio debe ser anterior a la fecha fin")
 
-        if start_dt:
-            queryset = queryset.filter(end_at__gte=start_dt)
-        if end_dt:
-            queryset = queryset.filter(start_at__lte=end_dt)
-        if space_param:
-            queryset = queryset.filter(space_id=space_param)
-
         statuses = None
         if status_param and status_param.lower() != "all":
             statuses = [s.strip().upper() for s in status_param.split(",") if s.strip()]
             valid_statuses = {choice[0] for choice in Reservation.Status.choices}
             statuses = [s for s in statuses if s in valid_statuses]
-            if statuses:
-                queryset = queryset.filter(status__in=statuses)
-
-        reservations = queryset.order_by("space_name", "start_at")
-        pdf_bytes = build_reservations_report(
-            reservations,
-            start=start_dt,
-            end=end_dt,
-            space=space_param,
-            statuses=statuses,
-        )
+
+        try:
+            return report_cache.normalize_filters(start_dt, end_dt, space_param, statuses)
+        except ValueError:
+            raise ValidationError("space_id debe ser numérico")
+
+    @action(detail=False, methods=["get"], url_path="report")
+    def report(self, request):
+        filters = self._report_filters(request)
         filename = f"reporte_reservas_{timezone.now().strftime('%Y%m%d_%H%M')}.pdf"
-        response = HttpResponse(pdf_bytes, content_type="application/pdf")
-        response["Content-Disposition"] = f'attachment; filename=\"{filename}\"'
-        return response
 
-    @action(detail=False, methods=["get"], url_path="busy")
+        cached = report_cache.lookup(filters)
+        if cached is not None:
+            return FileResponse(
+                BytesIO(bytes(cached.content)), as_attachment=True, filename=filename, content_type="application/pdf"
+            )
+
+        deadlines.check("generar el reporte")
+        version = report_cache.current_version(filters)
+        output = spooled_reservations_report(
+            report_queryset(**filters),
+            start=filters["start"],
+            end=filters["end"],
+            space=filters["space_id"],
+            statuses=filters["statuses"],
+            # Si el plazo vence a mitad de la maquetación se deja de generar.
+            progress=lambda percent: deadlines.check("terminar el reporte"),
+        )
+        report_cache.store_file(filters, version, output)
+        return FileResponse(output, as_attachment=True, filename=filename, content_type="application/pdf")
+
+    @action(detail=False, methods=["get"], url_path="export/csv")
+    def export_csv(self, request):
+        return csv_response(report_queryset(**self._report_filters(request)))
+
+    @action(detail=False, methods=["get"], url_path="export/xlsx")
+    def export_xlsx(self, request):
+        return xlsx_response(report_queryset(**self._report_filters(request)))
+
+    @action(detail=False, methods=["get"], url_path="export/arrow")
+    def export_arrow(self, request):
+        return columnar.arrow_response(report_queryset(**self._report_filters(request)))
+
+    @action(detail=False, methods=["get"], url_path="export/parquet")
+    def export_parquet(self, request):
+        return columnar.parquet_response(report_queryset(**self._report_filters(request)))
+
+    @action(detail=False, methods=["get", "post"], url_path="busy")
     def busy(self, request):
+        if request.method == "POST" or request.query_params.get("space_ids"):
+            return self._busy_many(request)
         space_id = request.query_params.get("space_id")
         if not space_id:
             raise ValidationError("space_id es requerido")
         start_dt, end_dt = self._get_date_range(request)
-        blocks = busy_blocks(space_id, start_dt, end_dt)
-        return Response({"space_id": int(space_id), "start": start_dt, "end": end_dt, "busy": blocks})
+        merge = request.query_params.get("merge", "").lower() in ("1", "true", "yes")
+        etag = make_etag(request, data_version(space_id), start_dt, end_dt)
+
+        def build():
+            blocks = busy_blocks(space_id, start_dt, end_dt, merge=merge)
+            return Response({"space_id": int(space_id), "start": start_dt, "end": end_dt, "busy": blocks})
+
+        return conditional_response(request, etag, build)
+
+    @action(detail=False, methods=["get"], url_path="free-slots")
+    def free_slots(self, request):
+        serializer = FreeSlotsQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        space_id = serializer.validated_data["space_id"]
+        duration = timedelta(minutes=serializer.validated_data.get("duration", settings.RESERVATION_MIN_DURATION_MINUTES))
+        step = timedelta(minutes=serializer.validated_data.get("step", settings.RESERVATION_MIN_DURATION_MINUTES))
+        limit = serializer.validated_data.get("limit", settings.RESERVATION_FREE_SLOTS_MAX)
+        start_dt, end_dt = self._get_date_range(request)
+        if not request.query_params.get("start"):
+            # Sin inicio explícito se parte del próximo inicio de la grilla: no se ofrecen horarios
+            # ya pasados y el ETag cambia una vez por ``step``.
+            start_dt = align_to_step(timezone.now(), step)
+            if start_dt >= end_dt:
+                raise ValidationError("La fecha de inicio debe ser anterior a la fecha fin")
+        etag = make_etag(request, data_version(space_id), start_dt, end_dt)
+
+        def build():
+            slots, truncated = free_slots(space_id, start_dt, end_dt, duration, step, limit)
+            return Response({
+                "space_id": space_id,
+                "start": start_dt,
+                "end": end_dt,
+                "duration": int(duration.total_seconds() // 60),
+                "step": int(step.total_seconds() // 60),
+                "slots": slots,
+                "truncated": truncated,
+            })
+
+        return conditional_response(request, etag, build)
+
+    @action(detail=False, methods=["get"], url_path="occupancy")
+    def occupancy(self, request):
+        params = request.query_params
+        data = {"bucket": params.get("bucket", "1h")}
+        for name in ("space_ids", "status"):
+            if params.get(name):
+                data[name] = [item for item in params[name].split(",") if item.strip()]
+        serializer = OccupancyQuerySerializer(data=data)
+        serializer.is_valid(raise_exception=True)
+        space_ids = serializer.validated_data.get("space_ids")
+        start_dt, end_dt = self._get_date_range(request)
+        etag = make_etag(request, data_versions(space_ids) if space_ids else data_version(), start_dt, end_dt)
+
+        def build():
+            edges, matrix = occupancy(
+                space_ids, start_dt, end_dt, serializer.validated_data["bucket"], serializer.validated_data.get("status")
+            )
+            spaces = list(matrix) if space_ids else sorted(matrix)
+            return Response({
+                "start": edges[0],
+                "end": edges[-1],
+                "bucket": serializer.validated_data["bucket"],
+                "buckets": len(edges) - 1,
+                "unit": "minutes",
+                "spaces": spaces,
+                "matrix": [matrix[space_id] for space_id in spaces],
+            })
+
+        return conditional_response(request, etag, build)
+
+    @action(detail=False, methods=["get"], url_path="stats")
+    def stats(self, request):
+        params = request.query_params
+        data = {key: params[key] for key in ("start_date", "end_date") if params.get(key)}
+        for name in ("space_ids", "group_by"):
+            if params.get(name):
+                data[name] = [item for item in params[name].split(",") if item.strip()]
+        serializer = ReservationStatsQuerySerializer(data=data)
+        serializer.is_valid(raise_exception=True)
+        today = timezone.localdate()
+        start_date = serializer.validated_data.get("start_date") or today.replace(day=1)
+        end_date = serializer.validated_data.get("end_date")
+        if end_date is None:
+            next_month = (start_date.replace(day=28) + timedelta(days=4)).replace(day=1)
+            end_date = next_month - timedelta(days=1)
+        space_ids = serializer.validated_data.get("space_ids")
+        group_by = list(dict.fromkeys(serializer.validated_data["group_by"]))
+        etag = make_etag(request, data_versions(space_ids) if space_ids else data_version(), start_date, end_date)
+
+        def build():
+            rows = summarize(start_date, end_date, space_ids, group_by)
+            return Response({
+                "start_date": start_date,
+                "end_date": end_date,
+                "group_by": group_by,
+                "totals": {
+                    "count": sum(row["count"] for row in rows),
+                    "occupied_minutes": sum(row["occupied_minutes"] for row in rows),
+                },
+                "rows": rows,
+            })
+
+        return conditional_response(request, etag, build)
+
+    def _busy_many(self, request):
+        if request.method == "POST":
+            params = request.data
+            serializer = BusyBlocksQuerySerializer(data=request.data)
+        else:
+            params = request.query_params
+            serializer = BusyBlocksQuerySerializer(
+                data={
+                    "space_ids": [item for item in params["space_ids"].split(",") if item.strip()],
+                    "merge": params.get("merge", False),
+                }
+            )
+        serializer.is_valid(raise_exception=True)
+        space_ids = serializer.validated_data["space_ids"]
+        merge = serializer.validated_data["merge"]
+        start_dt, end_dt = self._get_date_range(request, params)
+
+        def build():
+            grouped = busy_blocks_many(space_ids, start_dt, end_dt, merge=merge)
+            return Response({
+                "start": start_dt,
+                "end": end_dt,
+                "merge": merge,
+                "spaces": [{"space_id": space_id, "busy": blocks} for space_id, blocks in grouped.items()],
+            })
+
+        if request.method == "POST":
+            return build()
+        etag = make_etag(request, data_versions(space_ids), start_dt, end_dt)
+        return conditional_response(request, etag, build)
+
+
+@extend_schema_view(
+    list=extend_schema(
+        tags=["Series (Teacher)"],
+        summary="Listar series recurrentes",
+        description="ADMIN ve todas las series; los demás usuarios solo las propias.",
+    ),
+    retrieve=extend_schema(
+        tags=["Series (Teacher)"],
+        summary="Detalle de serie",
+        description="Incluye las ocurrencias (reservas) generadas y su estado.",
+    ),
+    create=extend_schema(
+        tags=["Series (Teacher)"],
+        summary="Crear serie recurrente",
+        description=(
+            "Regla diaria/semanal estilo RRULE (interval, weekdays, until o count, exceptions). Todas las "
+            "ocurrencias se validan con una consulta de rango y se crean en bloque. on_conflict=fail rechaza "
+            "la serie si alguna ocurrencia choca; on_conflict=skip omite esas fechas."
+        ),
+        request=ReservationSeriesCreateSerializer,
+        responses=ReservationSeriesSerializer,
+    ),
+    cancel=extend_schema(
+        tags=["Series (Teacher)"],
+        summary="Cancelar serie",
+        description="Owner o ADMIN. Cancela todas las ocurrencias activas en un solo UPDATE.",
+    ),
+    approve=extend_schema(
+        tags=["Series (Admin)"],
+        summary="Aprobar serie",
+        description="Solo ADMIN. Aprueba todas las ocurrencias pendientes en un solo UPDATE.",
+        request=ReservationDecisionSerializer,
+    ),
+    reject=extend_schema(
+        tags=["Series (Admin)"],
+        summary="Rechazar serie",
+        description="Solo ADMIN. Rechaza todas las ocurrencias pendientes en un solo UPDATE.",
+        request=ReservationDecisionSerializer,
+    ),
+)
+class ReservationSeriesViewSet(
+    mixins.ListModelMixin,
+    mixins.RetrieveModelMixin,
+    mixins.CreateModelMixin,
+    viewsets.GenericViewSet,
+):
+    permission_classes = [IsAuthenticated]
+    serializer_class = ReservationSeriesSerializer
+
+    def get_queryset(self):
+        # Las ocurrencias de todas las series de la página en una sola consulta, ya ordenadas.
+        occurrences = Reservation.objects.only("id", "series", "start_at", "end_at", "status").order_by("start_at")
+        queryset = ReservationSeries.objects.prefetch_related(Prefetch("occurrences", queryset=occurrences))
+        if getattr(self.request.user, "role", "").upper() != "ADMIN":
+            queryset = queryset.filter(created_by_id=getattr(self.request.user, "id", None))
+        return queryset
+
+    def get_serializer_class(self):
+        if self.action == "create":
+            return ReservationSeriesCreateSerializer
+        return ReservationSeriesSerializer
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        series, created, conflicts = create_series(
+            request.user, serializer.validated_data, request.headers.get("Authorization")
+        )
+        series = self.get_queryset().get(pk=series.pk)
+        data = dict(ReservationSeriesSerializer(series).data)
+        data["skipped"] = conflicts
+        return Response(data, status=status.HTTP_201_CREATED)
+
+    def _decision_response(self, series, updated):
+        return Response({"series_id": series.id, "updated": updated})
+
+    @action(detail=True, methods=["post"], url_path="cancel", permission_classes=[IsAuthenticated, IsOwnerOrAdmin])
+    def cancel(self, request, pk=None):
+        series = self.get_object()
+        return self._decision_response(series, cancel_series(request.user, series))
+
+    @action(detail=True, methods=["post"], url_path="approve", permission_classes=[IsAuthenticated, IsAdminRole])
+    def approve(self, request, pk=None):
+        series = self.get_object()
+        serializer = ReservationDecisionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return self._decision_response(
+            series, approve_series(request.user, series, serializer.validated_data.get("note"))
+        )
+
+    @action(detail=True, methods=["post"], url_path="reject", permission_classes=[IsAuthenticated, IsAdminRole])
+    def reject(self, request, pk=None):
+        series = self.get_object()
+        serializer = ReservationDecisionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return self._decision_response(
+            series, reject_series(request.user, series, serializer.validated_data.get("note"))
+        )
+
+
+@extend_schema_view(
+    list=extend_schema(
+        tags=["Reportes (Admin)"],
+        summary="Listar trabajos de reporte",
+        description="Solo ADMIN. Trabajos de reporte del usuario autenticado, del más reciente al más antiguo.",
+    ),
+    retrieve=extend_schema(
+        tags=["Reportes (Admin)"],
+        summary="Estado de un trabajo de reporte",
+        description=(
+            "Estado (QUEUED, RUNNING, DONE, FAILED, EXPIRED) y avance 0-100. Cuando está DONE, "
+            "download_url apunta al PDF."
+        ),
+    ),
+    create=extend_schema(
+        tags=["Reportes (Admin)"],
+        summary="Encolar reporte PDF",
+        description=(
+            "Solo ADMIN. Mismos filtros que GET /api/reservations/report/ (start, end, space_id, status). "
+            "Responde 202 de inmediato; el PDF se genera en segundo plano y se consulta con GET. "
+            "Si el reporte ya está en caché el trabajo se devuelve en DONE."
+        ),
+        request=ReportJobCreateSerializer,
+        responses={202: ReportJobSerializer},
+    ),
+    file=extend_schema(
+        tags=["Reportes (Admin)"],
+        summary="Descargar el PDF de un trabajo",
+        description="409 si el trabajo aún no termina o falló; 410 si el archivo ya expiró.",
+        responses={200: {"content": {"application/pdf": {}}}},
+    ),
+)
+class ReportJobViewSet(
+    mixins.ListModelMixin,
+    mixins.RetrieveModelMixin,
+    mixins.CreateModelMixin,
+    viewsets.GenericViewSet,
+):
+    permission_classes = [IsAuthenticated, IsAdminRole]
+    serializer_class = ReportJobSerializer
+    pagination_class = KeysetPagination
+    keyset_ordering = ("-id",)
+
+    def get_queryset(self):
+        return ReportJob.objects.filter(requested_by_id=getattr(self.request.user, "id", None))
+
+    def create(self, request, *args, **kwargs):
+        serializer = ReportJobCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        job = create_job(request.user, serializer.validated_data)
+        data = ReportJobSerializer(job, context=self.get_serializer_context()).data
+        headers = {"Location": reverse("report-job-detail", args=[job.pk], request=request)}
+        return Response(data, status=status.HTTP_202_ACCEPTED, headers=headers)
+
+    def retrieve(self, request, *args, **kwargs):
+        job = self.get_object()
+        if job.status == ReportJob.Status.QUEUED:
+            # Por si el proceso que lo encoló se reinició antes de atenderlo.
+            dispatch()
+        return Response(self.get_serializer(job).data)
+
+    @action(detail=True, methods=["get"], url_path="file")
+    def file(self, request, pk=None):
+        job = self.get_object()
+        if job.status == ReportJob.Status.EXPIRED or (
+            job.status == ReportJob.Status.DONE and job.expires_at and job.expires_at <= timezone.now()
+        ):
+            return Response({"detail": "El reporte expiró, genera uno nuevo"}, status=status.HTTP_410_GONE)
+        if job.status == ReportJob.Status.FAILED:
+            return Response(
+                {"detail": "El reporte falló", "error": job.error}, status=status.HTTP_409_CONFLICT
+            )
+        if job.status != ReportJob.Status.DONE:
+            return Response(
+                {"detail": "El reporte aún no está listo", "progress": job.progress},
+                status=status.HTTP_409_CONFLICT,
+            )
+        response = FileResponse(
+            open_artifact(job), as_attachment=True, filename=job.file_name, content_type="application/pdf"
+        )
+        response["Content-Length"] = job.file_size
+        return response
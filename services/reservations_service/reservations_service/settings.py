@@ -21,7 +21,40 @@ env = environ.Env(
     JWT_SECRET=(str, 'change-jwt-secret'),
     RESERVATION_MIN_DURATION_MINUTES=(int, 30),
     RESERVATION_MAX_DURATION_HOURS=(int, 4),
+    RESERVATION_INDEX_ENABLED=(bool, True),
+    RESERVATION_INDEX_LOOKBACK_DAYS=(int, 30),
+    RESERVATION_LOCK_BACKEND=(str, 'row'),
+    RESERVATION_LOCK_TIMEOUT_SECONDS=(int, 10),
+    RESERVATION_BULK_MAX_ITEMS=(int, 5000),
+    RESERVATION_SERIES_MAX_OCCURRENCES=(int, 200),
+    RESERVATION_STREAM_CHUNK_SIZE=(int, 1000),
+    RESERVATION_BUSY_MAX_SPACES=(int, 500),
+    RESERVATION_FREE_SLOTS_MAX=(int, 200),
+    RESERVATION_OCCUPANCY_MAX_BUCKETS=(int, 3000),
+    RESERVATION_REPORT_CHUNK_SIZE=(int, 500),
+    REPORT_SPOOL_MAX_BYTES=(int, 8 * 1024 * 1024),
+    REPORT_RENDER_WORKERS=(int, 2),
+    REPORT_PARALLEL_MIN_ROWS=(int, 5000),
+    REPORT_JOBS_WORKERS=(int, 1),
+    REPORT_JOBS_MAX_RUNNING=(int, 2),
+    REPORT_JOBS_TTL_HOURS=(int, 24),
+    REPORT_JOBS_STALE_SECONDS=(int, 600),
+    REPORT_JOBS_MAX_ATTEMPTS=(int, 2),
+    REPORT_CACHE_TTL_HOURS=(int, 24),
+    REPORT_CACHE_MAX_BYTES=(int, 16 * 1024 * 1024),
+    API_PAGE_SIZE=(int, 100),
+    API_MAX_PAGE_SIZE=(int, 1000),
+    REQUEST_DEADLINE_SECONDS=(int, 60),
     SPACES_BASE_URL=(str, 'http://spaces:8000/api'),
+    SPACES_DETAIL_TIMEOUT=(float, 2.0),
+    SPACE_REPLICA_MAX_AGE_SECONDS=(int, 3600),
+    SPACE_REPLICA_SYNC_TIMEOUT=(float, 10.0),
+    INTERSERVICE_POOL_SIZE=(int, 10),
+    INTERSERVICE_CONNECT_TIMEOUT=(float, 1.0),
+    INTERSERVICE_RETRIES=(int, 2),
+    INTERSERVICE_RETRY_BACKOFF=(float, 0.1),
+    INTERSERVICE_BREAKER_THRESHOLD=(int, 5),
+    INTERSERVICE_BREAKER_RESET_SECONDS=(float, 30.0),
     DATABASE_URL=(str, ''),
 )
 
@@ -48,6 +81,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'reservations.deadlines.DeadlineMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -125,5 +159,38 @@ CSRF_TRUSTED_ORIGINS = env.list('CSRF_TRUSTED_ORIGINS', default=['https://*.rail
 JWT_SECRET = env('JWT_SECRET')
 RESERVATION_MIN_DURATION_MINUTES = env('RESERVATION_MIN_DURATION_MINUTES')
 RESERVATION_MAX_DURATION_HOURS = env('RESERVATION_MAX_DURATION_HOURS')
+RESERVATION_INDEX_ENABLED = env('RESERVATION_INDEX_ENABLED')
+RESERVATION_INDEX_LOOKBACK_DAYS = env('RESERVATION_INDEX_LOOKBACK_DAYS')
+RESERVATION_LOCK_BACKEND = env('RESERVATION_LOCK_BACKEND')
+RESERVATION_LOCK_TIMEOUT_SECONDS = env('RESERVATION_LOCK_TIMEOUT_SECONDS')
+RESERVATION_BULK_MAX_ITEMS = env('RESERVATION_BULK_MAX_ITEMS')
+RESERVATION_SERIES_MAX_OCCURRENCES = env('RESERVATION_SERIES_MAX_OCCURRENCES')
+RESERVATION_STREAM_CHUNK_SIZE = env('RESERVATION_STREAM_CHUNK_SIZE')
+RESERVATION_BUSY_MAX_SPACES = env('RESERVATION_BUSY_MAX_SPACES')
+RESERVATION_FREE_SLOTS_MAX = env('RESERVATION_FREE_SLOTS_MAX')
+RESERVATION_OCCUPANCY_MAX_BUCKETS = env('RESERVATION_OCCUPANCY_MAX_BUCKETS')
+RESERVATION_REPORT_CHUNK_SIZE = env('RESERVATION_REPORT_CHUNK_SIZE')
+REPORT_SPOOL_MAX_BYTES = env('REPORT_SPOOL_MAX_BYTES')
+REPORT_RENDER_WORKERS = env('REPORT_RENDER_WORKERS')
+REPORT_PARALLEL_MIN_ROWS = env('REPORT_PARALLEL_MIN_ROWS')
+REPORT_JOBS_WORKERS = env('REPORT_JOBS_WORKERS')
+REPORT_JOBS_MAX_RUNNING = env('REPORT_JOBS_MAX_RUNNING')
+REPORT_JOBS_TTL_HOURS = env('REPORT_JOBS_TTL_HOURS')
+REPORT_JOBS_STALE_SECONDS = env('REPORT_JOBS_STALE_SECONDS')
+REPORT_JOBS_MAX_ATTEMPTS = env('REPORT_JOBS_MAX_ATTEMPTS')
+REPORT_CACHE_TTL_HOURS = env('REPORT_CACHE_TTL_HOURS')
+REPORT_CACHE_MAX_BYTES = env('REPORT_CACHE_MAX_BYTES')
+API_PAGE_SIZE = env('API_PAGE_SIZE')
+API_MAX_PAGE_SIZE = env('API_MAX_PAGE_SIZE')
+REQUEST_DEADLINE_SECONDS = env('REQUEST_DEADLINE_SECONDS')
 SPACES_BASE_URL = env('SPACES_BASE_URL')
+SPACES_DETAIL_TIMEOUT = env('SPACES_DETAIL_TIMEOUT')
+SPACE_REPLICA_MAX_AGE_SECONDS = env('SPACE_REPLICA_MAX_AGE_SECONDS')
+SPACE_REPLICA_SYNC_TIMEOUT = env('SPACE_REPLICA_SYNC_TIMEOUT')
+INTERSERVICE_POOL_SIZE = env('INTERSERVICE_POOL_SIZE')
+INTERSERVICE_CONNECT_TIMEOUT = env('INTERSERVICE_CONNECT_TIMEOUT')
+INTERSERVICE_RETRIES = env('INTERSERVICE_RETRIES')
+INTERSERVICE_RETRY_BACKOFF = env('INTERSERVICE_RETRY_BACKOFF')
+INTERSERVICE_BREAKER_THRESHOLD = env('INTERSERVICE_BREAKER_THRESHOLD')
+INTERSERVICE_BREAKER_RESET_SECONDS = env('INTERSERVICE_BREAKER_RESET_SECONDS')
 
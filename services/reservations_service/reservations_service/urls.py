@@ -3,14 +3,26 @@ from django.urls import include, path
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 from rest_framework import routers
 
-from reservations.views import ReservationViewSet, HealthCheckView
+from reservations.views import (
+    HealthCheckView,
+    InterserviceMetricsView,
+    ReportJobViewSet,
+    ReservationSeriesViewSet,
+    ReservationViewSet,
+    SpaceReplicaEventView,
+)
 
 router = routers.DefaultRouter()
+# Deben registrarse antes que "reservations" para que /reservations/series/ no se tome como un pk.
+router.register(r"reservations/series", ReservationSeriesViewSet, basename="reservation-series")
+router.register(r"reservations/report-jobs", ReportJobViewSet, basename="report-job")
 router.register(r"reservations", ReservationViewSet, basename="reservation")
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/reservations/health/', HealthCheckView.as_view(), name='health_check'),
+    path('api/reservations/health/interservice/', InterserviceMetricsView.as_view(), name='interservice_metrics'),
+    path('api/reservations/space-replica/', SpaceReplicaEventView.as_view(), name='space_replica_event'),
     path('api/', include(router.urls)),
     path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
     path('api/docs/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger'),
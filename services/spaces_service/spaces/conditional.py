@@ -0,0 +1,34 @@
+"""GET condicional (ETag / If-None-Match) para el catálogo de espacios.
+
+La versión del listado es ``max(updated_at)`` más el número de espacios: cualquier alta,
+edición o baja la cambia. Si el ETag coincide se responde ``304`` sin serializar nada.
+"""
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+
+
+def queryset_version(queryset):
+    stats = queryset.aggregate(last=Max("updated_at"), total=Count("id"))
+    return stats["last"], stats["total"]
+
+
+def make_etag(request, *parts):
+    """ETag para la ruta y los parámetros de la solicitud, el usuario y las partes dadas."""
+    user = request.user
+    query = sorted(request.query_params.lists())
+    key = repr((request.path, query, getattr(user, "id", None), getattr(user, "role", None), parts))
+    return '"%s"' % hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+def conditional_response(request, etag, build):
+    """Devuelve ``304`` si el cliente ya tiene ``etag``; si no, llama a ``build()`` y le añade el ETag."""
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = build()
+    response["ETag"] = etag
+    # El navegador debe revalidar siempre; el contenido depende del token.
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ["Authorization"])
+    return response
@@ -0,0 +1,551 @@
+"""Cliente HTTP para las llamadas entre servicios (espacios ↔ reservas).
+
+El mismo módulo existe en ``spaces_service`` y ``reservations_service`` (los servicios no
+comparten código); si se cambia uno hay que cambiar el otro.
+
+- Una ``requests.Session`` por proceso con un pool keep-alive de ``INTERSERVICE_POOL_SIZE``
+  conexiones por host: las llamadas reutilizan la conexión TCP en lugar de abrir una cada vez.
+- Cada endpoint declara su timeout de lectura; el de conexión es ``INTERSERVICE_CONNECT_TIMEOUT``.
+- Los GET se reintentan hasta ``INTERSERVICE_RETRIES`` veces ante errores de red o 502/503/504,
+  esperando un tiempo aleatorio entre 0 y ``INTERSERVICE_RETRY_BACKOFF * 2**intento`` segundos
+  para que los reintentos de varios hilos no lleguen a la vez.
+- Cada llamada envía el plazo restante de la petición (``deadlines``) y no espera más que eso;
+  si ya venció se lanza ``DeadlineExceeded`` (504) sin llamar ni reintentar.
+- Un circuit breaker por servicio destino: tras ``INTERSERVICE_BREAKER_THRESHOLD`` fallos
+  seguidos las llamadas fallan de inmediato con ``CircuitOpenError`` durante
+  ``INTERSERVICE_BREAKER_RESET_SECONDS``; después se deja pasar una sola llamada de prueba y,
+  si responde, el circuito se cierra.
+
+``CircuitOpenError`` hereda de ``requests.RequestException``, así que los ``except`` existentes
+la tratan como cualquier otro error de red. ``metrics()`` devuelve latencias por endpoint, reuso
+del pool y estado de los breakers del proceso actual.
+
+Transportes, según el esquema de la URL base (``SPACES_BASE_URL``/``RESERVATIONS_BASE_URL``):
+
+- ``http://`` y ``https://``: TCP, para los despliegues con un contenedor por servicio.
+- ``http+unix://`` (modo local): la misma petición HTTP por un socket Unix, con la ruta del socket
+  codificada como host (``http+unix://%2Frun%2Fapp%2Fspaces.sock/api``). En el contenedor
+  unificado los servicios comparten máquina y gunicorn escucha también en ese socket: se evita la
+  pila TCP de loopback sin cambiar las vistas ni la autenticación.
+
+``arequest`` es la variante para vistas asíncronas (modo ASGI): usa una ``aiohttp.ClientSession``
+(un pool por event loop y destino, con hasta ``INTERSERVICE_ASYNC_MAX_CONNECTIONS`` conexiones)
+con los mismos timeouts, reintentos, breakers, plazos y métricas. Devuelve un ``requests.Response``
+y traduce los errores de aiohttp a ``requests.Timeout``/``requests.ConnectionError``, así que
+quien llama trata igual ambas variantes. ``aiohttp`` es opcional: solo lo necesita el modo ASGI,
+que solo existe en spaces-service (la copia de reservations-service no tiene ``arequest``). Las
+sesiones de un loop ya cerrado se cierran en la siguiente llamada y ``aclose`` cierra las del
+loop actual al apagar el servidor (``lifespan``, ver ``spaces_service.asgi``).
+
+Las llamadas que no actúan en nombre de un usuario (avisos y sincronizaciones) se autentican con
+``service_headers``: un JWT de vida corta con rol ``SERVICE`` firmado con el ``JWT_SECRET``
+compartido.
+"""
+import asyncio
+import logging
+import os
+import random
+import socket
+import threading
+import time
+from collections import deque
+from urllib.parse import unquote, urlsplit
+
+import jwt
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from urllib3.connection import HTTPConnection
+from urllib3.connectionpool import HTTPConnectionPool
+
+try:
+    import aiohttp
+except ImportError:  # dependencia opcional (modo ASGI)
+    aiohttp = None
+
+from spaces import deadlines
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+RETRY_STATUSES = frozenset({502, 503, 504})
+# Muestras recientes por endpoint para calcular percentiles.
+LATENCY_SAMPLES = 512
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+UNIX_SCHEME = "http+unix"
+# Host que ven las vistas en el modo local (el mismo de las llamadas por loopback).
+UNIX_HOST = "127.0.0.1"
+
+SERVICE_ROLE = "SERVICE"
+SERVICE_TOKEN_SECONDS = 60
+
+
+class CircuitOpenError(requests.RequestException):
+    """El servicio destino acumula fallos y la llamada no se intentó."""
+
+
+class CircuitBreaker:
+    def __init__(self, name):
+        self.name = name
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.times_opened = 0
+        self.short_circuited = 0
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        with self._lock:
+            if self.state == OPEN:
+                if time.monotonic() - self.opened_at < settings.INTERSERVICE_BREAKER_RESET_SECONDS:
+                    self.short_circuited += 1
+                    raise CircuitOpenError(f"Circuito abierto hacia {self.name}")
+                self.state = HALF_OPEN
+            if self.state == HALF_OPEN:
+                if self._trial_running:
+                    self.short_circuited += 1
+                    raise CircuitOpenError(f"Circuito abierto hacia {self.name}")
+                self._trial_running = True
+
+    def record_success(self):
+        with self._lock:
+            if self.state != CLOSED:
+                logger.info("Circuito hacia %s cerrado", self.name)
+            self.state = CLOSED
+            self.failures = 0
+            self.opened_at = None
+            self._trial_running = False
+
+    def release(self):
+        """La llamada terminó sin decir nada del destino: libera el turno de prueba si lo tenía."""
+        with self._lock:
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_running = False
+            if self.state == HALF_OPEN or self.failures >= settings.INTERSERVICE_BREAKER_THRESHOLD:
+                if self.state != OPEN:
+                    self.times_opened += 1
+                    logger.warning("Circuito hacia %s abierto tras %s fallos", self.name, self.failures)
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self.failures,
+                "times_opened": self.times_opened,
+                "short_circuited": self.short_circuited,
+                "open_for_seconds": round(time.monotonic() - self.opened_at, 1) if self.opened_at else None,
+            }
+
+
+class EndpointStats:
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.samples = deque(maxlen=LATENCY_SAMPLES)
+        self._lock = threading.Lock()
+
+    def record(self, seconds, failed, retries):
+        with self._lock:
+            self.calls += 1
+            self.errors += failed
+            self.retries += retries
+            self.total_seconds += seconds
+            self.max_seconds = max(self.max_seconds, seconds)
+            self.samples.append(seconds)
+
+    def snapshot(self):
+        with self._lock:
+            samples = sorted(self.samples)
+            calls = self.calls
+
+            def percentile(fraction):
+                if not samples:
+                    return None
+                return round(samples[min(len(samples) - 1, int(len(samples) * fraction))] * 1000, 1)
+
+            return {
+                "calls": calls,
+                "errors": self.errors,
+                "retries": self.retries,
+                "avg_ms": round(self.total_seconds / calls * 1000, 1) if calls else None,
+                "p50_ms": percentile(0.5),
+                "p95_ms": percentile(0.95),
+                "max_ms": round(self.max_seconds * 1000, 1),
+            }
+
+
+class _UnixConnection(HTTPConnection):
+    def __init__(self, *args, socket_path, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.socket_path = socket_path
+
+    def _new_conn(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if isinstance(self.timeout, (int, float)):
+            sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError:
+            sock.close()
+            raise
+        return sock
+
+
+class _UnixConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _UnixConnection
+
+
+class UnixSocketAdapter(HTTPAdapter):
+    """Transporte ``http+unix://``: un pool keep-alive por socket, igual que el de TCP por host."""
+
+    def __init__(self, pool_maxsize):
+        super().__init__(pool_maxsize=pool_maxsize, max_retries=0)
+        self.unix_pools = {}
+        self._unix_lock = threading.Lock()
+
+    def get_connection_with_tls_context(self, request, verify, proxies=None, cert=None):
+        return self.get_connection(request.url, proxies)
+
+    def get_connection(self, url, proxies=None):
+        socket_path = unquote(urlsplit(url).netloc)
+        with self._unix_lock:
+            pool = self.unix_pools.get(socket_path)
+            if pool is None:
+                pool = _UnixConnectionPool(UNIX_HOST, maxsize=self._pool_maxsize, socket_path=socket_path)
+                self.unix_pools[socket_path] = pool
+            return pool
+
+    def request_url(self, request, proxies):
+        return request.path_url
+
+    def close(self):
+        super().close()
+        with self._unix_lock:
+            for pool in self.unix_pools.values():
+                pool.close()
+            self.unix_pools.clear()
+
+
+class _State:
+    """Sesión, breakers y métricas de un proceso (gunicorn crea los workers con fork)."""
+
+    def __init__(self):
+        self.pid = os.getpid()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=settings.INTERSERVICE_POOL_SIZE,
+            pool_block=False,
+            max_retries=0,
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.adapter = adapter
+        self.unix_adapter = UnixSocketAdapter(settings.INTERSERVICE_POOL_SIZE)
+        self.session.mount(f"{UNIX_SCHEME}://", self.unix_adapter)
+        self.async_sessions = {}
+        self.async_requests = {}
+        self.breakers = {}
+        self.endpoints = {}
+        self.lock = threading.Lock()
+
+    async def async_session(self, socket_path=None):
+        """Sesión aiohttp del event loop actual para TCP (``None``) o para un socket Unix."""
+        loop = asyncio.get_running_loop()
+        # Una sesión no puede usarse desde otro loop: las de loops que ya terminaron se cierran.
+        await self.close_async_sessions(current=False)
+        with self.lock:
+            session = self.async_sessions.get((loop, socket_path))
+            if session is None:
+                limit = settings.INTERSERVICE_ASYNC_MAX_CONNECTIONS
+                if socket_path:
+                    connector = aiohttp.UnixConnector(path=socket_path, limit=limit)
+                else:
+                    connector = aiohttp.TCPConnector(limit=limit)
+                session = aiohttp.ClientSession(connector=connector)
+                self.async_sessions[(loop, socket_path)] = session
+            self.async_requests[socket_path] = self.async_requests.get(socket_path, 0) + 1
+        return session
+
+    async def close_async_sessions(self, current=True):
+        """Cierra las sesiones de loops ya cerrados y, si ``current``, también las del loop actual.
+
+        Las de otros loops aún abiertos (otro hilo) no se tocan: pueden tener peticiones en curso.
+        """
+        loop = asyncio.get_running_loop()
+        with self.lock:
+            keys = [key for key in self.async_sessions if key[0].is_closed() or (current and key[0] is loop)]
+            sessions = [self.async_sessions.pop(key) for key in keys]
+        for session in sessions:
+            # Con el loop de la sesión ya cerrado solo se sueltan las conexiones; no usa ese loop.
+            await session.close()
+
+    def breaker(self, target):
+        with self.lock:
+            if target not in self.breakers:
+                self.breakers[target] = CircuitBreaker(target)
+            return self.breakers[target]
+
+    def stats(self, endpoint):
+        with self.lock:
+            if endpoint not in self.endpoints:
+                self.endpoints[endpoint] = EndpointStats()
+            return self.endpoints[endpoint]
+
+
+_state = None
+_state_lock = threading.Lock()
+
+
+def _current():
+    global _state
+    state = _state
+    if state is None or state.pid != os.getpid():
+        with _state_lock:
+            if _state is None or _state.pid != os.getpid():
+                _state = _State()
+            state = _state
+    return state
+
+
+def _backoff(attempt):
+    return random.uniform(0, settings.INTERSERVICE_RETRY_BACKOFF * 2 ** attempt)
+
+
+def request(method, endpoint, url, *, timeout, retries=None, **kwargs):
+    """Hace la llamada ``method url`` registrada como ``endpoint`` en las métricas.
+
+    ``timeout`` es el tiempo máximo de lectura en segundos. Devuelve la respuesta (también si es
+    un 4xx/5xx) o lanza ``requests.RequestException``; ``CircuitOpenError`` si el circuito hacia
+    el servicio está abierto.
+    """
+    method = method.upper()
+    if retries is None:
+        retries = settings.INTERSERVICE_RETRIES if method in IDEMPOTENT_METHODS else 0
+    state = _current()
+    parts = urlsplit(url)
+    breaker = state.breaker(f"{parts.scheme}://{parts.netloc}")
+    stats = state.stats(endpoint)
+    started = time.perf_counter()
+    attempt = 0
+    failed = True
+    headers = kwargs.pop("headers", None) or {}
+    try:
+        while True:
+            deadlines.check(f"llamar a {endpoint}", reserve=deadlines.FORWARD_MARGIN_SECONDS)
+            breaker.before_call()
+            connect_timeout = deadlines.bounded_timeout(settings.INTERSERVICE_CONNECT_TIMEOUT)
+            read_timeout = deadlines.bounded_timeout(timeout)
+            try:
+                response = state.session.request(
+                    method,
+                    url,
+                    headers={**headers, **deadlines.forward_headers()},
+                    timeout=(connect_timeout, read_timeout),
+                    **kwargs,
+                )
+            except Exception as exc:
+                clipped = connect_timeout < settings.INTERSERVICE_CONNECT_TIMEOUT or read_timeout < timeout
+                if isinstance(exc, requests.Timeout) and clipped:
+                    # El tiempo lo acotó el plazo de la petición, no la lentitud del destino.
+                    breaker.release()
+                    raise deadlines.DeadlineExceeded() from exc
+                breaker.record_failure()
+                if attempt >= retries or not isinstance(exc, requests.RequestException):
+                    raise
+            else:
+                if response.status_code < 500:
+                    breaker.record_success()
+                    failed = False
+                    return response
+                breaker.record_failure()
+                if attempt >= retries or response.status_code not in RETRY_STATUSES:
+                    return response
+                response.close()
+            pause = _backoff(attempt)
+            left = deadlines.remaining()
+            if left is not None and left <= pause:
+                raise deadlines.DeadlineExceeded()
+            time.sleep(pause)
+            attempt += 1
+    finally:
+        stats.record(time.perf_counter() - started, failed, attempt)
+
+
+def _async_target(url):
+    """Socket y URL para aiohttp: ``http+unix://`` se envía como ``http://`` por el socket."""
+    parts = urlsplit(url)
+    if parts.scheme != UNIX_SCHEME:
+        return None, url
+    return unquote(parts.netloc), parts._replace(scheme="http", netloc=UNIX_HOST).geturl()
+
+
+async def _fetch(session, method, url, **kwargs):
+    async with session.request(method, url, **kwargs) as resp:
+        body = await resp.read()
+    response = requests.Response()
+    response.status_code = resp.status
+    response.reason = resp.reason
+    response.url = str(resp.url)
+    response.headers = CaseInsensitiveDict(resp.headers)
+    response.encoding = get_encoding_from_headers(response.headers)
+    response._content = body
+    return response
+
+
+async def arequest(method, endpoint, url, *, timeout, retries=None, **kwargs):
+    """Como ``request`` pero sin bloquear el event loop; también devuelve un ``requests.Response``."""
+    method = method.upper()
+    if retries is None:
+        retries = settings.INTERSERVICE_RETRIES if method in IDEMPOTENT_METHODS else 0
+    state = _current()
+    parts = urlsplit(url)
+    breaker = state.breaker(f"{parts.scheme}://{parts.netloc}")
+    stats = state.stats(endpoint)
+    socket_path, target_url = _async_target(url)
+    started = time.perf_counter()
+    attempt = 0
+    failed = True
+    headers = kwargs.pop("headers", None) or {}
+    try:
+        while True:
+            deadlines.check(f"llamar a {endpoint}", reserve=deadlines.FORWARD_MARGIN_SECONDS)
+            breaker.before_call()
+            connect_timeout = deadlines.bounded_timeout(settings.INTERSERVICE_CONNECT_TIMEOUT)
+            read_timeout = deadlines.bounded_timeout(timeout)
+            try:
+                response = await _fetch(
+                    await state.async_session(socket_path),
+                    method,
+                    target_url,
+                    headers={**headers, **deadlines.forward_headers()},
+                    # ``connect`` incluye la espera por una conexión libre del pool.
+                    timeout=aiohttp.ClientTimeout(
+                        connect=read_timeout, sock_connect=connect_timeout, sock_read=read_timeout
+                    ),
+                    **kwargs,
+                )
+            except Exception as exc:
+                clipped = connect_timeout < settings.INTERSERVICE_CONNECT_TIMEOUT or read_timeout < timeout
+                timed_out = isinstance(exc, asyncio.TimeoutError)
+                if timed_out and clipped:
+                    breaker.release()
+                    raise deadlines.DeadlineExceeded() from exc
+                breaker.record_failure()
+                network_error = timed_out or isinstance(exc, aiohttp.ClientError)
+                if attempt >= retries or not network_error:
+                    if timed_out:
+                        raise requests.Timeout(str(exc) or "Tiempo de espera agotado") from exc
+                    if network_error:
+                        raise requests.ConnectionError(str(exc)) from exc
+                    raise
+            else:
+                if response.status_code < 500:
+                    breaker.record_success()
+                    failed = False
+                    return response
+                breaker.record_failure()
+                if attempt >= retries or response.status_code not in RETRY_STATUSES:
+                    return response
+            pause = _backoff(attempt)
+            left = deadlines.remaining()
+            if left is not None and left <= pause:
+                raise deadlines.DeadlineExceeded()
+            await asyncio.sleep(pause)
+            attempt += 1
+    finally:
+        stats.record(time.perf_counter() - started, failed, attempt)
+
+
+async def aclose():
+    """Cierra las sesiones aiohttp del loop actual; se llama al apagar el servidor ASGI."""
+    state = _state
+    if state is not None and state.pid == os.getpid():
+        await state.close_async_sessions()
+
+
+def get(endpoint, url, *, timeout, **kwargs):
+    return request("GET", endpoint, url, timeout=timeout, **kwargs)
+
+
+def service_headers(service):
+    """Cabecera ``Authorization`` con un token de servicio emitido a nombre de ``service``."""
+    now = int(time.time())
+    payload = {"role": SERVICE_ROLE, "service": service, "iat": now, "exp": now + SERVICE_TOKEN_SECONDS}
+    return {"Authorization": f"Bearer {jwt.encode(payload, settings.JWT_SECRET, algorithm='HS256')}"}
+
+
+def _pools(state):
+    manager = state.adapter.poolmanager
+    for key in list(manager.pools.keys()):
+        pool = manager.pools.get(key)
+        if pool is not None:
+            yield f"{pool.scheme}://{pool.host}:{pool.port}", pool
+    with state.unix_adapter._unix_lock:
+        unix_pools = list(state.unix_adapter.unix_pools.items())
+    for socket_path, pool in unix_pools:
+        yield f"unix:{socket_path}", pool
+
+
+def _async_pool_snapshot(state):
+    pools = []
+    with state.lock:
+        sessions = list(state.async_sessions.items())
+    for (_, socket_path), session in sessions:
+        connector = session.connector
+        if connector is None:
+            continue
+        # aiohttp no expone el estado del pool: ``_conns`` son las conexiones libres por destino y
+        # ``_acquired`` las que están en uso.
+        idle = sum(len(conns) for conns in list(getattr(connector, "_conns", {}).values()))
+        pools.append({
+            "host": f"async:unix:{socket_path}" if socket_path else "async:tcp",
+            "requests": state.async_requests.get(socket_path, 0),
+            "open_connections": idle + len(getattr(connector, "_acquired", ())),
+            "idle": idle,
+        })
+    return pools
+
+
+def _pool_snapshot(state):
+    pools = []
+    for target, pool in _pools(state):
+        pools.append({
+            "host": target,
+            "requests": pool.num_requests,
+            "connections_opened": pool.num_connections,
+            "reused": max(pool.num_requests - pool.num_connections, 0),
+            # La cola se llena con ``None`` al crear el pool; solo cuentan las conexiones reales.
+            "idle": sum(conn is not None for conn in list(pool.pool.queue)) if pool.pool is not None else 0,
+        })
+    return pools
+
+
+def metrics():
+    """Métricas del proceso actual: latencia por endpoint, reuso del pool y estado de los breakers."""
+    state = _current()
+    with state.lock:
+        endpoints = dict(state.endpoints)
+        breakers = dict(state.breakers)
+    return {
+        "pid": state.pid,
+        "endpoints": {name: stats.snapshot() for name, stats in sorted(endpoints.items())},
+        "pools": _pool_snapshot(state) + _async_pool_snapshot(state),
+        "breakers": {name: breaker.snapshot() for name, breaker in sorted(breakers.items())},
+    }
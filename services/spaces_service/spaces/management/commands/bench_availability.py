@@ -0,0 +1,191 @@
+import asyncio
+import multiprocessing
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from urllib.request import urlopen
+
+import jwt
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from spaces import interservice
+from spaces.models import Space
+
+try:
+    import aiohttp
+except ImportError:  # dependencia opcional (modo ASGI)
+    aiohttp = None
+
+STUB_BODY = b'{"space_id": 0, "busy": []}'
+TOKEN_SECONDS = 3600
+
+
+def _auth_headers():
+    # Los tokens de ``interservice.service_headers`` vencen antes de que termine una medición larga.
+    now = int(time.time())
+    payload = {"role": interservice.SERVICE_ROLE, "service": "bench", "iat": now, "exp": now + TOKEN_SECONDS}
+    return {"Authorization": f"Bearer {jwt.encode(payload, settings.JWT_SECRET, algorithm='HS256')}"}
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _serve_stub(sock, delay):
+    response = (
+        b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nContent-Length: %d\r\n\r\n%s"
+        % (len(STUB_BODY), STUB_BODY)
+    )
+
+    async def handle(reader, writer):
+        try:
+            while True:
+                await reader.readuntil(b"\r\n\r\n")
+                await asyncio.sleep(delay)
+                writer.write(response)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve():
+        server = await asyncio.start_server(handle, sock=sock, backlog=1024)
+        async with server:
+            await server.serve_forever()
+
+    asyncio.run(serve())
+
+
+def _start_stub(delay):
+    """reservations-service simulado: responde ``/busy/`` tras ``delay`` segundos.
+
+    Corre en otro proceso para no competir por el GIL con el generador de carga.
+    """
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    # Escucha desde ya: el proceso hijo puede tardar en arrancar su loop.
+    sock.listen(1024)
+    stub = multiprocessing.get_context("fork").Process(target=_serve_stub, args=(sock, delay), daemon=True)
+    stub.start()
+    return stub, sock.getsockname()[1]
+
+
+async def _load(url, headers, total, concurrency):
+    """Lanza ``total`` peticiones con ``concurrency`` en curso; devuelve latencias (s), errores y duración."""
+    latencies, errors = [], 0
+    pending = iter(range(total))
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    timeout = aiohttp.ClientTimeout(total=60.0)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout, headers=headers) as session:
+
+        async def worker():
+            nonlocal errors
+            for _ in pending:
+                started = time.perf_counter()
+                try:
+                    async with session.get(url) as resp:
+                        await resp.read()
+                except (aiohttp.ClientError, asyncio.TimeoutError):
+                    errors += 1
+                    continue
+                if resp.status == 200:
+                    latencies.append(time.perf_counter() - started)
+                else:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return latencies, errors, time.perf_counter() - started
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara la disponibilidad de espacios servida por gunicorn síncrono (WSGI) y por uvicorn (ASGI, vista "
+        "asíncrona) contra un reservations-service simulado con latencia fija"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=2000, help="Peticiones por modo")
+        parser.add_argument("--concurrency", type=int, nargs="+", default=[50, 200], help="Peticiones en curso")
+        parser.add_argument("--delay-ms", type=float, default=50.0, help="Latencia de reservations-service")
+        parser.add_argument("--workers", type=int, default=2, help="Procesos de gunicorn en ambos modos")
+        parser.add_argument("--threads", type=int, default=2, help="Hilos por proceso en modo WSGI")
+        parser.add_argument("--modes", nargs="+", choices=("wsgi", "asgi"), default=["wsgi", "asgi"])
+
+    def handle(self, *args, **options):
+        if aiohttp is None:
+            raise CommandError("El benchmark necesita aiohttp (ver requirements.txt)")
+        stub, stub_port = _start_stub(options["delay_ms"] / 1000)
+        space = Space.objects.order_by("id").first()
+        created = space is None
+        if created:
+            space = Space.objects.create(name="Espacio de prueba (bench_availability)")
+        headers = _auth_headers()
+        try:
+            for mode in options["modes"]:
+                port = _free_port()
+                server = self._start_server(mode, port, stub_port, options)
+                try:
+                    self._wait_ready(server, port)
+                    url = f"http://127.0.0.1:{port}/api/spaces/{space.id}/availability/"
+                    # Calentamiento: conexiones, imports perezosos y pools de cada worker.
+                    asyncio.run(_load(url, headers, options["workers"] * 20, options["workers"] * 4))
+                    for concurrency in options["concurrency"]:
+                        latencies, errors, elapsed = asyncio.run(
+                            _load(url, headers, options["requests"], concurrency)
+                        )
+                        self._report(mode, concurrency, latencies, errors, elapsed)
+                finally:
+                    server.terminate()
+                    server.wait(timeout=30)
+        finally:
+            stub.terminate()
+            if created:
+                space.delete()
+
+    def _start_server(self, mode, port, stub_port, options):
+        env = dict(
+            os.environ,
+            RESERVATIONS_BASE_URL=f"http://127.0.0.1:{stub_port}/api",
+            ASGI_MODE="true" if mode == "asgi" else "false",
+        )
+        command = [sys.executable, "-m", "gunicorn", "--bind", f"127.0.0.1:{port}", "--workers", str(options["workers"])]
+        if mode == "asgi":
+            command += ["spaces_service.asgi:application", "-k", "uvicorn.workers.UvicornWorker"]
+        else:
+            command += ["spaces_service.wsgi:application", "--threads", str(options["threads"])]
+        return subprocess.Popen(
+            command, cwd=settings.BASE_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+
+    def _wait_ready(self, server, port, timeout=30.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if server.poll() is not None:
+                raise CommandError(f"gunicorn terminó al arrancar (código {server.returncode})")
+            try:
+                with urlopen(f"http://127.0.0.1:{port}/api/spaces/health/", timeout=1.0):
+                    return
+            except OSError:
+                pass
+            time.sleep(0.2)
+        raise CommandError(f"gunicorn no respondió en {timeout:.0f} s")
+
+    def _report(self, mode, concurrency, latencies, errors, elapsed):
+        if not latencies:
+            self.stdout.write(self.style.ERROR(f"{mode.upper()} c={concurrency}: todas las peticiones fallaron"))
+            return
+        latencies.sort()
+        p95 = latencies[min(int(len(latencies) * 0.95), len(latencies) - 1)]
+        self.stdout.write(self.style.SUCCESS(
+            f"{mode.upper():>4} c={concurrency:<4} {len(latencies):>6} ok, {errors:>4} errores | "
+            f"{len(latencies) / elapsed:8.1f} req/s | p50 {statistics.median(latencies) * 1000:7.1f} ms | "
+            f"p95 {p95 * 1000:7.1f} ms | máx {latencies[-1] * 1000:7.1f} ms"
+        ))
@@ -0,0 +1,135 @@
+"""Paginación keyset (por cursor) para listados grandes."""
+import base64
+import binascii
+import json
+from functools import reduce
+from operator import or_
+
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+def _split_ordering(ordering):
+    return [(name.lstrip("-"), name.startswith("-")) for name in ordering]
+
+
+def keyset_filter(ordering, position):
+    """``(f1, f2, ...) > (v1, v2, ...)`` respetando la dirección de cada columna."""
+    clauses = []
+    fields = _split_ordering(ordering)
+    for depth, (name, descending) in enumerate(fields):
+        lookup = f"{name}__lt" if descending else f"{name}__gt"
+        equal = {prev_name: position[prev_name] for prev_name, _ in fields[:depth]}
+        clauses.append(Q(**equal, **{lookup: position[name]}))
+    return reduce(or_, clauses)
+
+
+def keyset_position(ordering, row):
+    if isinstance(row, dict):
+        return {name: row[name] for name, _ in _split_ordering(ordering)}
+    return {name: getattr(row, name) for name, _ in _split_ordering(ordering)}
+
+
+class KeysetPagination(BasePagination):
+    """Paginación por cursor opaco sobre columnas indexadas (keyset), sin OFFSET.
+
+    El orden se toma de ``keyset_ordering`` en la vista (por defecto ``id``); el
+    cursor codifica los valores de la última fila entregada y la página siguiente se obtiene con
+    ``WHERE (a, b) < (x, y)`` expandido en ``Q``. Con ``?paginate=false`` la vista responde con la
+    lista completa de siempre, para clientes antiguos.
+    """
+
+    ordering = ("id",)
+    page_size_query_param = "page_size"
+    cursor_query_param = "cursor"
+    legacy_query_param = "paginate"
+    invalid_cursor_message = "Cursor inválido"
+
+    def is_disabled(self, request):
+        return request.query_params.get(self.legacy_query_param, "").lower() in ("false", "0", "no")
+
+    def get_page_size(self, request):
+        default = getattr(settings, "API_PAGE_SIZE", 100)
+        maximum = getattr(settings, "API_MAX_PAGE_SIZE", 1000)
+        raw = request.query_params.get(self.page_size_query_param)
+        try:
+            value = int(raw) if raw else default
+        except ValueError:
+            value = default
+        return max(1, min(value, maximum))
+
+    def get_ordering(self, view):
+        return tuple(getattr(view, "keyset_ordering", None) or self.ordering)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.is_disabled(request):
+            return None
+        self.request = request
+        self.ordering = self.get_ordering(view)
+        self.page_size = self.get_page_size(request)
+        self.model = queryset.model
+        queryset = queryset.order_by(*self.ordering)
+
+        position = self.decode_cursor(request)
+        if position is not None:
+            queryset = queryset.filter(keyset_filter(self.ordering, position))
+
+        rows = list(queryset[: self.page_size + 1])
+        self.has_next = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        self.next_position = self._position(rows[-1]) if self.has_next else None
+        return rows
+
+    def _fields(self):
+        return _split_ordering(self.ordering)
+
+    def _position(self, row):
+        return keyset_position(self.ordering, row)
+
+    def encode_cursor(self, position):
+        values = [
+            value.isoformat() if hasattr(value, "isoformat") else value
+            for value in (position[name] for name, _ in self._fields())
+        ]
+        raw = json.dumps(values, separators=(",", ":")).encode("utf-8")
+        return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            raw = base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4))
+            values = json.loads(raw.decode("utf-8"))
+            fields = self._fields()
+            if not isinstance(values, list) or len(values) != len(fields):
+                raise ValueError
+            return {
+                name: self.model._meta.get_field(name).to_python(value)
+                for (name, _), value in zip(fields, values)
+            }
+        except (TypeError, ValueError, UnicodeDecodeError, binascii.Error, DjangoValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.next_position))
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
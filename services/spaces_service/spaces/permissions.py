@@ -5,3 +5,9 @@ class IsAdminRole(BasePermission):
     def has_permission(self, request, view):
         return bool(getattr(request.user, 'role', '').upper() == 'ADMIN')
 
+
+class IsServiceRole(BasePermission):
+    """Llamadas de otro servicio con un token de ``interservice.service_headers``."""
+
+    def has_permission(self, request, view):
+        return (getattr(request.user, 'role', None) or '').upper() == 'SERVICE'
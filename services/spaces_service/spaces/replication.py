@@ -0,0 +1,60 @@
+"""Avisos a reservations-service cuando cambia el catálogo de espacios.
+
+reservations-service valida y copia los datos del espacio en cada reserva desde una réplica local
+(``reservations.space_replica``). Crear, editar o borrar un espacio le envía el cambio cuando la
+transacción se confirma. Un aviso que falla solo se registra en el log: reservations-service deja
+de usar las copias viejas pasado ``SPACE_REPLICA_MAX_AGE_SECONDS`` y su sincronización periódica
+(``GET /spaces/replica/``) corrige lo que haya quedado desactualizado.
+"""
+import logging
+
+import requests
+from django.conf import settings
+from django.db import transaction
+
+from spaces import deadlines, interservice
+
+logger = logging.getLogger(__name__)
+
+REPLICA_FIELDS = ("id", "name", "description", "location", "is_active", "updated_at")
+
+
+def replica_data(space):
+    return {
+        "id": space.id,
+        "name": space.name,
+        "description": space.description,
+        "location": space.location,
+        "is_active": space.is_active,
+        "updated_at": space.updated_at.isoformat() if space.updated_at else None,
+    }
+
+
+def _send(event, data):
+    try:
+        resp = interservice.request(
+            "POST",
+            "reservations.space_replica",
+            f"{settings.RESERVATIONS_BASE_URL}/reservations/space-replica/",
+            json={"event": event, "space": data},
+            headers=interservice.service_headers("spaces"),
+            timeout=settings.SPACE_REPLICA_NOTIFY_TIMEOUT,
+        )
+    except (requests.RequestException, deadlines.DeadlineExceeded):
+        logger.warning(
+            "No se pudo avisar a reservations-service del cambio en el espacio %s", data["id"], exc_info=True
+        )
+        return
+    if resp.status_code >= 300:
+        logger.warning(
+            "reservations-service rechazó el aviso del espacio %s (HTTP %s)", data["id"], resp.status_code
+        )
+
+
+def notify_changed(space):
+    data = replica_data(space)
+    transaction.on_commit(lambda: _send("upsert", data))
+
+
+def notify_deleted(space_id):
+    transaction.on_commit(lambda: _send("delete", {"id": space_id}))
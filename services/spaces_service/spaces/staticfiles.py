@@ -0,0 +1,50 @@
+"""WhiteNoise bajo WSGI y ASGI.
+
+``whitenoise.middleware.WhiteNoiseMiddleware`` (6.6) solo es síncrono: en una pila ASGI Django lo
+adapta con ``sync_to_async`` y cada petición, sea o no un estático, pasaría por el hilo de
+sincronía. Esta subclase conserva su configuración (``WHITENOISE_*``, archivos comprimidos y
+nombres con hash de ``CompressedManifestStaticFilesStorage``) y además atiende en modo asíncrono:
+la búsqueda del archivo es un diccionario en memoria y el contenido se entrega con un iterador
+asíncrono, así que Django no tiene que leerlo entero en un hilo.
+"""
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from whitenoise.middleware import WhiteNoiseMiddleware as BaseWhiteNoiseMiddleware
+
+
+async def _read_blocks(filelike, block_size):
+    # El archivo lo cierra la respuesta (quedó registrado al crearla).
+    while True:
+        block = filelike.read(block_size)
+        if not block:
+            return
+        yield block
+
+
+class WhiteNoiseMiddleware(BaseWhiteNoiseMiddleware):
+    """``WhiteNoiseMiddleware`` que funciona igual bajo WSGI y ASGI (sin pasar por un hilo)."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, *args, **kwargs):
+        super().__init__(get_response, *args, **kwargs)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            # Solo en desarrollo (DEBUG): busca en disco en cada petición.
+            static_file = self.find_file(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is None:
+            return await self.get_response(request)
+        response = self.serve(static_file, request)
+        if response.file_to_stream is not None:
+            response.streaming_content = _read_blocks(response.file_to_stream, response.block_size)
+        return response
@@ -0,0 +1,97 @@
+import asyncio
+import time
+from unittest import mock
+
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from spaces import deadlines
+
+
+@override_settings(REQUEST_DEADLINE_SECONDS=30)
+class DeadlineMiddlewareTests(SimpleTestCase):
+    """El plazo sale de la cabecera, acotado por ``REQUEST_DEADLINE_SECONDS``, y solo vive durante la petición."""
+
+    def remaining_during(self, **headers):
+        seen = {}
+
+        def view(request):
+            seen["remaining"] = deadlines.remaining()
+            return HttpResponse("ok")
+
+        response = deadlines.DeadlineMiddleware(view)(RequestFactory().get("/", headers=headers))
+        return response, seen.get("remaining")
+
+    def test_header_budget_is_used_when_below_limit(self):
+        response, left = self.remaining_during(**{deadlines.HEADER: "2000"})
+        self.assertEqual(response.status_code, 200)
+        self.assertAlmostEqual(left, 2, delta=0.1)
+
+    def test_header_budget_is_clipped_to_limit(self):
+        _, left = self.remaining_during(**{deadlines.HEADER: "600000"})
+        self.assertAlmostEqual(left, 30, delta=0.1)
+
+    def test_missing_or_invalid_header_uses_limit(self):
+        for headers in ({}, {deadlines.HEADER: "pronto"}):
+            _, left = self.remaining_during(**headers)
+            self.assertAlmostEqual(left, 30, delta=0.1)
+
+    def test_spent_budget_answers_504_without_calling_view(self):
+        for value in ("0", "-5"):
+            response, left = self.remaining_during(**{deadlines.HEADER: value})
+            self.assertEqual(response.status_code, 504)
+            self.assertIsNone(left)
+
+    @override_settings(REQUEST_DEADLINE_SECONDS=0)
+    def test_disabled_sets_no_deadline(self):
+        response, left = self.remaining_during(**{deadlines.HEADER: "2000"})
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(left)
+
+    def test_deadline_is_reset_after_request(self):
+        self.remaining_during(**{deadlines.HEADER: "2000"})
+        self.assertIsNone(deadlines.remaining())
+
+    def test_async_path_sets_the_same_budget(self):
+        seen = {}
+
+        async def view(request):
+            seen["remaining"] = deadlines.remaining()
+            return HttpResponse("ok")
+
+        middleware = deadlines.DeadlineMiddleware(view)
+        request = RequestFactory().get("/", headers={deadlines.HEADER: "600000"})
+        response = asyncio.run(middleware(request))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertAlmostEqual(seen["remaining"], 30, delta=0.1)
+
+
+class DeadlineHelpersTests(SimpleTestCase):
+    """Lo que se reenvía y los timeouts se recortan a lo que queda del plazo."""
+
+    def with_deadline(self, seconds):
+        token = deadlines._deadline.set(time.monotonic() + seconds)
+        self.addCleanup(deadlines._deadline.reset, token)
+
+    def test_forward_headers_subtract_margin(self):
+        self.with_deadline(1)
+        forwarded = int(deadlines.forward_headers()[deadlines.HEADER])
+        self.assertLessEqual(forwarded, 1000 - deadlines.FORWARD_MARGIN_SECONDS * 1000)
+        self.assertGreater(forwarded, 900)
+
+    def test_bounded_timeout_never_exceeds_remaining(self):
+        self.with_deadline(1)
+        self.assertLess(deadlines.bounded_timeout(10), 1)
+        self.assertEqual(deadlines.bounded_timeout(0.2), 0.2)
+
+    def test_check_raises_once_spent(self):
+        self.with_deadline(0.01)
+        with mock.patch.object(deadlines.time, "monotonic", return_value=time.monotonic() + 1):
+            with self.assertRaises(deadlines.DeadlineExceeded):
+                deadlines.check("generar el reporte")
+
+    def test_outside_a_request_there_is_no_deadline(self):
+        self.assertEqual(deadlines.forward_headers(), {})
+        self.assertEqual(deadlines.bounded_timeout(5), 5)
+        deadlines.check()
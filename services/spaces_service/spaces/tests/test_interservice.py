@@ -0,0 +1,88 @@
+import asyncio
+import os
+import tempfile
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from spaces import interservice
+
+
+async def _reply_ok(reader, writer):
+    await reader.readuntil(b"\r\n\r\n")
+    body = b'{"ok": true}'
+    writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nContent-Length: %d\r\n\r\n%s" % (len(body), body))
+    await writer.drain()
+    writer.close()
+
+
+class AsyncSessionTests(SimpleTestCase):
+    """Las sesiones aiohttp se cierran al cambiar de loop y al apagar el servidor ASGI."""
+
+    def setUp(self):
+        interservice._state = None
+        self.state = interservice._current()
+
+    def tearDown(self):
+        # Las sesiones que queden son de loops ya cerrados; se sueltan para no dejar avisos.
+        asyncio.run(self.state.close_async_sessions(current=False))
+        interservice._state = None
+
+    def test_loop_change_closes_previous_sessions(self):
+        first = asyncio.run(self.state.async_session())
+        self.assertFalse(first.closed)
+
+        second = asyncio.run(self.state.async_session())
+
+        self.assertTrue(first.closed)
+        self.assertIsNot(second, first)
+        self.assertEqual(list(self.state.async_sessions.values()), [second])
+
+    def test_aclose_closes_current_loop_sessions(self):
+        async def scenario():
+            sessions = [await self.state.async_session(), await self.state.async_session("/tmp/otro.sock")]
+            await interservice.aclose()
+            return sessions
+
+        sessions = asyncio.run(scenario())
+
+        self.assertTrue(all(session.closed for session in sessions))
+        self.assertEqual(self.state.async_sessions, {})
+
+    def test_lifespan_shutdown_closes_sessions(self):
+        with mock.patch.dict(os.environ):
+            from spaces_service.asgi import application
+
+        messages = [{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}]
+        sent = []
+
+        async def receive():
+            return messages.pop(0)
+
+        async def send(message):
+            sent.append(message["type"])
+
+        async def scenario():
+            session = await self.state.async_session()
+            await application({"type": "lifespan"}, receive, send)
+            return session
+
+        self.assertTrue(asyncio.run(scenario()).closed)
+        self.assertEqual(sent, ["lifespan.startup.complete", "lifespan.shutdown.complete"])
+
+    def test_arequest_over_unix_socket(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "reservas.sock")
+
+            async def scenario():
+                server = await asyncio.start_unix_server(_reply_ok, path=path)
+                async with server:
+                    url = f"{interservice.UNIX_SCHEME}://{path.replace('/', '%2F')}/api/ping/"
+                    response = await interservice.arequest("GET", "ping", url, timeout=2)
+                    await interservice.aclose()
+                return response
+
+            response = asyncio.run(scenario())
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"ok": True})
@@ -0,0 +1,35 @@
+import base64
+
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from spaces.authentication import StatelessUser
+from spaces.models import Space
+
+TEACHER = StatelessUser(user_id=2, email="teacher@example.com", role="TEACHER")
+
+
+class KeysetPaginationTests(TestCase):
+    """El catálogo se recorre por cursor sin repetir ni saltar espacios."""
+
+    def setUp(self):
+        Space.objects.bulk_create(Space(name=f"Sala {number}") for number in range(7))
+        self.client = APIClient()
+        self.client.force_authenticate(TEACHER)
+
+    def test_pages_cover_every_space_once_in_order(self):
+        url = "/api/spaces/?page_size=3"
+        seen = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            seen.extend(row["id"] for row in response.data["results"])
+            url = response.data["next"]
+
+        self.assertEqual(seen, list(Space.objects.order_by("id").values_list("id", flat=True)))
+
+    def test_invalid_cursor_is_not_found(self):
+        wrong_length = base64.urlsafe_b64encode(b"[1, 2]").decode("ascii")
+        for cursor in ("%%%", wrong_length):
+            response = self.client.get("/api/spaces/", {"cursor": cursor})
+            self.assertEqual(response.status_code, 404, cursor)
@@ -0,0 +1,47 @@
+import tempfile
+
+from django.core.management import call_command
+from django.test import AsyncClient, Client, SimpleTestCase, override_settings
+
+
+class StaticFilesTests(SimpleTestCase):
+    """WhiteNoise sirve los estáticos comprimidos y con hash igual bajo WSGI y ASGI."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.root = tempfile.TemporaryDirectory()
+        cls.settings_override = override_settings(
+            STATIC_ROOT=cls.root.name,
+            STATICFILES_STORAGE="whitenoise.storage.CompressedManifestStaticFilesStorage",
+        )
+        cls.settings_override.enable()
+        call_command("collectstatic", interactive=False, verbosity=0)
+        from django.contrib.staticfiles.storage import staticfiles_storage
+
+        cls.url = staticfiles_storage.url("admin/css/base.css")
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.settings_override.disable()
+        cls.root.cleanup()
+        super().tearDownClass()
+
+    def test_manifest_names_are_hashed(self):
+        self.assertRegex(self.url, r"/static/admin/css/base\.[0-9a-f]{12}\.css$")
+
+    def test_wsgi_serves_compressed_variant(self):
+        response = Client().get(self.url, HTTP_ACCEPT_ENCODING="gzip")
+        self.addCleanup(response.close)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("immutable", response["Cache-Control"])
+
+    async def test_asgi_serves_without_sync_iterator(self):
+        response = await AsyncClient().get(self.url)
+        self.addCleanup(response.close)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_async)
+        body = b"".join([part async for part in response])
+        self.assertEqual(len(body), int(response["Content-Length"]))
+        self.assertIn("immutable", response["Cache-Control"])
@@ -2,18 +2,23 @@ from datetime import timedelta
 
 import requests
 from django.conf import settings
+from django.http import HttpResponse, JsonResponse
 from django.utils import timezone
 from django.utils.dateparse import parse_datetime
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import OpenApiParameter, extend_schema, extend_schema_view
-from rest_framework import status, viewsets
+from rest_framework import exceptions, status, viewsets
 from rest_framework.permissions import IsAuthenticated, AllowAny, SAFE_METHODS
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from spaces import deadlines, interservice, replication
+from spaces.authentication import JWTStatelessAuthentication
+from spaces.conditional import conditional_response, make_etag, queryset_version
 from spaces.models import Space
-from spaces.permissions import IsAdminRole
+from spaces.pagination import KeysetPagination
+from spaces.permissions import IsAdminRole, IsServiceRole
 from spaces.serializers import SpaceAvailabilitySerializer, SpaceSerializer
 
 
@@ -24,6 +29,22 @@ class HealthCheckView(APIView):
         return Response({'status': 'ok', 'service': 'spaces'})
 
 
+@extend_schema(
+    tags=["Salud"],
+    summary="Métricas del cliente entre servicios",
+    description=(
+        "Latencia por endpoint, reuso de conexiones y estado del circuit breaker de las llamadas "
+        "a reservations-service. Los valores son del proceso que atiende la petición (cada worker de gunicorn "
+        "lleva los suyos). Requiere rol ADMIN."
+    ),
+)
+class InterserviceMetricsView(APIView):
+    permission_classes = [IsAuthenticated, IsAdminRole]
+
+    def get(self, request):
+        return Response(interservice.metrics())
+
+
 def _parse_datetime(value):
     dt = parse_datetime(value)
     if not dt:
@@ -33,14 +54,38 @@ def _parse_datetime(value):
     return dt
 
 
+def _availability_window(params):
+    """Rango pedido (por defecto desde ahora y 30 días); lanza ``ValueError`` si no es válido."""
+    now = timezone.now()
+    start_param = params.get("start")
+    end_param = params.get("end")
+    start_dt = _parse_datetime(start_param) if start_param else now
+    end_dt = _parse_datetime(end_param) if end_param else now + timedelta(days=30)
+    if not start_dt or not end_dt:
+        raise ValueError("Invalid start or end")
+    if start_dt >= end_dt:
+        raise ValueError("La fecha de inicio debe ser anterior a la fecha fin")
+    return start_dt, end_dt
+
+
+def _busy_params(space_id, start_dt, end_dt):
+    return {"space_id": space_id, "start": start_dt.isoformat(), "end": end_dt.isoformat()}
+
+
 @extend_schema_view(
     list=extend_schema(
         tags=["Espacios (Teacher)"],
         summary="Listar espacios",
-        description="Todos los usuarios autenticados ven todos los espacios (activos e inactivos).",
+        description=(
+            "Todos los usuarios autenticados ven todos los espacios (activos e inactivos). "
+            "Respuesta paginada por cursor ({next, results}); con ?paginate=false devuelve la lista completa. "
+            "Devuelve ETag; con If-None-Match responde 304 si el catálogo no cambió."
+        ),
     ),
     retrieve=extend_schema(
-        tags=["Espacios (Teacher)"], summary="Detalle de espacio", description="Visible para cualquier rol autenticado."
+        tags=["Espacios (Teacher)"],
+        summary="Detalle de espacio",
+        description="Visible para cualquier rol autenticado. Devuelve ETag; admite If-None-Match (304).",
     ),
     availability=extend_schema(
         tags=["Espacios (Teacher)"],
@@ -70,39 +115,76 @@ def _parse_datetime(value):
         summary="Eliminar espacio",
         description="Borra el espacio; requiere rol ADMIN.",
     ),
+    replica=extend_schema(
+        tags=["Espacios (Servicio)"],
+        summary="Catálogo completo para la réplica de reservas",
+        description=(
+            "Todos los espacios con los campos que reservations-service copia en su réplica local, "
+            "sin paginar. Lo usa su sincronización periódica; requiere un token de servicio o rol ADMIN."
+        ),
+    ),
 )
 class SpaceViewSet(viewsets.ModelViewSet):
     serializer_class = SpaceSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    keyset_ordering = ("id",)
 
     def get_queryset(self):
         return Space.objects.all()
 
+    def list(self, request, *args, **kwargs):
+        etag = make_etag(request, *queryset_version(self.get_queryset()))
+        build = super().list
+        return conditional_response(request, etag, lambda: build(request, *args, **kwargs))
+
+    def retrieve(self, request, *args, **kwargs):
+        pk = str(kwargs.get("pk", ""))
+        updated_at = self.get_queryset().filter(pk=pk).values_list("updated_at", flat=True).first() if pk.isdigit() else None
+        if updated_at is None:
+            return super().retrieve(request, *args, **kwargs)
+        etag = make_etag(request, updated_at)
+        build = super().retrieve
+        return conditional_response(request, etag, lambda: build(request, *args, **kwargs))
+
     def get_permissions(self):
+        if self.action == "replica":
+            return [IsAuthenticated(), (IsServiceRole | IsAdminRole)()]
         if self.request.method in SAFE_METHODS:
             return [IsAuthenticated()]
         return [IsAuthenticated(), IsAdminRole()]
 
+    def perform_create(self, serializer):
+        replication.notify_changed(serializer.save())
+
+    def perform_update(self, serializer):
+        replication.notify_changed(serializer.save())
+
+    def perform_destroy(self, instance):
+        space_id = instance.id
+        instance.delete()
+        replication.notify_deleted(space_id)
+
+    @action(detail=False, methods=["get"], url_path="replica")
+    def replica(self, request):
+        rows = self.get_queryset().order_by("id").values(*replication.REPLICA_FIELDS)
+        return Response({"as_of": timezone.now(), "results": list(rows)})
+
     @action(detail=True, methods=["get"], url_path="availability")
     def availability(self, request, pk=None):
         space = self.get_object()
-        start_param = request.query_params.get("start")
-        end_param = request.query_params.get("end")
-        now = timezone.now()
-        default_end = now + timedelta(days=30)
-        start_dt = _parse_datetime(start_param) if start_param else now
-        end_dt = _parse_datetime(end_param) if end_param else default_end
-        if not start_dt or not end_dt:
-            return Response({"detail": "Invalid start or end"}, status=status.HTTP_400_BAD_REQUEST)
-        if start_dt >= end_dt:
-            return Response({"detail": "La fecha de inicio debe ser anterior a la fecha fin"}, status=400)
+        try:
+            start_dt, end_dt = _availability_window(request.query_params)
+        except ValueError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
 
         try:
-            resp = requests.get(
+            resp = interservice.get(
+                "reservations.busy",
                 f"{settings.RESERVATIONS_BASE_URL}/reservations/busy/",
-                params={"space_id": space.id, "start": start_dt.isoformat(), "end": end_dt.isoformat()},
+                params=_busy_params(space.id, start_dt, end_dt),
                 headers={"Authorization": request.headers.get("Authorization", "")},
-                timeout=5,
+                timeout=settings.RESERVATIONS_BUSY_TIMEOUT,
             )
             if resp.status_code != 200:
                 return Response({"detail": "No se pudo consultar disponibilidad"}, status=502)
@@ -111,3 +193,45 @@ class SpaceViewSet(viewsets.ModelViewSet):
         except requests.RequestException:
             return Response({"detail": "Error consultando reservas"}, status=502)
 
+
+async def space_availability(request, pk):
+    """``SpaceViewSet.availability`` sin bloquear un hilo, para el modo ASGI (ver ``spaces_service.asgi``).
+
+    DRF no tiene vistas asíncronas, así que autenticación, permisos y errores se resuelven aquí con
+    las mismas clases y mensajes. Mientras espera a reservations-service la petición solo ocupa
+    una corrutina: miles de consultas en curso comparten el event loop del worker.
+    """
+    if request.method != "GET":
+        exc = exceptions.MethodNotAllowed(request.method)
+        return JsonResponse({"detail": exc.detail}, status=exc.status_code)
+    try:
+        authenticated = JWTStatelessAuthentication().authenticate(request)
+    except exceptions.AuthenticationFailed as exc:
+        # Sin ``authenticate_header`` DRF responde 403 también a las credenciales inválidas.
+        return JsonResponse({"detail": exc.detail}, status=status.HTTP_403_FORBIDDEN)
+    if authenticated is None:
+        return JsonResponse({"detail": exceptions.NotAuthenticated.default_detail}, status=status.HTTP_403_FORBIDDEN)
+    if not await Space.objects.filter(pk=pk).aexists():
+        return JsonResponse({"detail": exceptions.NotFound.default_detail}, status=status.HTTP_404_NOT_FOUND)
+    try:
+        start_dt, end_dt = _availability_window(request.GET)
+    except ValueError as exc:
+        return JsonResponse({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        resp = await interservice.arequest(
+            "GET",
+            "reservations.busy",
+            f"{settings.RESERVATIONS_BASE_URL}/reservations/busy/",
+            params=_busy_params(pk, start_dt, end_dt),
+            headers={"Authorization": request.headers.get("Authorization", "")},
+            timeout=settings.RESERVATIONS_BUSY_TIMEOUT,
+        )
+    except requests.RequestException:
+        return JsonResponse({"detail": "Error consultando reservas"}, status=502)
+    except deadlines.DeadlineExceeded as exc:
+        return JsonResponse({"detail": exc.detail}, status=exc.status_code)
+    if resp.status_code != 200:
+        return JsonResponse({"detail": "No se pudo consultar disponibilidad"}, status=502)
+    # El cuerpo ya es el JSON de la respuesta: se reenvía sin decodificarlo.
+    return HttpResponse(resp.content, content_type="application/json")
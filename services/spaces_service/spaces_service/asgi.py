@@ -1,7 +1,43 @@
-﻿import os
+﻿"""Punto de entrada ASGI de spaces-service.
+
+Activa ``ASGI_MODE``: la disponibilidad de un espacio (``spaces.views.space_availability``) se
+atiende con una vista asíncrona que espera a reservations-service sin ocupar un hilo. Se sirve
+con::
+
+    gunicorn spaces_service.asgi:application -k uvicorn.workers.UvicornWorker --workers 2
+
+El resto de las vistas son de DRF y siguen siendo síncronas: Django las ejecuta con
+``sync_to_async(thread_sensitive=True)``, es decir, en un único hilo por proceso y de a una. Con
+``--workers 2`` solo dos peticiones síncronas avanzan a la vez (bajo WSGI son workers × threads).
+Si ese tráfico pesa, sube ``--workers`` o deja la disponibilidad en este proceso y el resto de
+``/api/spaces/`` en el gunicorn WSGI.
+
+Los estáticos los sirve ``spaces.staticfiles.WhiteNoiseMiddleware``, que atiende en modo
+asíncrono, con los mismos archivos comprimidos y con hash que bajo WSGI.
+
+Django no implementa el protocolo ``lifespan``; ``application`` lo atiende antes de pasarle el
+resto de los mensajes y, al apagar el worker, cierra las sesiones aiohttp de ``interservice``.
+"""
+import os
+
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'spaces_service.settings')
+os.environ.setdefault('ASGI_MODE', 'true')
+
+django_application = get_asgi_application()
+
+from spaces import interservice  # noqa: E402  (necesita Django ya configurado)
 
-application = get_asgi_application()
 
+async def application(scope, receive, send):
+    if scope['type'] != 'lifespan':
+        return await django_application(scope, receive, send)
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await interservice.aclose()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
@@ -18,8 +18,21 @@ env = environ.Env(
     TIME_ZONE=(str, 'America/Bogota'),
     CORS_ALLOWED_ORIGINS=(list, ['http://localhost:3000', 'http://localhost:8080', 'http://localhost:3001']),
     JWT_SECRET=(str, 'change-jwt-secret'),
+    REQUEST_DEADLINE_SECONDS=(int, 60),
     RESERVATIONS_BASE_URL=(str, 'http://reservations:8000/api'),
+    RESERVATIONS_BUSY_TIMEOUT=(float, 4.0),
+    SPACE_REPLICA_NOTIFY_TIMEOUT=(float, 2.0),
+    INTERSERVICE_POOL_SIZE=(int, 10),
+    INTERSERVICE_CONNECT_TIMEOUT=(float, 1.0),
+    INTERSERVICE_RETRIES=(int, 2),
+    INTERSERVICE_RETRY_BACKOFF=(float, 0.1),
+    INTERSERVICE_BREAKER_THRESHOLD=(int, 5),
+    INTERSERVICE_BREAKER_RESET_SECONDS=(float, 30.0),
+    INTERSERVICE_ASYNC_MAX_CONNECTIONS=(int, 100),
+    API_PAGE_SIZE=(int, 100),
+    API_MAX_PAGE_SIZE=(int, 1000),
     DATABASE_URL=(str, ''),
+    ASGI_MODE=(bool, False),
 )
 
 env_file = os.path.join(BASE_DIR, '.env')
@@ -44,8 +57,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'spaces.deadlines.DeadlineMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    # WhiteNoise con soporte asíncrono (ver ``spaces.staticfiles``): sirve los estáticos bajo WSGI y ASGI.
+    'spaces.staticfiles.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -55,6 +70,7 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+
 ROOT_URLCONF = 'spaces_service.urls'
 
 TEMPLATES = [
@@ -96,6 +112,9 @@ USE_TZ = True
 STATIC_URL = 'static/'
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+
+# Modo ASGI (ver ``spaces_service.asgi``): la disponibilidad se atiende con una vista asíncrona.
+ASGI_MODE = env('ASGI_MODE')
 DEFAULT_AUTO_FIELD = 'django.db.models.AutoField'
 
 REST_FRAMEWORK = {
@@ -119,5 +138,17 @@ CORS_ALLOWED_ORIGINS = env('CORS_ALLOWED_ORIGINS')
 CORS_ALLOW_ALL_ORIGINS = env.bool('CORS_ALLOW_ALL_ORIGINS', default=False)
 CSRF_TRUSTED_ORIGINS = env.list('CSRF_TRUSTED_ORIGINS', default=['https://*.railway.app', 'https://*.up.railway.app'])
 JWT_SECRET = env('JWT_SECRET')
+REQUEST_DEADLINE_SECONDS = env('REQUEST_DEADLINE_SECONDS')
 RESERVATIONS_BASE_URL = env('RESERVATIONS_BASE_URL')
+RESERVATIONS_BUSY_TIMEOUT = env('RESERVATIONS_BUSY_TIMEOUT')
+SPACE_REPLICA_NOTIFY_TIMEOUT = env('SPACE_REPLICA_NOTIFY_TIMEOUT')
+INTERSERVICE_POOL_SIZE = env('INTERSERVICE_POOL_SIZE')
+INTERSERVICE_CONNECT_TIMEOUT = env('INTERSERVICE_CONNECT_TIMEOUT')
+INTERSERVICE_RETRIES = env('INTERSERVICE_RETRIES')
+INTERSERVICE_RETRY_BACKOFF = env('INTERSERVICE_RETRY_BACKOFF')
+INTERSERVICE_BREAKER_THRESHOLD = env('INTERSERVICE_BREAKER_THRESHOLD')
+INTERSERVICE_BREAKER_RESET_SECONDS = env('INTERSERVICE_BREAKER_RESET_SECONDS')
+INTERSERVICE_ASYNC_MAX_CONNECTIONS = env('INTERSERVICE_ASYNC_MAX_CONNECTIONS')
+API_PAGE_SIZE = env('API_PAGE_SIZE')
+API_MAX_PAGE_SIZE = env('API_MAX_PAGE_SIZE')
 
@@ -1,9 +1,10 @@
-﻿from django.contrib import admin
+﻿from django.conf import settings
+from django.contrib import admin
 from django.urls import include, path
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 from rest_framework import routers
 
-from spaces.views import SpaceViewSet, HealthCheckView
+from spaces.views import SpaceViewSet, HealthCheckView, InterserviceMetricsView, space_availability
 
 router = routers.DefaultRouter()
 router.register(r"spaces", SpaceViewSet, basename="space")
@@ -11,8 +12,13 @@ router.register(r"spaces", SpaceViewSet, basename="space")
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/spaces/health/', HealthCheckView.as_view(), name='health_check'),
+    path('api/spaces/health/interservice/', InterserviceMetricsView.as_view(), name='interservice_metrics'),
     path('api/', include(router.urls)),
     path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
     path('api/docs/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger'),
 ]
 
+if settings.ASGI_MODE:
+    # Misma ruta y contrato que ``SpaceViewSet.availability``, atendida sin bloquear un hilo.
+    urlpatterns.insert(0, path('api/spaces/<int:pk>/availability/', space_availability, name='space-availability-async'))
+
@@ -9,8 +9,11 @@ echo "=========================================="
 export PORT=${PORT:-80}
 echo "Using PORT: $PORT"
 
-export RESERVATIONS_BASE_URL="http://127.0.0.1:8003/api"
-export SPACES_BASE_URL="http://127.0.0.1:8002/api"
+# Llamadas entre spaces y reservations por socket Unix (modo local del cliente interservice);
+# nginx sigue usando los puertos TCP. Para volver a TCP: http://127.0.0.1:8003/api y :8002/api.
+mkdir -p /run/app
+export RESERVATIONS_BASE_URL="http+unix://%2Frun%2Fapp%2Freservations.sock/api"
+export SPACES_BASE_URL="http+unix://%2Frun%2Fapp%2Fspaces.sock/api"
 
 echo "Step 1: Configuring nginx with PORT=$PORT..."
 envsubst '${PORT}' < /etc/nginx/conf.d/default.conf > /tmp/nginx.conf